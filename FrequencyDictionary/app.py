@@ -2,34 +2,37 @@
 
 import argparse
 from frequency_dictionary import FrequencyDictionary
-from config import LANGUAGES, MESSAGES, CLI_HELP, MAIN_MENU_ITEMS, NUMBER_FORMAT
+from config import (LANGUAGES, MESSAGES, CLI_HELP, MAIN_MENU_ITEMS, NUMBER_FORMAT, MAX_DISPLAY_WORDS,
+                    NGRAM_MIN_COUNT, APPROX_MEMORY_MB, TYPO_MAX_COUNT)
 
 
 def create_mode(fd: FrequencyDictionary, args):
     """Режим создания словарей"""
     if args.language == 'all':
         print("Создание словарей для всех языков...")
-        fd.create_all(args.force)
+        fd.create_all(args.force, args.ngram, args.min_count, args.approximate, args.memory_mb,
+                      args.memory_cap_mb)
         
         # Показываем итоговую статистику
         print("\n" + "="*40)
         print(MESSAGES['final_stats_title'])
         print("="*40)
         for lang in LANGUAGES:
-            if fd.load_dictionary(lang):
+            if fd.load_dictionary(lang, args.ngram):
                 name = LANGUAGES[lang]
                 total = NUMBER_FORMAT.format(fd.current_data['total_words'])
                 unique = NUMBER_FORMAT.format(fd.current_data['unique_words'])
                 print(MESSAGES['stats_format'].format(name=name, total=total, unique=unique))
     else:
-        fd.create_dictionary(args.language, args.force)
+        fd.create_dictionary(args.language, args.force, args.ngram, args.min_count,
+                             args.approximate, args.memory_mb, args.memory_cap_mb)
 
 
 def interface_mode(fd: FrequencyDictionary, args):
     """Режим интерфейса"""
     if args.language:
         # Прямой запуск для языка
-        if fd.load_dictionary(args.language):
+        if fd.load_dictionary(args.language, args.ngram):
             language_menu(fd)
         else:
             lang_name = LANGUAGES.get(args.language, args.language)
@@ -37,7 +40,7 @@ def interface_mode(fd: FrequencyDictionary, args):
             print("Создайте его командой: python app.py create")
     else:
         # Главное меню
-        main_menu(fd)
+        main_menu(fd, args.ngram)
 
 
 def web_mode(args):
@@ -59,7 +62,7 @@ def web_mode(args):
         print(f"Ошибка запуска веб интерфейса: {e}")
 
 
-def main_menu(fd: FrequencyDictionary):
+def main_menu(fd: FrequencyDictionary, ngram: int = 1):
     """Главное меню выбора языка"""
     while True:
         print(f"\n{MESSAGES['app_title']}")
@@ -80,7 +83,7 @@ def main_menu(fd: FrequencyDictionary):
             choice_num = int(choice) - 1
             if 0 <= choice_num < len(menu_items):
                 lang_code = menu_items[choice_num][0]
-                if fd.load_dictionary(lang_code):
+                if fd.load_dictionary(lang_code, ngram):
                     language_menu(fd)
                 else:
                     lang_name = LANGUAGES[lang_code]
@@ -99,6 +102,8 @@ def main_menu(fd: FrequencyDictionary):
 def language_menu(fd: FrequencyDictionary):
     """Меню для выбранного языка"""
     lang_name = LANGUAGES[fd.current_language].upper()
+    if fd.current_ngram > 1:
+        lang_name += f" ({fd.current_ngram}-ГРАММЫ)"
     
     while True:
         print(f"\n=== МЕНЮ: {lang_name} ===")
@@ -144,6 +149,16 @@ def language_menu(fd: FrequencyDictionary):
                 file_path = input(MESSAGES['enter_file_path']).strip()
                 if file_path:
                     fd.add_text_file(file_path)
+            elif choice == '11':
+                subcorpus_menu(fd)
+            elif choice == '12':
+                word = input(MESSAGES['enter_concordance_word']).strip()
+                if word:
+                    fd.concordance(word)
+            elif choice == '13':
+                suggestion_menu(fd)
+            elif choice == '14':
+                rank_menu(fd)
             else:
                 print(MESSAGES['invalid_choice'])
                 
@@ -156,6 +171,90 @@ def language_menu(fd: FrequencyDictionary):
             break
 
 
+def suggestion_menu(fd: FrequencyDictionary):
+    """Варианты исправления слова и исправление выбранным вариантом"""
+    word = input(MESSAGES['enter_fuzzy_word']).strip().lower()
+    if not word:
+        return
+    
+    suggestions = fd.suggest(word)
+    if not suggestions or word not in fd.current_data['word_counts']:
+        return
+    
+    # Номер варианта запрашивается, пока не введен номер из списка или пустая строка
+    while True:
+        choice = input(MESSAGES['enter_suggestion']).strip()
+        if not choice:
+            return
+        if choice.isdigit() and 1 <= int(choice) <= len(suggestions):
+            break
+        print(MESSAGES['invalid_choice'])
+    fd.correct_word(word, suggestions[int(choice) - 1][0])
+
+
+def rank_menu(fd: FrequencyDictionary):
+    """Слова в диапазоне частот (5-20, 100-), слово на ранге (#1000) или ранг слова"""
+    query = input(MESSAGES['enter_rank_query']).strip()
+    if not query:
+        return
+    
+    low, separator, high = query.partition('-')
+    if separator and low.isdigit() and (high.isdigit() or not high):
+        fd.display_count_range(int(low), int(high) if high else None)
+    else:
+        fd.display_rank(query)
+
+
+def parse_documents(value: str):
+    """Номера документов через запятую (с 1) → индексы; пустая строка - все документы"""
+    if not value.strip():
+        return None
+    return [int(item) - 1 for item in value.replace(' ', '').split(',') if item]
+
+
+def subcorpus_menu(fd: FrequencyDictionary):
+    """Частоты по выбранным документам"""
+    if not fd.list_documents():
+        return
+    
+    documents = parse_documents(input(f"\n{MESSAGES['enter_documents']}"))
+    word = input(MESSAGES['enter_subcorpus_word']).strip()
+    if word:
+        fd.subcorpus_frequency(word, documents)
+    else:
+        fd.subcorpus_top(documents)
+
+
+def documents_mode(fd: FrequencyDictionary, args):
+    """Режим запросов к подкорпусу"""
+    if not fd.load_dictionary(args.language):
+        return
+    
+    # Номера документов в командной строке начинаются с 1
+    documents = None
+    if args.docs:
+        documents = [int(doc) - 1 if doc.isdigit() else doc for doc in args.docs]
+    
+    if args.word:
+        fd.subcorpus_frequency(args.word, documents)
+    elif args.docs or args.top:
+        fd.subcorpus_top(documents, args.top or MAX_DISPLAY_WORDS)
+    else:
+        fd.list_documents()
+
+
+def edits_mode(fd: FrequencyDictionary, args):
+    """Режим пакетных правок из файла"""
+    if fd.load_dictionary(args.language, args.ngram):
+        fd.apply_edits(args.file, args.dry_run)
+
+
+def typos_mode(fd: FrequencyDictionary, args):
+    """Режим поиска опечаток: предложения исправлений файлом правок"""
+    if fd.load_dictionary(args.language, args.ngram):
+        fd.propose_merges(args.output, args.max_count)
+
+
 def main():
     """Главная функция"""
     parser = argparse.ArgumentParser(
@@ -179,6 +278,35 @@ def main():
         action='store_true',
         help=CLI_HELP['force_help']
     )
+    create_parser.add_argument(
+        '--ngram',
+        type=int,
+        choices=[1, 2, 3],
+        default=1,
+        help=CLI_HELP['ngram_help']
+    )
+    create_parser.add_argument(
+        '--min-count',
+        type=int,
+        default=NGRAM_MIN_COUNT,
+        help=CLI_HELP['min_count_help']
+    )
+    create_parser.add_argument(
+        '--approximate',
+        action='store_true',
+        help=CLI_HELP['approximate_help']
+    )
+    create_parser.add_argument(
+        '--memory-mb',
+        type=int,
+        default=APPROX_MEMORY_MB,
+        help=CLI_HELP['memory_mb_help']
+    )
+    create_parser.add_argument(
+        '--memory-cap-mb',
+        type=int,
+        help=CLI_HELP['memory_cap_help']
+    )
     
     # Режим интерфейса
     interface_parser = subparsers.add_parser('interface', help=CLI_HELP['interface_help'])
@@ -187,6 +315,88 @@ def main():
         choices=list(LANGUAGES.keys()),
         help=CLI_HELP['direct_language_help']
     )
+    interface_parser.add_argument(
+        '--ngram',
+        type=int,
+        choices=[1, 2, 3],
+        default=1,
+        help=CLI_HELP['ngram_help']
+    )
+    
+    # Режим подкорпуса
+    documents_parser = subparsers.add_parser('documents', help=CLI_HELP['documents_help'])
+    documents_parser.add_argument(
+        '--language',
+        choices=list(LANGUAGES.keys()),
+        required=True,
+        help=CLI_HELP['direct_language_help']
+    )
+    documents_parser.add_argument(
+        '--docs',
+        nargs='+',
+        help=CLI_HELP['docs_help']
+    )
+    documents_parser.add_argument(
+        '--word',
+        help=CLI_HELP['word_help']
+    )
+    documents_parser.add_argument(
+        '--top',
+        type=int,
+        help=CLI_HELP['top_help']
+    )
+    
+    # Режим пакетных правок
+    edits_parser = subparsers.add_parser('edits', help=CLI_HELP['edits_help'])
+    edits_parser.add_argument(
+        '--language',
+        choices=list(LANGUAGES.keys()),
+        required=True,
+        help=CLI_HELP['direct_language_help']
+    )
+    edits_parser.add_argument(
+        '--file',
+        required=True,
+        help=CLI_HELP['edits_file_help']
+    )
+    edits_parser.add_argument(
+        '--ngram',
+        type=int,
+        choices=[1, 2, 3],
+        default=1,
+        help=CLI_HELP['ngram_help']
+    )
+    edits_parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help=CLI_HELP['dry_run_help']
+    )
+    
+    # Режим поиска опечаток
+    typos_parser = subparsers.add_parser('typos', help=CLI_HELP['typos_help'])
+    typos_parser.add_argument(
+        '--language',
+        choices=list(LANGUAGES.keys()),
+        required=True,
+        help=CLI_HELP['direct_language_help']
+    )
+    typos_parser.add_argument(
+        '--output',
+        help=CLI_HELP['typos_output_help']
+    )
+    typos_parser.add_argument(
+        '--max-count',
+        type=int,
+        default=TYPO_MAX_COUNT,
+        help=CLI_HELP['typos_max_count_help']
+    )
+    typos_parser.add_argument(
+        '--ngram',
+        type=int,
+        choices=[1, 2, 3],
+        default=1,
+        help=CLI_HELP['ngram_help']
+    )
     
     # Веб режим
     web_parser = subparsers.add_parser('web', help=CLI_HELP['web_help'])
@@ -213,6 +423,7 @@ def main():
     if not args.mode:
         args.mode = 'interface'
         args.language = None
+        args.ngram = 1
     
     fd = FrequencyDictionary()
     
@@ -221,6 +432,12 @@ def main():
             create_mode(fd, args)
         elif args.mode == 'interface':
             interface_mode(fd, args)
+        elif args.mode == 'documents':
+            documents_mode(fd, args)
+        elif args.mode == 'edits':
+            edits_mode(fd, args)
+        elif args.mode == 'typos':
+            typos_mode(fd, args)
         elif args.mode == 'web':
             web_mode(args)
     except KeyboardInterrupt:
@@ -7,6 +7,11 @@ from pathlib import Path
 DEFAULT_DATA_DIR = Path("data")
 DEFAULT_DICT_DIR = Path("dictionaries")
 DICTIONARY_FILE_TEMPLATE = "{language}_dictionary.json"
+DOCUMENTS_FILE_TEMPLATE = "{language}_documents"  # .npz (матрица) + .json (документы и слова)
+NGRAM_FILE_TEMPLATE = "{language}_{n}gram_dictionary.json"
+STORAGE_BACKEND = 'json'  # Хранилище словарей: json (файл .json), sqlite (файл .sqlite, индексы по слову и частоте)
+                          # или sharded (каталог .shards: манифест и JSON-шарды по хэшу слова)
+POSITIONS_FILE_TEMPLATE = "{language}_positions"  # .json + _postings.bin + _offsets.npy + _tokens.npy
 ALLOWED_EXTENSIONS = ['.txt']
 
 # ==================== ЯЗЫКИ И ЛОКАЛИ ====================
@@ -35,12 +40,48 @@ CLEAN_PATTERNS = {
 # Кодировки для чтения файлов (по приоритету)
 ENCODINGS = ['utf-8', 'cp1251', 'latin-1', 'cp1252']
 
+# Словари n-грамм
+NGRAM_MIN_COUNT = 2  # n-граммы с меньшей частотой не сохраняются
+NGRAM_CHUNK_TOKENS = 2_000_000  # n-грамм в памяти до сброса промежуточных частот на диск
+NGRAM_PARTITIONS = 16  # Количество разделов на диске (в памяти при сборке - один раздел)
+
+# Приближенный подсчет (create --approximate): Count-Min Sketch + сводка Misra-Gries
+APPROX_MEMORY_MB = 64  # Объем памяти на счетчики
+APPROX_SKETCH_DEPTH = 5  # Строк Count-Min Sketch (вероятность превышения границы ошибки e^-depth)
+
+# Точный подсчет во внешней памяти (create --memory-cap-mb)
+EXTERNAL_MERGE_FAN_IN = 64  # Прогонов на диске, сливаемых за один проход
+
+# Шардированные словари (STORAGE_BACKEND = 'sharded')
+SHARD_COUNT = 16  # Количество шардов нового словаря
+SHARD_CACHE_SIZE = 4  # Неизмененных шардов в памяти одновременно
+SHARD_WORKERS = 0  # Процессов сборки (0 - по числу ядер)
+
+# Нечеткий поиск (индекс удалений SymSpell) и поиск опечаток
+FUZZY_MAX_DISTANCE = 2  # Наибольшее расстояние правки (Дамерау-Левенштейн) для вариантов
+FUZZY_PREFIX_LENGTH = 7  # Удаления индексируются только в начале слова такой длины
+FUZZY_SUGGESTIONS = 10  # Вариантов исправления в ответе
+TYPO_MAX_COUNT = 2  # Проверяются как возможные опечатки слова с частотой не выше
+TYPO_MIN_TARGET_COUNT = 5  # Исправление - слово с частотой не ниже этой
+TYPO_MIN_RATIO = 5  # ... и не ниже частоты опечатки, умноженной на это число
+TYPO_MIN_LENGTH = 4  # Более короткие слова не проверяются (у них слишком много похожих)
+TYPO_LONG_WORD = 8  # Для слов короче - только расстояние 1
+TYPO_PREFIX_LENGTH = 10  # Длина начала слова в индексе частых слов (он меньше, поэтому длиннее)
+
 # ==================== ИНТЕРФЕЙС И ОТОБРАЖЕНИЕ ====================
 
 # Ограничения отображения
 MAX_DISPLAY_WORDS = 50
 MAX_SEARCH_RESULTS = 20
 
+# Конкорданс: количество строк и слов контекста с каждой стороны
+KWIC_LINES = 10
+KWIC_WIDTH = 6
+
+# Частотный спектр в статистике
+SPECTRUM_ROWS = 10  # Показывать V(m) для m от 1 до этого числа
+GOOD_TURING_MAX_COUNT = 5  # Скорректированные частоты Гуда-Тьюринга для частот до этой
+
 # Символы для сортировки
 SORT_SYMBOLS = {
     'asc': '↑',
@@ -65,7 +106,11 @@ MAIN_MENU_ITEMS = [
     "Исправить слово", 
     "Удалить слово", 
     "Добавить слово",
-    "Пополнить новым текстом"
+    "Пополнить новым текстом",
+    "Подкорпус: частоты по документам",
+    "Конкорданс (слово в контексте)",
+    "Похожие слова (исправление опечаток)",
+    "Частоты и ранги"
 ]
 
 # ==================== СООБЩЕНИЯ ПОЛЬЗОВАТЕЛЮ ====================
@@ -96,6 +141,14 @@ MESSAGES = {
     
     # Успешные операции
     'dictionary_created': "Словарь {language} создан:",
+    'ngram_dictionary_created': "Словарь {n}-грамм {language} создан (частота не ниже {min_count}):",
+    'approximate_dictionary_created': "Приближенный словарь {language} создан (память {memory_mb} МБ):",
+    'approximate_bounds': "Частоты завышены не больше чем на {overestimate} с вероятностью {confidence:.3%}; "
+                          "сохранены все слова с частотой выше {guaranteed}",
+    'external_dictionary_created': "Словарь {language} создан во внешней памяти ({runs} прогонов, лимит {memory_cap_mb} МБ):",
+    'sharded_dictionary_created': "Словарь {language} создан ({shards} шардов, процессов сборки: {workers}):",
+    'shards_stats': "Шардов: {shards} (уникальных слов в шарде: {smallest}-{largest})",
+    'approximate_ngram': "Приближенный подсчет доступен только для словаря слов",
     'dictionary_exists': "Словарь для {language} уже существует",
     'word_corrected': "'{wrong}' → '{correct}' (частота: {count})",
     'word_deleted': "Слово '{word}' удалено",
@@ -106,6 +159,17 @@ MESSAGES = {
     'stats_title': "Статистика для {language}",
     'total_words': "Всего слов: {count}",
     'unique_words': "Уникальных: {count}",
+    'lexical_title': "Лексическое богатство",
+    'hapax_legomena': "Встречаются один раз (hapax legomena): {count} ({share:.1%} уникальных)",
+    'dis_legomena': "Встречаются два раза (dis legomena): {count} ({share:.1%} уникальных)",
+    'ttr': "Доля уникальных (TTR): {value:.4f}",
+    'yule_k': "K Юла: {value:.2f}",
+    'simpson_d': "D Симпсона: {value:.6f}",
+    'honore_r': "R Оноре: {value:.1f}",
+    'good_turing_unseen': "Вероятность нового слова (Гуд-Тьюринг): {value:.4%}",
+    'good_turing_counts': "Скорректированные частоты r*: {counts}",
+    'spectrum_title': "Спектр V(m) - слов с частотой m:",
+    'spectrum_format': "  m = {m:3d} : {count:>10s}",
     'stats_format': "{name:12}: {total:>10} слов ({unique:>8} уникальных)",
     'final_stats_title': "ИТОГОВАЯ СТАТИСТИКА",
     
@@ -114,10 +178,11 @@ MESSAGES = {
     'sorted_by_frequency': "Сортировка по частоте {direction}",
     'search_results': "Найдено слов с '{pattern}': {count}",
     'more_words': "... и еще {count} слов",
+    'invalid_regex': "Неверное регулярное выражение '{pattern}': {error}",
     
     # Подтверждения и вопросы
     'confirm_delete': "Удалить '{word}'? (y/N): ",
-    'enter_pattern': "Начало слова: ",
+    'enter_pattern': "Начало слова (-окончание, шаблон с * и ?, re:выражение): ",
     'enter_wrong_word': "Неправильное слово: ",
     'enter_correct_word': "Правильное слово: ",
     'enter_word_to_delete': "Слово для удаления: ",
@@ -130,13 +195,65 @@ MESSAGES = {
     'word_already_exists': "Слово '{word}' уже есть",
     'invalid_word': "Некорректное слово",
     'empty_word': "Слово не может быть пустым",
+    'same_word': "Слово '{word}' совпадает с исправлением",
+    'invalid_ngram': "Запись словаря {n}-грамм должна состоять из {n} слов",
     
     # Обработка файлов
     'processing_files': "Обработка {count} файлов для {language}...",
     'processing_new_file': "Обработка нового файла...",
     'creating_dictionary': "Создание {language}",
+    'creating_ngram_dictionary': "Создание {language} ({n}-граммы)",
     'processing_lines': "Обработка",
     
+    # Пакетные правки
+    'edit_unknown_operation': "Неизвестная операция '{op}' (add, delete, correct, merge)",
+    'edit_wrong_arguments': "Неверное количество слов для {op}",
+    'edit_same_word': "Слово '{word}' повторяется в правке",
+    'edit_error': "Строка {line}: {error}",
+    'more_errors': "... и еще {count} ошибок",
+    'edits_dry_run': "Пакет правок: проверка (словарь не изменен)",
+    'edits_applied': "Пакет правок применен",
+    'edits_rejected': "Пакет правок не применен, ошибок: {count}",
+    'edits_operations': "Операций: добавить {add}, удалить {delete}, исправить {correct}, объединить {merge}",
+    
+    # Нечеткий поиск и опечатки
+    'enter_fuzzy_word': "Слово с возможной опечаткой: ",
+    'building_fuzzy_index': "Построение индекса нечеткого поиска...",
+    'suggestions_title': "Похожие на '{word}' (расстояние до {distance}): {count}",
+    'suggestion_format': "{index:3d}. {word:20s} : {count:>8s}  (расстояние {distance})",
+    'no_suggestions': "Похожих слов не найдено",
+    'did_you_mean': "Возможно: {words}",
+    'enter_suggestion': "Номер варианта для исправления (Enter - не исправлять): ",
+    'searching_typos': "Поиск опечаток",
+    'typos_title': "Возможные опечатки: {count}",
+    'typo_format': "{word:20s} ({count}) → {target} ({target_count}), расстояние {distance}",
+    'typos_saved': "Правки сохранены в {path} (проверка: python app.py edits --language {language} --file {path} --dry-run)",
+    
+    # Частоты и ранги
+    'enter_rank_query': "Диапазон частот (5-20 или 100-), ранг (#1000) или слово: ",
+    'count_range_title': "Слова с частотой от {low} до {high}: {count}",
+    'rank_format': "{word}: ранг {rank}, частота {count} (ранги слов с этой частотой: {first}-{last})",
+    'rank_out_of_range': "Ранг {rank} вне словаря (слов: {count})",
+    
+    # Частоты по документам
+    'documents_not_found': "Частоты по документам для {language} не найдены. Пересоздайте словарь: python app.py create --force",
+    'unknown_document': "Документ не найден: {document}",
+    'documents_title': "Документы ({count})",
+    'document_format': "{index:3d}. {name:40s} : {count:>10s} слов",
+    'enter_documents': "Номера документов через запятую (Enter - все): ",
+    'enter_subcorpus_word': "Слово (Enter - топ слов): ",
+    'subcorpus_title': "Подкорпус: {documents}",
+    'subcorpus_all': "все документы",
+    'subcorpus_word': "'{word}': частота {count}, ранг {rank}, {per_million:.1f} на млн слов",
+    'subcorpus_word_missing': "Слово '{word}' в подкорпусе не встречается",
+    'subcorpus_top': "Топ-{count} слов подкорпуса",
+    
+    # Конкорданс
+    'positions_not_found': "Позиционный индекс для {language} не найден. Пересоздайте словарь: python app.py create --force",
+    'enter_concordance_word': "Слово для конкорданса: ",
+    'concordance_title': "Конкорданс '{word}': {count} из {total}",
+    'concordance_source': "({document}, слово {offset})",
+    
     # Обновление словаря
     'update_stats_title': "=== Словарь обновлен ===",
     'new_words_processed': "Новых слов: {count}",
@@ -160,8 +277,20 @@ CLI_HELP = {
 Примеры:
   python app.py create --language all          # создать все словари
   python app.py create --language russian      # создать только русский
+  python app.py create --language russian --ngram 2 --min-count 3
+                                               # словарь биграмм
+  python app.py create --language russian --approximate --memory-mb 32
+                                               # приближенный словарь (частые слова)
+  python app.py create --language russian --memory-cap-mb 256
+                                               # точный словарь с ограничением памяти
   python app.py interface                      # запустить консольный интерфейс
   python app.py interface --language russian   # сразу русский язык
+  python app.py documents --language russian --docs idiot demons --word князь
+                                               # частоты по подкорпусу
+  python app.py edits --language russian --file fixes.tsv --dry-run
+                                               # проверить пакет правок (add/delete/correct/merge)
+  python app.py typos --language russian --output typos.tsv
+                                               # предложить исправления редких слов-опечаток
   python app.py web                           # запустить веб интерфейс
   python app.py web --host 0.0.0.0 --port 8080  # веб на всех интерфейсах
     """,
@@ -170,7 +299,23 @@ CLI_HELP = {
     'web_help': 'Веб интерфейс (Flask)',
     'language_help': 'Язык для создания',
     'force_help': 'Пересоздать существующий словарь',
-    'direct_language_help': 'Прямой запуск языка'
+    'direct_language_help': 'Прямой запуск языка',
+    'ngram_help': 'Размер n-грамм: 1 - словарь слов (по умолчанию), 2 - биграммы, 3 - триграммы',
+    'min_count_help': 'Минимальная частота n-граммы для сохранения',
+    'approximate_help': 'Приближенный подсчет частых слов с ограниченной памятью (Count-Min Sketch + Misra-Gries)',
+    'memory_mb_help': 'Память на счетчики при приближенном подсчете, МБ',
+    'memory_cap_help': 'Точный подсчет во внешней памяти: лимит памяти счетчика, МБ (частоты сбрасываются на диск)',
+    'documents_help': 'Частоты по подкорпусу (набору документов)',
+    'docs_help': 'Документы подкорпуса: имена файлов (без .txt) или номера с 1; по умолчанию все',
+    'word_help': 'Слово для частоты и ранга в подкорпусе',
+    'top_help': 'Количество самых частых слов подкорпуса',
+    'edits_help': 'Пакет правок из файла: строки "add слово", "delete слово", '
+                  '"correct неправильное правильное", "merge слово1 ... итоговое"',
+    'edits_file_help': 'Файл правок (поля через пробел или табуляцию, # - комментарий)',
+    'dry_run_help': 'Только проверить правки и показать результат, не меняя словарь',
+    'typos_help': 'Предложения исправлений для редких слов, похожих на частые',
+    'typos_output_help': 'Файл правок с предложениями (формат команды edits)',
+    'typos_max_count_help': 'Проверять слова с частотой не выше'
 }
 
 # ==================== ВЕБ ИНТЕРФЕЙС ====================
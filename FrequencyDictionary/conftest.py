@@ -0,0 +1,6 @@
+"""Модули проекта импортируются тестами из каталога проекта"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
@@ -0,0 +1,188 @@
+"""Хранилище частот по документам (разреженная матрица документ × слово)"""
+
+import json
+import numpy as np
+from pathlib import Path
+from typing import Dict, List, Optional, Iterable
+
+
+def _from_coo(rows: np.ndarray, cols: np.ndarray, data: np.ndarray, n_rows: int):
+    """CSR-массивы из координат (повторяющиеся ячейки суммируются, нули удаляются)"""
+    order = np.lexsort((cols, rows))
+    rows, cols, data = rows[order], cols[order], data[order]
+
+    if len(rows):
+        # Начала групп одинаковых (строка, столбец)
+        starts = np.flatnonzero(np.r_[True, (rows[1:] != rows[:-1]) | (cols[1:] != cols[:-1])])
+        rows, cols, data = rows[starts], cols[starts], np.add.reduceat(data, starts)
+        keep = data != 0
+        rows, cols, data = rows[keep], cols[keep], data[keep]
+
+    indptr = np.zeros(n_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n_rows), out=indptr[1:])
+    return indptr, cols.astype(np.int32), data.astype(np.int64)
+
+
+class DocumentStore:
+    """Частоты слов по документам корпуса
+
+    Строка матрицы - файл из data/<язык>, столбец - слово словаря.
+    Матрица хранится в формате CSR (indptr, indices, data), поэтому частоты
+    по любому набору документов получаются суммированием строк без
+    повторного чтения текстов.
+    """
+
+    def __init__(self, documents: List[str], vocabulary: List[str],
+                 indptr: np.ndarray, indices: np.ndarray, data: np.ndarray):
+        self.documents = list(documents)
+        self.vocabulary = list(vocabulary)
+        self.word_ids = {word: i for i, word in enumerate(self.vocabulary)}
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+
+    # ==================== ПОСТРОЕНИЕ И ХРАНЕНИЕ ====================
+
+    @classmethod
+    def from_counts(cls, documents: Dict[str, Dict[str, int]], vocabulary: Iterable[str]):
+        """Построение из частот по документам (имя документа → слово → частота)"""
+        store = cls([], vocabulary, np.zeros(1, dtype=np.int64),
+                    np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int64))
+        for name, counts in documents.items():
+            store.add_document(name, counts)
+        return store
+
+    @staticmethod
+    def paths(base_path: Path):
+        """Файлы хранилища: матрица (.npz) и списки документов и слов (.json)"""
+        base_path = Path(base_path)
+        return base_path.with_suffix('.npz'), base_path.with_suffix('.json')
+
+    def save(self, base_path: Path):
+        matrix_path, index_path = self.paths(base_path)
+        with open(matrix_path, 'wb') as f:
+            np.savez(f, indptr=self.indptr, indices=self.indices, data=self.data)
+        with open(index_path, 'w', encoding='utf-8') as f:
+            json.dump({'documents': self.documents, 'vocabulary': self.vocabulary}, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, base_path: Path) -> Optional['DocumentStore']:
+        matrix_path, index_path = cls.paths(base_path)
+        if not matrix_path.exists() or not index_path.exists():
+            return None
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        with np.load(matrix_path) as matrix:
+            return cls(index['documents'], index['vocabulary'],
+                       matrix['indptr'], matrix['indices'], matrix['data'])
+
+    # ==================== ИЗМЕНЕНИЕ ====================
+
+    def _word_id(self, word: str) -> int:
+        if word not in self.word_ids:
+            self.word_ids[word] = len(self.vocabulary)
+            self.vocabulary.append(word)
+        return self.word_ids[word]
+
+    def _coo(self):
+        rows = np.repeat(np.arange(len(self.documents)), np.diff(self.indptr))
+        return rows, self.indices.astype(np.int64), self.data
+
+    def add_document(self, name: str, counts: Dict[str, int]):
+        """Добавление документа в конец матрицы"""
+        ids = np.fromiter((self._word_id(word) for word in counts), dtype=np.int64, count=len(counts))
+        values = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+        order = np.argsort(ids)
+        keep = values[order] != 0
+
+        self.documents.append(name)
+        self.indices = np.concatenate([self.indices, ids[order][keep].astype(np.int32)])
+        self.data = np.concatenate([self.data, values[order][keep]])
+        self.indptr = np.append(self.indptr, len(self.indices))
+
+    def merge_word(self, wrong: str, correct: str):
+        """Перенос частот слова wrong на correct во всех документах"""
+        self.remap_words({wrong: correct})
+
+    def delete_word(self, word: str):
+        """Удаление частот слова во всех документах"""
+        self.remap_words({word: None})
+
+    def remap_words(self, mapping: Dict[str, Optional[str]]):
+        """Переносы частот (слово → новое слово) и удаления (слово → None) за один проход"""
+        mapping = {word: target for word, target in mapping.items() if word in self.word_ids}
+        if not mapping:
+            return
+        new_ids = np.arange(len(self.vocabulary), dtype=np.int64)
+        for word, target in mapping.items():
+            new_ids[self.word_ids[word]] = -1 if target is None else self._word_id(target)
+
+        rows, cols, data = self._coo()
+        cols = new_ids[cols]
+        keep = cols >= 0
+        self.indptr, self.indices, self.data = _from_coo(rows[keep], cols[keep], data[keep], len(self.documents))
+
+    # ==================== ЗАПРОСЫ ====================
+
+    def resolve(self, documents=None) -> List[int]:
+        """Номера строк для набора документов (имена, имена без .txt или индексы с 0)"""
+        if documents is None:
+            return list(range(len(self.documents)))
+
+        stems = {Path(name).stem: i for i, name in enumerate(self.documents)}
+        rows = []
+        for document in documents:
+            if isinstance(document, (int, np.integer)):
+                if not 0 <= document < len(self.documents):
+                    raise KeyError(document)
+                rows.append(int(document))
+            elif document in self.documents:
+                rows.append(self.documents.index(document))
+            elif document in stems:
+                rows.append(stems[document])
+            else:
+                raise KeyError(document)
+        return sorted(set(rows))
+
+    def counts(self, documents=None) -> np.ndarray:
+        """Частоты всех слов в наборе документов (сумма строк матрицы)"""
+        rows = self.resolve(documents)
+        if not rows:
+            return np.zeros(len(self.vocabulary), dtype=np.int64)
+        starts, ends = self.indptr[rows], self.indptr[np.array(rows) + 1]
+        # Индексы всех ненулевых ячеек выбранных строк
+        lengths = ends - starts
+        cells = np.repeat(starts - np.cumsum(np.r_[0, lengths[:-1]]), lengths) + np.arange(lengths.sum())
+        return np.bincount(self.indices[cells], weights=self.data[cells],
+                           minlength=len(self.vocabulary)).astype(np.int64)
+
+    def document_lengths(self) -> np.ndarray:
+        """Количество слов в каждом документе"""
+        rows, _, data = self._coo()
+        return np.bincount(rows, weights=data, minlength=len(self.documents)).astype(np.int64)
+
+    def frequency(self, word: str, documents=None) -> Dict:
+        """Частота, ранг и доля слова в наборе документов"""
+        counts = self.counts(documents)
+        total = int(counts.sum())
+        word_id = self.word_ids.get(word)
+        count = int(counts[word_id]) if word_id is not None else 0
+        return {
+            'word': word,
+            'count': count,
+            # Ранг: 1 + количество слов с большей частотой
+            'rank': int(np.count_nonzero(counts > count)) + 1 if count else None,
+            'per_million': count / total * 1_000_000 if total else 0.0,
+            'total_words': total,
+            'unique_words': int(np.count_nonzero(counts))
+        }
+
+    def top(self, k: int, documents=None) -> List[tuple]:
+        """k самых частых слов в наборе документов"""
+        counts = self.counts(documents)
+        k = min(k, int(np.count_nonzero(counts)))
+        if k <= 0:
+            return []
+        head = np.argpartition(-counts, k - 1)[:k]
+        head = head[np.lexsort((head, -counts[head]))]
+        return [(self.vocabulary[i], int(counts[i])) for i in head]
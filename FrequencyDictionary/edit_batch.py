@@ -0,0 +1,161 @@
+"""Пакетные правки словаря: разбор, проверка и применение одной транзакцией"""
+
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, MutableMapping, Optional, Set, Tuple
+
+from config import MESSAGES
+
+# Операция → (минимум, максимум) слов после нее; None - без ограничения
+EDIT_OPERATIONS = {
+    'add': (1, 1),  # add слово - новое слово с частотой 0
+    'delete': (1, 1),  # delete слово
+    'correct': (2, 2),  # correct неправильное правильное
+    'merge': (2, None)  # merge слово1 слово2 ... итоговое - частоты всех слов переходят к последнему
+}
+
+
+def parse_edit_line(line: str) -> Optional[List[str]]:
+    """Поля строки правки (None - пустая строка или комментарий #)
+
+    Поля разделяются табуляцией, а если ее нет - пробелами; табуляция
+    нужна для записей словаря n-грамм, которые сами содержат пробелы.
+    """
+    line = line.strip()
+    if not line or line.startswith('#'):
+        return None
+    fields = line.split('\t') if '\t' in line else line.split()
+    return [field.strip() for field in fields if field.strip()]
+
+
+def parse_edits(lines: Iterable) -> List[Tuple[int, List[str]]]:
+    """Правки с номерами строк (с 1); элемент lines - строка файла или готовый список полей"""
+    edits = []
+    for number, line in enumerate(lines, 1):
+        fields = parse_edit_line(line) if isinstance(line, str) else [str(field).strip() for field in line]
+        if fields:
+            edits.append((number, fields))
+    return edits
+
+
+def read_edits(path: Path) -> List[Tuple[int, List[str]]]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return parse_edits(f)
+
+
+class EditBatch:
+    """План пакета правок поверх словаря
+
+    Правки проверяются и применяются к наложению (self.changes: слово →
+    новая частота, None - слово удалено), сам словарь не меняется до
+    apply(). Статистика считается по ходу: total_delta и unique_delta.
+    Для частот по документам и позиционного индекса собирается итоговое
+    отображение исходных слов корпуса (слово → новое слово, None - удалено).
+    """
+
+    def __init__(self, word_counts: MutableMapping, clean: Callable[[str], Optional[str]]):
+        self.word_counts = word_counts
+        self.clean = clean
+        self.changes: Dict[str, Optional[int]] = {}
+        self.corpus_mapping: Dict[str, Optional[str]] = {}
+        # Текущее слово → исходные слова корпуса, перенесенные в него
+        self.holders: Dict[str, Set[str]] = {}
+        self.errors: List[Tuple[int, str]] = []
+        self.operations = {op: 0 for op in EDIT_OPERATIONS}
+        self.total_delta = 0
+        self.unique_delta = 0
+
+    def count(self, word: str) -> Optional[int]:
+        """Частота слова с учетом запланированных правок (None - слова нет)"""
+        if word in self.changes:
+            return self.changes[word]
+        return self.word_counts.get(word)
+
+    @staticmethod
+    def normalize(word: str) -> str:
+        return word.lower().strip()
+
+    def plan(self, edits: Iterable[Tuple[int, List[str]]]) -> 'EditBatch':
+        for number, fields in edits:
+            error = self.plan_edit(fields)
+            if error:
+                self.errors.append((number, error))
+        return self
+
+    def plan_edit(self, fields: List[str]) -> Optional[str]:
+        """Проверка и добавление одной правки; возвращает текст ошибки"""
+        op, words = fields[0].lower(), fields[1:]
+        if op not in EDIT_OPERATIONS:
+            return MESSAGES['edit_unknown_operation'].format(op=fields[0])
+        least, most = EDIT_OPERATIONS[op]
+        if len(words) < least or (most is not None and len(words) > most):
+            return MESSAGES['edit_wrong_arguments'].format(op=op)
+
+        if op == 'add':
+            word = self.clean(self.normalize(words[0]))
+            if not word:
+                return MESSAGES['invalid_word']
+            if self.count(word) is not None:
+                return MESSAGES['word_already_exists'].format(word=word)
+            self.changes[word] = 0
+            self.unique_delta += 1
+        elif op == 'delete':
+            word = self.normalize(words[0])
+            count = self.count(word)
+            if count is None:
+                return MESSAGES['word_not_found'].format(word=word)
+            self.changes[word] = None
+            self.total_delta -= count
+            self.unique_delta -= 1
+            self._move_corpus(word, None)
+        else:
+            *sources, target = [self.normalize(word) for word in words]
+            if not target:
+                return MESSAGES['empty_word']
+            for source in sources:
+                if self.count(source) is None:
+                    return MESSAGES['word_not_found'].format(word=source)
+                if source == target or sources.count(source) > 1:
+                    return MESSAGES['edit_same_word'].format(word=source)
+            for source in sources:
+                count = self.count(source)
+                self.changes[source] = None
+                target_count = self.count(target)
+                if target_count is None:
+                    self.unique_delta += 1
+                self.changes[target] = (target_count or 0) + count
+                self.unique_delta -= 1
+                self._move_corpus(source, target)
+        self.operations[op] += 1
+        return None
+
+    def _move_corpus(self, word: str, target: Optional[str]):
+        # Исходные слова, чьи вхождения сейчас принадлежат word (и само word, если еще не перенесено)
+        origins = self.holders.pop(word, set())
+        if word not in self.corpus_mapping:
+            origins.add(word)
+        for origin in origins:
+            self.corpus_mapping[origin] = target
+        if target is not None:
+            self.holders.setdefault(target, set()).update(origins)
+
+    def apply(self, data: MutableMapping):
+        """Запись запланированных правок в данные словаря"""
+        word_counts = data['word_counts']
+        for word, count in self.changes.items():
+            if count is not None:
+                word_counts[word] = count
+            elif word in word_counts:
+                del word_counts[word]
+        data['total_words'] += self.total_delta
+        data['unique_words'] += self.unique_delta
+
+    def report(self, data: MutableMapping, applied: bool) -> Dict:
+        """Итог пакета (вызывается до apply()): количество операций, ошибки и изменение статистики"""
+        total, unique = data['total_words'], data['unique_words']
+        return {
+            'applied': applied,
+            'operations': dict(self.operations),
+            'errors': [{'line': number, 'error': error} for number, error in self.errors],
+            'total_words': {'old': total, 'new': total + self.total_delta},
+            'unique_words': {'old': unique, 'new': unique + self.unique_delta}
+        }
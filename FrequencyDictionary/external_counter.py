@@ -0,0 +1,94 @@
+"""Точный подсчет частот во внешней памяти (сортированные прогоны + k-путевое слияние)"""
+
+import heapq
+import sys
+import tempfile
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+# Накладные расходы записи словаря Python сверх самой строки (ключ в таблице + int)
+ENTRY_OVERHEAD = 100
+
+
+def read_run(path: Path) -> Iterator[Tuple[str, int]]:
+    """Пары (слово, частота) файла прогона (строки 'слово<TAB>частота', по возрастанию слова)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            word, count = line.rstrip('\n').split('\t')
+            yield word, int(count)
+
+
+def merge_runs(runs: List[Iterator[Tuple[str, int]]]) -> Iterator[Tuple[str, int]]:
+    """k-путевое слияние прогонов с суммированием частот одинаковых слов"""
+    for word, group in groupby(heapq.merge(*runs, key=itemgetter(0)), key=itemgetter(0)):
+        yield word, sum(count for _, count in group)
+
+
+class ExternalCounter:
+    """Частоты слов с ограниченным расходом памяти и точным результатом
+
+    Слова считаются в словаре; когда оценка его размера превышает
+    memory_bytes, словарь сортируется и сбрасывается на диск отдельным
+    прогоном. Итог - потоковое слияние всех прогонов (не больше fan_in
+    файлов одновременно; при большем числе прогонов они сливаются
+    в несколько проходов).
+    """
+
+    def __init__(self, memory_bytes: int, fan_in: int, spill_dir: Optional[Path] = None):
+        self.memory_bytes = memory_bytes
+        self.fan_in = max(2, fan_in)
+        self._tmp = tempfile.TemporaryDirectory(dir=spill_dir)
+        self.spill_dir = Path(self._tmp.name)
+        self.counts = {}
+        self.used_bytes = 0
+        self.runs: List[Path] = []
+        self.files_written = 0
+        self.total = 0
+
+    def add(self, word: str):
+        if word in self.counts:
+            self.counts[word] += 1
+        else:
+            self.counts[word] = 1
+            self.used_bytes += sys.getsizeof(word) + ENTRY_OVERHEAD
+            if self.used_bytes > self.memory_bytes:
+                self.spill()
+        self.total += 1
+
+    def _write_run(self, items) -> Path:
+        path = self.spill_dir / f"run{self.files_written}.tsv"
+        self.files_written += 1
+        with open(path, 'w', encoding='utf-8') as f:
+            for word, count in items:
+                f.write(f"{word}\t{count}\n")
+        return path
+
+    def spill(self):
+        """Сброс текущих частот на диск сортированным прогоном"""
+        if not self.counts:
+            return
+        self.runs.append(self._write_run(sorted(self.counts.items())))
+        self.counts = {}
+        self.used_bytes = 0
+
+    def results(self) -> Iterator[Tuple[str, int]]:
+        """Итоговые пары (слово, частота) по возрастанию слова"""
+        if not self.runs:
+            yield from sorted(self.counts.items())
+            return
+
+        self.spill()
+        # Промежуточные проходы, пока прогонов больше fan_in
+        while len(self.runs) > self.fan_in:
+            batch, self.runs = self.runs[:self.fan_in], self.runs[self.fan_in:]
+            merged = self._write_run(merge_runs([read_run(path) for path in batch]))
+            for path in batch:
+                path.unlink()
+            self.runs.append(merged)
+
+        yield from merge_runs([read_run(path) for path in self.runs])
+
+    def close(self):
+        self._tmp.cleanup()
@@ -1,29 +1,82 @@
 """Класс для работы с частотными словарями"""
 
-import json
+import os
 import re
+import shutil
 import locale
+import numpy as np
+from array import array
 from pathlib import Path
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
 from collections import defaultdict
 from tqdm import tqdm
 
+from document_store import DocumentStore
+from positional_index import PositionalIndex
+from ngram_counter import NgramCounter
+from sketch_counter import ApproximateCounter
+from external_counter import ExternalCounter
+from edit_batch import EditBatch, read_edits
+from fuzzy_index import FuzzyIndex
+from pattern_index import PatternIndex
+from rank_index import RankIndex
+from spectrum import FrequencySpectrum
+from storage import BACKENDS, DictionaryBackend, ShardedBackend
+from sharding import count_file, merge_shard, run_parallel
 from config import (
-    DEFAULT_DATA_DIR, DEFAULT_DICT_DIR, DICTIONARY_FILE_TEMPLATE,
+    DEFAULT_DATA_DIR, DEFAULT_DICT_DIR, DICTIONARY_FILE_TEMPLATE, DOCUMENTS_FILE_TEMPLATE,
+    POSITIONS_FILE_TEMPLATE, KWIC_LINES, KWIC_WIDTH,
+    NGRAM_FILE_TEMPLATE, NGRAM_MIN_COUNT, NGRAM_CHUNK_TOKENS, NGRAM_PARTITIONS,
+    APPROX_MEMORY_MB, APPROX_SKETCH_DEPTH, EXTERNAL_MERGE_FAN_IN, STORAGE_BACKEND,
+    SHARD_COUNT, SHARD_WORKERS, SPECTRUM_ROWS, GOOD_TURING_MAX_COUNT, FUZZY_MAX_DISTANCE, FUZZY_PREFIX_LENGTH, FUZZY_SUGGESTIONS,
+    TYPO_MAX_COUNT, TYPO_MIN_TARGET_COUNT, TYPO_MIN_RATIO, TYPO_MIN_LENGTH, TYPO_LONG_WORD, TYPO_PREFIX_LENGTH,
     LANGUAGES, LOCALES, CLEAN_PATTERNS, ENCODINGS, ALLOWED_EXTENSIONS,
     MAX_DISPLAY_WORDS, MAX_SEARCH_RESULTS, NUMBER_FORMAT, SORT_SYMBOLS,
     MESSAGES
 )
 
 
+def iter_decoded_lines(file_path: Path, encodings: List[str] = ENCODINGS):
+    """Строки файла, декодируемые по мере чтения (файл читается с диска один раз)
+
+    Строка декодируется текущей кодировкой (вначале - первой из encodings);
+    если она не подходит, для этой строки и остальной части файла берется
+    следующая. Кодировки ENCODINGS совместимы с ASCII, поэтому деление
+    на строки не зависит от кодировки.
+    """
+    current = 0
+    with open(file_path, 'rb') as f:
+        for raw in f:
+            while True:
+                try:
+                    yield raw.decode(encodings[current])
+                    break
+                except UnicodeDecodeError:
+                    current += 1
+                    if current == len(encodings):
+                        raise ValueError(MESSAGES['unicode_decode_error'].format(path=file_path))
+
+
 class FrequencyDictionary:
     """Единый класс для создания и работы с частотными словарями"""
     
-    def __init__(self, data_dir=DEFAULT_DATA_DIR, dict_dir=DEFAULT_DICT_DIR):
+    def __init__(self, data_dir=DEFAULT_DATA_DIR, dict_dir=DEFAULT_DICT_DIR, backend=STORAGE_BACKEND):
         self.data_dir = Path(data_dir)
         self.dict_dir = Path(dict_dir)
+        # Хранилище словарей: json (один файл, dict в памяти), sqlite или sharded (шарды по хэшу слова)
+        self.backend_class = BACKENDS[backend]
+        self.backend: Optional[DictionaryBackend] = None
         self.current_language = None
+        self.current_ngram = 1
         self.current_data = None
+        self.document_store = None
+        self.positional_index = None
+        self.fuzzy_index: Optional[FuzzyIndex] = None
+        self.pattern_index: Optional[PatternIndex] = None
+        self.rank_index: Optional[RankIndex] = None
+        self.spectrum: Optional[FrequencySpectrum] = None
+        # Найденные опечатки по параметрам поиска (сбрасываются при изменении частот)
+        self.typo_cache: Dict[tuple, List[Dict]] = {}
         
         # Создаем директории
         self.data_dir.mkdir(exist_ok=True)
@@ -43,15 +96,19 @@ class FrequencyDictionary:
             return None
         return cleaned
     
+    def clean_entry(self, entry: str) -> Optional[str]:
+        """Очистка записи словаря: слова или (для словаря n-грамм) n слов через пробел"""
+        if self.current_ngram == 1:
+            return self.clean_word(entry, self.current_language)
+        
+        parts = [self.clean_word(part, self.current_language) for part in entry.split()]
+        if len(parts) != self.current_ngram or not all(parts):
+            return None
+        return ' '.join(parts)
+    
     def read_file(self, file_path: Path) -> List[str]:
         """Чтение файла с разными кодировками"""
-        for encoding in ENCODINGS:
-            try:
-                with open(file_path, 'r', encoding=encoding) as f:
-                    return f.readlines()
-            except UnicodeDecodeError:
-                continue
-        raise UnicodeDecodeError(MESSAGES['unicode_decode_error'].format(path=file_path))
+        return list(iter_decoded_lines(file_path))
     
     def set_locale(self, language: str):
         """Установка локали для сортировки"""
@@ -61,20 +118,81 @@ class FrequencyDictionary:
             print(MESSAGES['locale_not_supported'])
             locale.setlocale(locale.LC_COLLATE, "C")
     
-    def get_dictionary_path(self, language: str) -> Path:
-        """Получение пути к файлу словаря"""
-        filename = DICTIONARY_FILE_TEMPLATE.format(language=language)
-        return self.dict_dir / filename
+    def get_dictionary_path(self, language: str, ngram: int = 1) -> Path:
+        """Получение пути к файлу словаря (ngram > 1 - словарь n-грамм)"""
+        if ngram > 1:
+            filename = NGRAM_FILE_TEMPLATE.format(language=language, n=ngram)
+        else:
+            filename = DICTIONARY_FILE_TEMPLATE.format(language=language)
+        return (self.dict_dir / filename).with_suffix(self.backend_class.SUFFIX)
+    
+    def get_documents_path(self, language: str) -> Path:
+        """Получение пути к частотам по документам (без расширения)"""
+        return self.dict_dir / DOCUMENTS_FILE_TEMPLATE.format(language=language)
+    
+    def get_positions_path(self, language: str) -> Path:
+        """Получение пути к позиционному индексу (без расширения)"""
+        return self.dict_dir / POSITIONS_FILE_TEMPLATE.format(language=language)
     
     # ==================== СОЗДАНИЕ СЛОВАРЕЙ ====================
     
-    def create_dictionary(self, language: str, force: bool = False) -> bool:
-        """Создание частотного словаря для языка"""
+    def get_text_files(self, language: str) -> Optional[List[Path]]:
+        """Текстовые файлы языка (None, если их нет)"""
+        lang_dir = self.data_dir / language
+        if not lang_dir.exists():
+            print(MESSAGES['directory_not_found'].format(path=lang_dir))
+            return None
+        
+        txt_files = []
+        for ext in ALLOWED_EXTENSIONS:
+            txt_files.extend(lang_dir.glob(f"*{ext}"))
+        txt_files.sort()
+        
+        if not txt_files:
+            print(MESSAGES['no_txt_files'].format(path=lang_dir))
+            return None
+        return txt_files
+    
+    def iter_file_words(self, file_path: Path, language: str):
+        """Очищенные слова файла по порядку (файл читается построчно, один раз)"""
+        for line in iter_decoded_lines(file_path):
+            for word in line.split():
+                cleaned = self.clean_word(word, language)
+                if cleaned:
+                    yield cleaned
+    
+    def release_dictionary(self, path: Path):
+        """Закрытие открытого словаря, если он будет заменен словарем по пути path"""
+        if self.backend is not None and self.backend.path == path:
+            self.backend.close()
+            self.backend = None
+            self.current_data = None
+            self.fuzzy_index = None
+            self.pattern_index = None
+            self.rank_index = None
+            self.spectrum = None
+            self.typo_cache = {}
+    
+    def write_dictionary(self, language: str, word_counts, meta: Dict, ngram: int = 1) -> int:
+        """Запись нового словаря в хранилище (word_counts - пары слово, частота)"""
+        path = self.get_dictionary_path(language, ngram)
+        self.release_dictionary(path)
+        return self.backend_class(path).write(word_counts, meta)
+    
+    def create_dictionary(self, language: str, force: bool = False, ngram: int = 1,
+                          min_count: int = NGRAM_MIN_COUNT, approximate: bool = False,
+                          memory_mb: int = APPROX_MEMORY_MB, memory_cap_mb: Optional[int] = None) -> bool:
+        """Создание частотного словаря для языка
+
+        ngram > 1 - словарь n-грамм; approximate - приближенные частоты
+        самых частых слов в пределах memory_mb мегабайт; memory_cap_mb -
+        точный подсчет во внешней памяти с ограничением памяти на счетчик.
+        """
         if language not in LANGUAGES:
             print(MESSAGES['unsupported_language'].format(language=language))
             return False
         
-        dict_file = self.get_dictionary_path(language)
+        dict_file = self.get_dictionary_path(language, ngram)
         
         # Проверяем существование
         if dict_file.exists() and not force:
@@ -82,34 +200,44 @@ class FrequencyDictionary:
             return True
         
         # Получаем текстовые файлы
-        lang_dir = self.data_dir / language
-        if not lang_dir.exists():
-            print(MESSAGES['directory_not_found'].format(path=lang_dir))
-            return False
-        
-        txt_files = []
-        for ext in ALLOWED_EXTENSIONS:
-            txt_files.extend(lang_dir.glob(f"*{ext}"))
-        
+        txt_files = self.get_text_files(language)
         if not txt_files:
-            print(MESSAGES['no_txt_files'].format(path=lang_dir))
             return False
         
+        if ngram > 1:
+            if approximate:
+                print(MESSAGES['approximate_ngram'])
+            return self.create_ngram_dictionary(language, txt_files, ngram, min_count)
+        if approximate:
+            return self.create_approximate_dictionary(language, txt_files, memory_mb)
+        if memory_cap_mb is not None:
+            return self.create_external_dictionary(language, txt_files, memory_cap_mb)
+        if self.backend_class is ShardedBackend:
+            return self.create_sharded_dictionary(language, txt_files)
+        
         print(MESSAGES['processing_files'].format(count=len(txt_files), language=language))
         
-        # Обрабатываем файлы
+        # Обрабатываем файлы (частоты и последовательность слов каждого файла сохраняются отдельно)
         word_counts = defaultdict(int)
+        document_counts = {}
+        document_codes = {}
+        word_ids = {}
         
         for file_path in tqdm(txt_files, desc=MESSAGES['creating_dictionary'].format(language=language)):
+            file_counts = defaultdict(int)
+            codes = array('i')
             try:
-                lines = self.read_file(file_path)
-                for line in lines:
-                    for word in line.split():
-                        cleaned = self.clean_word(word, language)
-                        if cleaned:
-                            word_counts[cleaned] += 1
+                for cleaned in self.iter_file_words(file_path, language):
+                    file_counts[cleaned] += 1
+                    codes.append(word_ids.setdefault(cleaned, len(word_ids)))
             except Exception as e:
                 print(MESSAGES['file_read_error'].format(path=file_path, error=e))
+                continue
+            
+            document_counts[file_path.name] = file_counts
+            document_codes[file_path.name] = codes
+            for word, count in file_counts.items():
+                word_counts[word] += count
         
         # Сохраняем словарь
         data = {
@@ -119,8 +247,9 @@ class FrequencyDictionary:
         }
         
         try:
-            with open(dict_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            self.write_dictionary(language, data['word_counts'].items(), data)
+            DocumentStore.from_counts(document_counts, word_counts).save(self.get_documents_path(language))
+            PositionalIndex.build(document_codes, list(word_ids)).save(self.get_positions_path(language))
             
             print(MESSAGES['dictionary_created'].format(language=language))
             print(MESSAGES['total_words'].format(count=NUMBER_FORMAT.format(data['total_words'])))
@@ -131,28 +260,217 @@ class FrequencyDictionary:
             print(MESSAGES['save_error'].format(error=e))
             return False
     
-    def create_all(self, force: bool = False):
+    def create_ngram_dictionary(self, language: str, txt_files: List[Path], ngram: int,
+                                min_count: int = NGRAM_MIN_COUNT) -> bool:
+        """Создание словаря n-грамм (в том же формате, что и словарь слов)
+
+        Слова заменяются кодами, n-граммы - упакованными числовыми ключами;
+        промежуточные частоты сбрасываются на диск, а отсортированные разделы
+        сливаются прямо в хранилище (см. NgramCounter.sorted_ngrams).
+        n-граммы не пересекают границы файлов.
+        """
+        print(MESSAGES['processing_files'].format(count=len(txt_files), language=language))
+        
+        word_ids = {}
+        counter = NgramCounter(ngram, NGRAM_CHUNK_TOKENS, NGRAM_PARTITIONS, self.dict_dir)
+        try:
+            desc = MESSAGES['creating_ngram_dictionary'].format(language=language, n=ngram)
+            for file_path in tqdm(txt_files, desc=desc):
+                codes = array('i')
+                try:
+                    for cleaned in self.iter_file_words(file_path, language):
+                        codes.append(word_ids.setdefault(cleaned, len(word_ids)))
+                        # Длинный файл передается частями с перекрытием в n-1 слово
+                        if len(codes) >= NGRAM_CHUNK_TOKENS:
+                            counter.add(np.frombuffer(codes, dtype=np.int32))
+                            codes = codes[-(ngram - 1):]
+                except Exception as e:
+                    print(MESSAGES['file_read_error'].format(path=file_path, error=e))
+                    continue
+                counter.add(np.frombuffer(codes, dtype=np.int32))
+            
+            # Для расшифровки ключей достаточно слов по кодам
+            vocabulary = np.array(list(word_ids), dtype=object)
+            del word_ids
+            
+            # Сохраняем словарь потоком по убыванию частоты: total_words - все n-граммы
+            # корпуса, включая отброшенные по min_count
+            meta = {'total_words': int(counter.total), 'ngram': ngram, 'min_count': min_count}
+            try:
+                unique = self.write_dictionary(language, counter.sorted_ngrams(vocabulary, min_count), meta, ngram)
+            except Exception as e:
+                print(MESSAGES['save_error'].format(error=e))
+                return False
+        finally:
+            counter.close()
+        
+        print(MESSAGES['ngram_dictionary_created'].format(language=language, n=ngram, min_count=min_count))
+        print(MESSAGES['total_words'].format(count=NUMBER_FORMAT.format(meta['total_words'])))
+        print(MESSAGES['unique_words'].format(count=NUMBER_FORMAT.format(unique)))
+        return True
+    
+    def create_approximate_dictionary(self, language: str, txt_files: List[Path],
+                                      memory_mb: int = APPROX_MEMORY_MB) -> bool:
+        """Создание приближенного словаря частых слов (в формате обычного словаря)
+
+        Частоты считаются Count-Min Sketch и сводкой Misra-Gries (см. ApproximateCounter),
+        поэтому память не зависит от размера словаря корпуса. В словарь попадают
+        только слова-кандидаты сводки; границы ошибок сохраняются в 'error_bounds'.
+        Частоты по документам и позиционный индекс не строятся.
+        """
+        print(MESSAGES['processing_files'].format(count=len(txt_files), language=language))
+        
+        counter = ApproximateCounter(memory_mb * 1024 * 1024, APPROX_SKETCH_DEPTH)
+        for file_path in tqdm(txt_files, desc=MESSAGES['creating_dictionary'].format(language=language)):
+            try:
+                for cleaned in self.iter_file_words(file_path, language):
+                    counter.add(cleaned)
+            except Exception as e:
+                print(MESSAGES['file_read_error'].format(path=file_path, error=e))
+                continue
+        
+        word_counts = counter.results()
+        bounds = counter.error_bounds()
+        data = {
+            'word_counts': dict(word_counts),
+            'total_words': counter.total,
+            'unique_words': len(word_counts),
+            'approximate': True,
+            'memory_mb': memory_mb,
+            'error_bounds': bounds
+        }
+        
+        try:
+            self.write_dictionary(language, data['word_counts'].items(), data)
+            
+            print(MESSAGES['approximate_dictionary_created'].format(language=language, memory_mb=memory_mb))
+            print(MESSAGES['total_words'].format(count=NUMBER_FORMAT.format(data['total_words'])))
+            print(MESSAGES['unique_words'].format(count=NUMBER_FORMAT.format(data['unique_words'])))
+            print(MESSAGES['approximate_bounds'].format(
+                overestimate=NUMBER_FORMAT.format(bounds['max_overestimate']), confidence=1 - bounds['delta'],
+                guaranteed=NUMBER_FORMAT.format(bounds['min_guaranteed_count'])))
+            return True
+            
+        except Exception as e:
+            print(MESSAGES['save_error'].format(error=e))
+            return False
+    
+    def create_external_dictionary(self, language: str, txt_files: List[Path], memory_cap_mb: int) -> bool:
+        """Создание точного словаря во внешней памяти
+
+        Частоты сбрасываются на диск сортированными прогонами, когда счетчик
+        превышает memory_cap_mb (см. ExternalCounter); словарь записывается
+        потоково во время слияния прогонов. Слова в файле идут по алфавиту
+        (порядок кодовых точек). Частоты по документам и позиционный индекс
+        не строятся.
+        """
+        print(MESSAGES['processing_files'].format(count=len(txt_files), language=language))
+        
+        counter = ExternalCounter(memory_cap_mb * 1024 * 1024, EXTERNAL_MERGE_FAN_IN, self.dict_dir)
+        try:
+            for file_path in tqdm(txt_files, desc=MESSAGES['creating_dictionary'].format(language=language)):
+                try:
+                    for cleaned in self.iter_file_words(file_path, language):
+                        counter.add(cleaned)
+                except Exception as e:
+                    print(MESSAGES['file_read_error'].format(path=file_path, error=e))
+                    continue
+            
+            unique = self.write_dictionary(language, counter.results(),
+                                           {'total_words': counter.total, 'external': True})
+            
+            print(MESSAGES['external_dictionary_created'].format(
+                language=language, runs=counter.files_written, memory_cap_mb=memory_cap_mb))
+            print(MESSAGES['total_words'].format(count=NUMBER_FORMAT.format(counter.total)))
+            print(MESSAGES['unique_words'].format(count=NUMBER_FORMAT.format(unique)))
+            return True
+            
+        except Exception as e:
+            print(MESSAGES['save_error'].format(error=e))
+            return False
+        finally:
+            counter.close()
+    
+    def create_sharded_dictionary(self, language: str, txt_files: List[Path],
+                                  shards: int = SHARD_COUNT, workers: int = SHARD_WORKERS) -> bool:
+        """Параллельная сборка шардированного словаря
+
+        Этап 1 - процессы по файлам: частоты файла раскладываются по шардам
+        (crc32 слова mod shards). Этап 2 - процессы по шардам: частичные
+        частоты шарда суммируются и записываются в его файл. В памяти
+        процесса - частоты одного файла или одного шарда. Частоты
+        по документам и позиционный индекс не строятся.
+        """
+        print(MESSAGES['processing_files'].format(count=len(txt_files), language=language))
+        
+        path = self.get_dictionary_path(language)
+        build_dir = path.with_name(path.name + '.tmp')
+        if build_dir.exists():
+            shutil.rmtree(build_dir)
+        build_dir.mkdir(parents=True)
+        workers = workers or os.cpu_count() or 1
+        try:
+            tasks = [(str(self.data_dir), str(file_path), language, shards, str(build_dir), i)
+                     for i, file_path in enumerate(txt_files)]
+            total = 0
+            results = run_parallel(count_file, tasks, workers)
+            for file_path, (count, error) in zip(txt_files, results):
+                if error:
+                    print(MESSAGES['file_read_error'].format(path=file_path, error=error))
+                total += count
+            
+            sizes = run_parallel(merge_shard, [(str(build_dir), index, len(txt_files))
+                                               for index in range(shards)], workers)
+            self.release_dictionary(path)
+            unique = ShardedBackend(path, shards).commit_build(build_dir, sizes,
+                                                               {'total_words': total, 'sharded': True})
+            
+            print(MESSAGES['sharded_dictionary_created'].format(language=language, shards=shards, workers=workers))
+            print(MESSAGES['total_words'].format(count=NUMBER_FORMAT.format(total)))
+            print(MESSAGES['unique_words'].format(count=NUMBER_FORMAT.format(unique)))
+            return True
+            
+        except Exception as e:
+            print(MESSAGES['save_error'].format(error=e))
+            return False
+        finally:
+            if build_dir.exists():
+                shutil.rmtree(build_dir)
+    
+    def create_all(self, force: bool = False, ngram: int = 1, min_count: int = NGRAM_MIN_COUNT,
+                   approximate: bool = False, memory_mb: int = APPROX_MEMORY_MB,
+                   memory_cap_mb: Optional[int] = None):
         """Создание всех словарей"""
         for lang in LANGUAGES:
-            self.create_dictionary(lang, force)
+            self.create_dictionary(lang, force, ngram, min_count, approximate, memory_mb, memory_cap_mb)
     
     # ==================== ЗАГРУЗКА И ИНТЕРФЕЙС ====================
     
-    def load_dictionary(self, language: str) -> bool:
-        """Загрузка словаря"""
+    def load_dictionary(self, language: str, ngram: int = 1) -> bool:
+        """Загрузка словаря (ngram > 1 - словарь n-грамм)"""
         if language not in LANGUAGES:
             print(MESSAGES['unsupported_language'].format(language=language))
             return False
         
-        dict_file = self.get_dictionary_path(language)
+        dict_file = self.get_dictionary_path(language, ngram)
         if not dict_file.exists():
             print(MESSAGES['dictionary_not_found'].format(language=language))
             return False
         
         try:
-            with open(dict_file, 'r', encoding='utf-8') as f:
-                self.current_data = json.load(f)
+            if self.backend is not None:
+                self.backend.close()
+            self.backend = self.backend_class(dict_file)
+            self.current_data = self.backend.load()
             self.current_language = language
+            self.current_ngram = ngram
+            self.document_store = None
+            self.positional_index = None
+            self.fuzzy_index = None
+            self.pattern_index = None
+            self.rank_index = None
+            self.spectrum = None
+            self.typo_cache = {}
             self.set_locale(language)
             return True
         except Exception as e:
@@ -164,15 +482,70 @@ class FrequencyDictionary:
         if not self.current_data or not self.current_language:
             return False
         
-        dict_file = self.get_dictionary_path(self.current_language)
         try:
-            with open(dict_file, 'w', encoding='utf-8') as f:
-                json.dump(self.current_data, f, ensure_ascii=False, indent=2)
+            self.backend.save(self.current_data)
             return True
         except Exception as e:
             print(MESSAGES['save_error'].format(error=e))
             return False
     
+    def has_corpus_indexes(self) -> bool:
+        """Есть ли у текущего словаря частоты по документам и позиционный индекс
+        (строятся только при обычном создании словаря слов)"""
+        return bool(self.current_language and self.current_ngram == 1
+                    and not self.current_data.get('approximate') and not self.current_data.get('external')
+                    and not self.current_data.get('sharded'))
+    
+    def get_document_store(self) -> Optional[DocumentStore]:
+        """Частоты по документам текущего языка (загружаются при первом обращении)"""
+        if not self.has_corpus_indexes():
+            return None
+        if self.document_store is None:
+            self.document_store = DocumentStore.load(self.get_documents_path(self.current_language))
+        return self.document_store
+    
+    def update_documents(self, change) -> bool:
+        """Применение изменения словаря к частотам по документам (если они есть)"""
+        store = self.get_document_store()
+        if store is None:
+            return False
+        change(store)
+        try:
+            store.save(self.get_documents_path(self.current_language))
+            return True
+        except Exception as e:
+            print(MESSAGES['save_error'].format(error=e))
+            return False
+    
+    def get_positional_index(self) -> Optional[PositionalIndex]:
+        """Позиционный индекс текущего языка (открывается при первом обращении)"""
+        if not self.has_corpus_indexes():
+            return None
+        if self.positional_index is None:
+            self.positional_index = PositionalIndex.load(self.get_positions_path(self.current_language))
+        return self.positional_index
+    
+    def update_positions(self, change) -> bool:
+        """Применение изменения словаря к позиционному индексу (если он есть)"""
+        index = self.get_positional_index()
+        if index is None:
+            return False
+        change(index)
+        try:
+            index.save(self.get_positions_path(self.current_language))
+            return True
+        except Exception as e:
+            print(MESSAGES['save_error'].format(error=e))
+            return False
+    
+    def update_corpus_indexes(self, mapping: Dict[str, Optional[str]]):
+        """Переносы (слово → новое слово) и удаления (слово → None) в частотах
+        по документам и позиционном индексе (каждый пересчитывается и сохраняется один раз)"""
+        if not mapping:
+            return
+        self.update_documents(lambda store: store.remap_words(mapping))
+        self.update_positions(lambda index: index.remap_words(mapping))
+    
     def stats(self):
         """Показать статистику"""
         if not self.current_data:
@@ -181,10 +554,61 @@ class FrequencyDictionary:
         
         lang_name = LANGUAGES[self.current_language]
         print(f"\n=== {MESSAGES['stats_title'].format(language=lang_name)} ===")
-        total = NUMBER_FORMAT.format(self.current_data['total_words'])
-        unique = NUMBER_FORMAT.format(self.current_data['unique_words'])
-        print(MESSAGES['total_words'].format(count=total))
-        print(MESSAGES['unique_words'].format(count=unique))
+        stats = self.backend.stats()
+        print(MESSAGES['total_words'].format(count=NUMBER_FORMAT.format(stats['total_words'])))
+        print(MESSAGES['unique_words'].format(count=NUMBER_FORMAT.format(stats['unique_words'])))
+        if 'shards' in stats:
+            sizes = [shard['unique_words'] for shard in stats['shards']]
+            print(MESSAGES['shards_stats'].format(shards=len(sizes), smallest=NUMBER_FORMAT.format(min(sizes)),
+                                                 largest=NUMBER_FORMAT.format(max(sizes))))
+        
+        bounds = self.current_data.get('error_bounds')
+        if self.current_data.get('approximate') and bounds:
+            print(MESSAGES['approximate_bounds'].format(
+                overestimate=NUMBER_FORMAT.format(bounds['max_overestimate']), confidence=1 - bounds['delta'],
+                guaranteed=NUMBER_FORMAT.format(bounds['min_guaranteed_count'])))
+        self.print_lexical_stats(self.lexical_stats())
+    
+    def get_spectrum(self) -> FrequencySpectrum:
+        """Частотный спектр (строится при первом обращении, затем обновляется вместе со словарем)"""
+        if self.spectrum is None:
+            self.spectrum = FrequencySpectrum.build(self.current_data['word_counts'].values())
+        return self.spectrum
+    
+    def lexical_stats(self) -> Dict:
+        """Показатели лексического богатства и спектр [(m, V(m)), ...] (см. FrequencySpectrum.measures)"""
+        spectrum = self.get_spectrum()
+        return {**spectrum.measures(GOOD_TURING_MAX_COUNT), 'spectrum': spectrum.items()}
+    
+    def print_lexical_stats(self, lexical: Dict):
+        print(f"\n{MESSAGES['lexical_title']}")
+        types = lexical['types'] or 1
+        for name in ('hapax_legomena', 'dis_legomena'):
+            print(MESSAGES[name].format(count=NUMBER_FORMAT.format(lexical[name]), share=lexical[name] / types))
+        for name in ('ttr', 'yule_k', 'simpson_d', 'honore_r'):
+            if lexical[name] is not None:
+                print(MESSAGES[name].format(value=lexical[name]))
+        
+        good_turing = lexical['good_turing']
+        if good_turing['unseen_probability'] is not None:
+            print(MESSAGES['good_turing_unseen'].format(value=good_turing['unseen_probability']))
+            print(MESSAGES['good_turing_counts'].format(
+                counts=', '.join(f"{r}→{value:.2f}" for r, value in good_turing['adjusted_counts'].items())))
+        
+        print(MESSAGES['spectrum_title'])
+        for m, count in lexical['spectrum'][:SPECTRUM_ROWS]:
+            if m > SPECTRUM_ROWS:
+                break
+            print(MESSAGES['spectrum_format'].format(m=m, count=NUMBER_FORMAT.format(count)))
+    
+    def sorted_words(self, by_freq: bool = False, reverse: bool = False,
+                     offset: int = 0, limit: Optional[int] = None) -> List[tuple]:
+        """Страница отсортированного списка пар (слово, частота)"""
+        return self.backend.sorted_page(by_freq, reverse, offset, limit)
+    
+    def find_prefix(self, pattern: str, limit: Optional[int] = None, by_freq: bool = True, reverse: bool = False):
+        """Слова с началом pattern (по умолчанию по убыванию частоты, не больше limit) и их общее число"""
+        return self.backend.search(pattern, limit, by_freq, reverse)
     
     def display_sorted(self, by_freq: bool = False, reverse: bool = False):
         """Показать отсортированный список"""
@@ -192,46 +616,83 @@ class FrequencyDictionary:
             print(MESSAGES['no_dictionary_loaded'])
             return
         
-        words = list(self.current_data['word_counts'].items())
+        words = self.sorted_words(by_freq, reverse, limit=MAX_DISPLAY_WORDS)
+        total = len(self.current_data['word_counts'])
         
         if by_freq:
-            words.sort(key=lambda x: x[1], reverse=not reverse)
             direction = SORT_SYMBOLS['asc'] if reverse else SORT_SYMBOLS['desc']
             sort_type = MESSAGES['sorted_by_frequency'].format(direction=direction)
         else:
-            words.sort(key=lambda x: locale.strxfrm(x[0]), reverse=reverse)
             direction = SORT_SYMBOLS['desc'] if reverse else SORT_SYMBOLS['asc']
             sort_type = MESSAGES['sorted_by_alphabet'].format(direction=direction)
         
         print(f"\n=== {sort_type} ===")
-        display_count = min(len(words), MAX_DISPLAY_WORDS)
-        for i, (word, count) in enumerate(words[:display_count]):
+        for i, (word, count) in enumerate(words):
             formatted_count = NUMBER_FORMAT.format(count)
             print(f"{i+1:3d}. {word:20s} : {formatted_count:>8s}")
         
-        if len(words) > MAX_DISPLAY_WORDS:
-            remaining = len(words) - MAX_DISPLAY_WORDS
+        if total > MAX_DISPLAY_WORDS:
+            remaining = total - MAX_DISPLAY_WORDS
             print(MESSAGES['more_words'].format(count=remaining))
     
+    def get_pattern_index(self) -> PatternIndex:
+        """Индексы поиска по окончанию и шаблону (строятся при первом обращении)"""
+        if self.pattern_index is None:
+            self.pattern_index = PatternIndex.build(self.current_data['word_counts'])
+        return self.pattern_index
+    
+    def _with_counts(self, words: List[str], limit: Optional[int], by_freq: bool, reverse: bool):
+        word_counts = self.current_data['word_counts']
+        found = self.backend.sort_words([(word, word_counts[word]) for word in words], by_freq, reverse)
+        return found[:limit], len(found)
+    
+    def find_suffix(self, suffix: str, limit: Optional[int] = None, by_freq: bool = True, reverse: bool = False):
+        """Слова с окончанием suffix (по умолчанию по убыванию частоты, не больше limit) и их общее число"""
+        return self._with_counts(self.get_pattern_index().with_suffix(suffix), limit, by_freq, reverse)
+    
+    def find_pattern(self, pattern: str, limit: Optional[int] = None, regex: bool = False,
+                     by_freq: bool = True, reverse: bool = False):
+        """Слова по шаблону с * и ? (regex=False) или регулярному выражению и их общее число;
+        неверное выражение - ValueError"""
+        try:
+            words = self.get_pattern_index().match(pattern, regex)
+        except re.error as e:
+            raise ValueError(MESSAGES['invalid_regex'].format(pattern=pattern, error=e))
+        return self._with_counts(words, limit, by_freq, reverse)
+    
+    def find_words(self, query: str, limit: Optional[int] = None, by_freq: bool = True, reverse: bool = False):
+        """Поиск по строке запроса: re:выражение, шаблон с * или ?, -окончание или начало слова"""
+        if query.startswith('re:'):
+            return self.find_pattern(query[3:], limit, True, by_freq, reverse)
+        if '*' in query or '?' in query:
+            return self.find_pattern(query, limit, False, by_freq, reverse)
+        # Очищенные слова не начинаются с дефиса
+        if query.startswith('-') and len(query) > 1:
+            return self.find_suffix(query[1:], limit, by_freq, reverse)
+        return self.find_prefix(query, limit, by_freq, reverse)
+    
     def search(self, pattern: str):
-        """Поиск слов по шаблону"""
+        """Поиск слов: по началу, окончанию (-окончание), шаблону с * и ? или выражению (re:...)"""
         if not self.current_data:
             print(MESSAGES['no_dictionary_loaded'])
             return
         
-        pattern = pattern.lower().strip()
-        found = [(w, c) for w, c in self.current_data['word_counts'].items() 
-                if w.startswith(pattern)]
-        found.sort(key=lambda x: x[1], reverse=True)
+        pattern = pattern.strip()
+        if not pattern.startswith('re:'):
+            pattern = pattern.lower()
+        try:
+            found, total = self.find_words(pattern, MAX_SEARCH_RESULTS)
+        except ValueError as e:
+            print(e)
+            return
         
-        print(f"\n=== {MESSAGES['search_results'].format(pattern=pattern, count=len(found))} ===")
-        display_count = min(len(found), MAX_SEARCH_RESULTS)
-        for i, (word, count) in enumerate(found[:display_count]):
+        print(f"\n=== {MESSAGES['search_results'].format(pattern=pattern, count=total)} ===")
+        for i, (word, count) in enumerate(found):
             formatted_count = NUMBER_FORMAT.format(count)
             print(f"{i+1:3d}. {word:20s} : {formatted_count:>8s}")
         
-        if len(found) > MAX_SEARCH_RESULTS:
-            remaining = len(found) - MAX_SEARCH_RESULTS
+        if total > MAX_SEARCH_RESULTS:
+            remaining = total - MAX_SEARCH_RESULTS
             print(MESSAGES['more_words'].format(count=remaining))
     
     def correct_word(self, wrong: str, correct: str) -> bool:
@@ -247,19 +708,40 @@ class FrequencyDictionary:
             print(MESSAGES['empty_word'])
             return False
         
+        # В словаре n-грамм исправляется запись целиком: исправление тоже должно быть n-граммой
+        if self.current_ngram > 1:
+            wrong = ' '.join(wrong.split())
+            correct = self.clean_entry(correct)
+            if not correct:
+                print(MESSAGES['invalid_ngram'].format(n=self.current_ngram))
+                return False
+        
+        if wrong == correct:
+            print(MESSAGES['same_word'].format(word=wrong))
+            return False
+        
         if wrong not in self.current_data['word_counts']:
             print(MESSAGES['word_not_found'].format(word=wrong))
+            suggestions = self.find_similar(wrong, limit=5)
+            if suggestions:
+                print(MESSAGES['did_you_mean'].format(
+                    words=', '.join(f"{word} ({NUMBER_FORMAT.format(count)})" for word, _, count in suggestions)))
             return False
         
-        # Переносим частоту
+        # Переносим частоту и обновляем статистику
         count = self.current_data['word_counts'].pop(wrong)
-        if correct in self.current_data['word_counts']:
+        correct_count = self.current_data['word_counts'].get(correct)
+        if correct_count is not None:
             self.current_data['word_counts'][correct] += count
+            self.current_data['unique_words'] -= 1
         else:
             self.current_data['word_counts'][correct] = count
-        
-        # Обновляем статистику
-        self.current_data['unique_words'] = len(self.current_data['word_counts'])
+        self.update_corpus_indexes({wrong: correct})
+        self.update_word_indexes(added=[correct], removed=[wrong])
+        changes = {}
+        self.record_count_change(changes, wrong, count, None)
+        self.record_count_change(changes, correct, correct_count, (correct_count or 0) + count)
+        self.update_word_counts(changes)
         
         if self.save_current():
             print(MESSAGES['word_corrected'].format(wrong=wrong, correct=correct, count=count))
@@ -276,6 +758,10 @@ class FrequencyDictionary:
         if not word:
             print(MESSAGES['empty_word'])
             return False
+        
+        # В словаре n-грамм удаляется запись целиком (слова через один пробел)
+        if self.current_ngram > 1:
+            word = ' '.join(word.split())
             
         if word not in self.current_data['word_counts']:
             print(MESSAGES['word_not_found'].format(word=word))
@@ -288,7 +774,10 @@ class FrequencyDictionary:
         
         count = self.current_data['word_counts'].pop(word)
         self.current_data['total_words'] -= count
-        self.current_data['unique_words'] = len(self.current_data['word_counts'])
+        self.current_data['unique_words'] -= 1
+        self.update_corpus_indexes({word: None})
+        self.update_word_indexes(removed=[word])
+        self.update_word_counts({word: (count, None)})
         
         if self.save_current():
             print(MESSAGES['word_deleted'].format(word=word))
@@ -306,7 +795,7 @@ class FrequencyDictionary:
             print(MESSAGES['empty_word'])
             return False
             
-        cleaned = self.clean_word(word, self.current_language)
+        cleaned = self.clean_entry(word)
         
         if not cleaned:
             print(MESSAGES['invalid_word'])
@@ -317,15 +806,28 @@ class FrequencyDictionary:
             return False
         
         self.current_data['word_counts'][cleaned] = 0
-        self.current_data['unique_words'] = len(self.current_data['word_counts'])
+        self.current_data['unique_words'] += 1
+        self.update_word_indexes(added=[cleaned])
+        self.update_word_counts({cleaned: (None, 0)})
         
         if self.save_current():
             print(MESSAGES['word_added'].format(word=cleaned))
             return True
         return False
     
-    def add_text_file(self, file_path: str) -> bool:
-        """Пополнение словаря новым текстом"""
+    def unique_document_name(self, name: str) -> str:
+        """Имя нового документа: name, а если такой документ уже есть - «имя (2).txt», «имя (3).txt»..."""
+        store = self.get_document_store()
+        existing = set(store.documents) if store is not None else set()
+        stem, suffix = Path(name).stem, Path(name).suffix
+        candidate, number = name, 2
+        while candidate in existing:
+            candidate = f"{stem} ({number}){suffix}"
+            number += 1
+        return candidate
+    
+    def add_text_file(self, file_path: str, document_name: Optional[str] = None) -> bool:
+        """Пополнение словаря новым текстом (document_name - имя документа в частотах по документам)"""
         if not self.current_data:
             print(MESSAGES['no_dictionary_loaded'])
             return False
@@ -339,45 +841,409 @@ class FrequencyDictionary:
         try:
             lines = self.read_file(file_path)
             new_counts = defaultdict(int)
+            new_words_sequence = []
             
             for line in tqdm(lines, desc=MESSAGES['processing_lines']):
                 for word in line.split():
                     cleaned = self.clean_word(word, self.current_language)
                     if cleaned:
                         new_counts[cleaned] += 1
+                        new_words_sequence.append(cleaned)
+            
+            # Для словаря n-грамм считаются n-граммы нового текста
+            if self.current_ngram > 1:
+                new_counts = defaultdict(int)
+                windows = zip(*(new_words_sequence[i:] for i in range(self.current_ngram)))
+                for window in windows:
+                    new_counts[' '.join(window)] += 1
             
             # Статистика
             old_total = self.current_data['total_words']
             old_unique = self.current_data['unique_words']
-            new_words = 0
+            added = []
+            changes = {}
             total_new = sum(new_counts.values())
             
-            # Обновляем словарь
-            for word, count in new_counts.items():
-                if word in self.current_data['word_counts']:
-                    self.current_data['word_counts'][word] += count
-                else:
-                    self.current_data['word_counts'][word] = count
-                    new_words += 1
+            # Обновляем словарь (одной транзакцией: сохраняется целиком или откатывается)
+            with self.backend.transaction():
+                for word, count in new_counts.items():
+                    old_count = self.current_data['word_counts'].get(word)
+                    if old_count is not None:
+                        self.current_data['word_counts'][word] = old_count + count
+                    else:
+                        self.current_data['word_counts'][word] = count
+                        added.append(word)
+                    changes[word] = (old_count, (old_count or 0) + count)
+                
+                self.current_data['total_words'] += total_new
+                self.current_data['unique_words'] += len(added)
+            self.update_word_indexes(added=added)
+            self.update_word_counts(changes)
+            document_name = self.unique_document_name(document_name or file_path.name)
+            self.update_documents(lambda store: store.add_document(document_name, new_counts))
+            self.update_positions(lambda index: index.add_document(document_name,
+                                                                   new_words_sequence))
             
-            self.current_data['total_words'] += total_new
-            self.current_data['unique_words'] = len(self.current_data['word_counts'])
+            print(f"\n{MESSAGES['update_stats_title']}")
+            print(MESSAGES['new_words_processed'].format(count=NUMBER_FORMAT.format(total_new)))
+            print(MESSAGES['new_unique_words'].format(count=len(added)))
             
-            if self.save_current():
-                print(f"\n{MESSAGES['update_stats_title']}")
-                print(MESSAGES['new_words_processed'].format(count=NUMBER_FORMAT.format(total_new)))
-                print(MESSAGES['new_unique_words'].format(count=new_words))
-                
-                old_total_fmt = NUMBER_FORMAT.format(old_total)
-                new_total_fmt = NUMBER_FORMAT.format(self.current_data['total_words'])
-                print(MESSAGES['total_words_change'].format(old=old_total_fmt, new=new_total_fmt))
-                
-                old_unique_fmt = NUMBER_FORMAT.format(old_unique)
-                new_unique_fmt = NUMBER_FORMAT.format(self.current_data['unique_words'])
-                print(MESSAGES['unique_words_change'].format(old=old_unique_fmt, new=new_unique_fmt))
-                return True
-            return False
+            old_total_fmt = NUMBER_FORMAT.format(old_total)
+            new_total_fmt = NUMBER_FORMAT.format(self.current_data['total_words'])
+            print(MESSAGES['total_words_change'].format(old=old_total_fmt, new=new_total_fmt))
+            
+            old_unique_fmt = NUMBER_FORMAT.format(old_unique)
+            new_unique_fmt = NUMBER_FORMAT.format(self.current_data['unique_words'])
+            print(MESSAGES['unique_words_change'].format(old=old_unique_fmt, new=new_unique_fmt))
+            return True
                 
         except Exception as e:
             print(MESSAGES['error_occurred'].format(error=e))
-            return False
\ No newline at end of file
+            return False
+    
+    def apply_edits(self, edits, dry_run: bool = False) -> Optional[Dict]:
+        """Пакет правок add/delete/correct/merge (см. edit_batch) одной транзакцией
+
+        edits - путь к файлу правок или список (номер строки, поля). Все правки
+        сначала проверяются на наложении поверх словаря; при ошибках или dry_run
+        словарь не меняется. Иначе правки применяются за один проход, словарь
+        сохраняется один раз, частоты по документам и позиционный индекс
+        пересчитываются один раз. Возвращает отчет (см. EditBatch.report).
+        """
+        if not self.current_data:
+            print(MESSAGES['no_dictionary_loaded'])
+            return None
+        
+        if isinstance(edits, (str, Path)):
+            try:
+                edits = read_edits(Path(edits))
+            except OSError:
+                print(MESSAGES['file_not_found'].format(path=edits))
+                return None
+        
+        batch = EditBatch(self.current_data['word_counts'], self.clean_entry).plan(edits)
+        report = batch.report(self.current_data, applied=not dry_run and not batch.errors)
+        if report['applied']:
+            word_counts = self.current_data['word_counts']
+            changes = {word: (word_counts.get(word), count) for word, count in batch.changes.items()}
+            try:
+                with self.backend.transaction():
+                    batch.apply(self.current_data)
+            except Exception as e:
+                print(MESSAGES['save_error'].format(error=e))
+                report['applied'] = False
+                return report
+            self.update_corpus_indexes(batch.corpus_mapping)
+            self.update_word_indexes(added=[word for word, count in batch.changes.items() if count is not None],
+                                    removed=[word for word, count in batch.changes.items() if count is None])
+            self.update_word_counts(changes)
+        
+        self.print_edit_report(report, dry_run)
+        return report
+    
+    def print_edit_report(self, report: Dict, dry_run: bool):
+        if dry_run:
+            title = MESSAGES['edits_dry_run']
+        elif report['applied']:
+            title = MESSAGES['edits_applied']
+        else:
+            title = MESSAGES['edits_rejected'].format(count=len(report['errors']))
+        print(f"\n=== {title} ===")
+        print(MESSAGES['edits_operations'].format(**report['operations']))
+        
+        for name, message in (('total_words', 'total_words_change'), ('unique_words', 'unique_words_change')):
+            change = report[name]
+            print(MESSAGES[message].format(old=NUMBER_FORMAT.format(change['old']),
+                                           new=NUMBER_FORMAT.format(change['new'])))
+        
+        for error in report['errors'][:MAX_DISPLAY_WORDS]:
+            print(MESSAGES['edit_error'].format(**error))
+        if len(report['errors']) > MAX_DISPLAY_WORDS:
+            print(MESSAGES['more_errors'].format(count=len(report['errors']) - MAX_DISPLAY_WORDS))
+    
+    # ==================== ЧАСТОТЫ И РАНГИ ====================
+    
+    def get_rank_index(self) -> RankIndex:
+        """Слова по убыванию частоты (строится при первом обращении, затем обновляется вместе со словарем)"""
+        if self.rank_index is None:
+            self.rank_index = RankIndex.build(self.current_data['word_counts'])
+        return self.rank_index
+    
+    def words_by_count(self, min_count: int, max_count: Optional[int] = None,
+                       offset: int = 0, limit: Optional[int] = None) -> Tuple[List[tuple], int]:
+        """Слова с частотой от min_count до max_count включительно (по убыванию частоты) и их общее число"""
+        return self.get_rank_index().in_range(min_count, max_count, offset, limit)
+    
+    def word_at_rank(self, rank: int) -> Optional[tuple]:
+        """(слово, частота) на ранге rank (ранг 1 - самое частое слово)"""
+        return self.get_rank_index().at_rank(rank)
+    
+    def word_rank(self, word: str) -> Optional[Dict]:
+        """Ранг слова и диапазон рангов слов с той же частотой (None - слова нет)"""
+        index = self.get_rank_index()
+        rank = index.rank(word)
+        if rank is None:
+            return None
+        count = int(index.counts[rank - 1])
+        first, last = index.tied_ranks(count)
+        return {'word': word, 'count': count, 'rank': rank, 'tied_from': first, 'tied_to': last}
+    
+    def display_count_range(self, min_count: int, max_count: Optional[int] = None):
+        """Показать слова с частотой в диапазоне"""
+        if not self.current_data:
+            print(MESSAGES['no_dictionary_loaded'])
+            return
+        
+        words, total = self.words_by_count(min_count, max_count, limit=MAX_DISPLAY_WORDS)
+        upper = '∞' if max_count is None else NUMBER_FORMAT.format(max_count)
+        print(f"\n=== {MESSAGES['count_range_title'].format(low=NUMBER_FORMAT.format(min_count), high=upper, count=total)} ===")
+        for i, (word, count) in enumerate(words):
+            print(f"{i+1:3d}. {word:20s} : {NUMBER_FORMAT.format(count):>8s}")
+        if total > MAX_DISPLAY_WORDS:
+            print(MESSAGES['more_words'].format(count=total - MAX_DISPLAY_WORDS))
+    
+    def display_rank(self, query: str):
+        """Показать слово на ранге (query - число или #число) или ранг слова"""
+        if not self.current_data:
+            print(MESSAGES['no_dictionary_loaded'])
+            return
+        
+        query = query.lower().strip()
+        if query.lstrip('#').isdigit():
+            query = query.lstrip('#')
+            found = self.word_at_rank(int(query))
+            if not found:
+                print(MESSAGES['rank_out_of_range'].format(rank=query, count=len(self.get_rank_index())))
+                return
+            info = self.word_rank(found[0])
+        else:
+            info = self.word_rank(query)
+            if not info:
+                print(MESSAGES['word_not_found'].format(word=query))
+                return
+        print(MESSAGES['rank_format'].format(word=info['word'], rank=NUMBER_FORMAT.format(info['rank']),
+                                             count=NUMBER_FORMAT.format(info['count']),
+                                             first=NUMBER_FORMAT.format(info['tied_from']),
+                                             last=NUMBER_FORMAT.format(info['tied_to'])))
+    
+    # ==================== НЕЧЕТКИЙ ПОИСК И ОПЕЧАТКИ ====================
+    
+    def get_fuzzy_index(self) -> FuzzyIndex:
+        """Индекс нечеткого поиска по словам текущего словаря (строится при первом обращении)"""
+        if self.fuzzy_index is None:
+            print(MESSAGES['building_fuzzy_index'])
+            self.fuzzy_index = FuzzyIndex.build(self.current_data['word_counts'], FUZZY_MAX_DISTANCE,
+                                                FUZZY_PREFIX_LENGTH)
+        return self.fuzzy_index
+    
+    def update_word_indexes(self, added=(), removed=()):
+        """Учет появившихся и удаленных слов в уже построенных индексах слов
+        (нечеткого поиска и поиска по окончанию и шаблону)"""
+        for index in (self.fuzzy_index, self.pattern_index):
+            if index is not None:
+                index.update(added, removed)
+    
+    @staticmethod
+    def record_count_change(changes: Dict[str, Tuple[Optional[int], Optional[int]]], word: str,
+                            old: Optional[int], new: Optional[int]):
+        """Добавление изменения частоты в changes для update_word_counts: повторное
+        изменение того же слова сохраняет его исходную частоту (одна пара на слово)"""
+        if word in changes:
+            old = changes[word][0]
+        changes[word] = (old, new)
+    
+    def update_word_counts(self, changes: Dict[str, Tuple[Optional[int], Optional[int]]]):
+        """Учет изменившихся частот (слово → (старая, новая частота), None - слова нет)
+        в уже построенных спектре и индексе рангов; найденные опечатки устаревают"""
+        if not changes:
+            return
+        self.typo_cache = {}
+        if self.rank_index is not None:
+            self.rank_index.update(changes)
+        if self.spectrum is not None:
+            for old, new in changes.values():
+                self.spectrum.update(old, new)
+    
+    def find_similar(self, word: str, max_distance: int = FUZZY_MAX_DISTANCE,
+                     limit: Optional[int] = FUZZY_SUGGESTIONS) -> List[tuple]:
+        """Слова словаря на расстоянии правки от 1 до max_distance: (слово, расстояние, частота)
+        по возрастанию расстояния и убыванию частоты"""
+        word = word.lower().strip()
+        if not self.current_data or not word:
+            return []
+        return self.get_fuzzy_index().lookup(word, self.current_data['word_counts'].get, max_distance, limit)
+    
+    def suggest(self, word: str, max_distance: int = FUZZY_MAX_DISTANCE,
+                limit: int = FUZZY_SUGGESTIONS) -> List[tuple]:
+        """Показать варианты исправления слова"""
+        if not self.current_data:
+            print(MESSAGES['no_dictionary_loaded'])
+            return []
+        
+        word = word.lower().strip()
+        suggestions = self.find_similar(word, max_distance, limit)
+        print(f"\n=== {MESSAGES['suggestions_title'].format(word=word, distance=max_distance, count=len(suggestions))} ===")
+        if not suggestions:
+            print(MESSAGES['no_suggestions'])
+        for i, (candidate, distance, count) in enumerate(suggestions, 1):
+            print(MESSAGES['suggestion_format'].format(index=i, word=candidate, count=NUMBER_FORMAT.format(count),
+                                                       distance=distance))
+        return suggestions
+    
+    def find_typos(self, max_count: int = TYPO_MAX_COUNT, min_target_count: int = TYPO_MIN_TARGET_COUNT,
+                   min_ratio: float = TYPO_MIN_RATIO) -> List[Dict]:
+        """Предложения исправлений для всех редких слов (частота не выше max_count),
+        похожих на частое слово (частота не ниже min_target_count и min_ratio × частота слова)
+        
+        Поиск идет по отдельному индексу только частых слов с более длинным
+        индексируемым началом слова: кандидатов на каждое редкое слово мало.
+        Слова короче TYPO_MIN_LENGTH пропускаются, слова короче TYPO_LONG_WORD
+        ищутся только на расстоянии 1. Результат запоминается до следующего
+        изменения частот (см. update_word_counts).
+        """
+        if not self.current_data:
+            return []
+        
+        key = (max_count, min_target_count, min_ratio)
+        if key in self.typo_cache:
+            return self.typo_cache[key]
+        
+        rare, targets = [], {}
+        for word, count in self.current_data['word_counts'].items():
+            if count <= max_count and len(word) >= TYPO_MIN_LENGTH:
+                rare.append((word, count))
+            if count >= min_target_count:
+                targets[word] = count
+        index = FuzzyIndex.build(targets, FUZZY_MAX_DISTANCE, TYPO_PREFIX_LENGTH)
+        
+        proposals = []
+        for word, count in tqdm(rare, desc=MESSAGES['searching_typos']):
+            max_distance = 1 if len(word) < TYPO_LONG_WORD else FUZZY_MAX_DISTANCE
+            for target, distance, target_count in index.lookup(word, targets.get, max_distance):
+                if target_count >= min_ratio * count:
+                    proposals.append({'word': word, 'count': count, 'target': target,
+                                      'target_count': target_count, 'distance': distance})
+                    break
+        proposals.sort(key=lambda item: (item['distance'], -item['target_count'], item['word']))
+        self.typo_cache[key] = proposals
+        return proposals
+    
+    def propose_merges(self, output: Optional[str] = None, max_count: int = TYPO_MAX_COUNT) -> List[Dict]:
+        """Показать предложения исправлений опечаток и записать их файлом правок для apply_edits"""
+        if not self.current_data:
+            print(MESSAGES['no_dictionary_loaded'])
+            return []
+        
+        proposals = self.find_typos(max_count)
+        print(f"\n=== {MESSAGES['typos_title'].format(count=len(proposals))} ===")
+        for item in proposals[:MAX_DISPLAY_WORDS]:
+            print(MESSAGES['typo_format'].format(**item))
+        if len(proposals) > MAX_DISPLAY_WORDS:
+            print(MESSAGES['more_words'].format(count=len(proposals) - MAX_DISPLAY_WORDS))
+        
+        if output:
+            try:
+                with open(output, 'w', encoding='utf-8') as f:
+                    for item in proposals:
+                        f.write(f"# {item['count']} → {item['target_count']}, {item['distance']}\n")
+                        f.write(f"correct\t{item['word']}\t{item['target']}\n")
+                print(MESSAGES['typos_saved'].format(path=output, language=self.current_language))
+            except OSError as e:
+                print(MESSAGES['save_error'].format(error=e))
+        return proposals
+    
+    # ==================== ПОДКОРПУСА ====================
+    
+    def _require_documents(self) -> Optional[DocumentStore]:
+        if not self.current_data:
+            print(MESSAGES['no_dictionary_loaded'])
+            return None
+        store = self.get_document_store()
+        if store is None:
+            print(MESSAGES['documents_not_found'].format(language=LANGUAGES[self.current_language]))
+        return store
+    
+    def list_documents(self) -> List[str]:
+        """Показать документы корпуса"""
+        store = self._require_documents()
+        if store is None:
+            return []
+        
+        print(f"\n=== {MESSAGES['documents_title'].format(count=len(store.documents))} ===")
+        for i, (name, count) in enumerate(zip(store.documents, store.document_lengths()), 1):
+            print(MESSAGES['document_format'].format(index=i, name=name, count=NUMBER_FORMAT.format(int(count))))
+        return store.documents
+    
+    def subcorpus_frequency(self, word: str, documents=None) -> Optional[Dict]:
+        """Частота и ранг слова в наборе документов (None - все документы)"""
+        store = self._require_documents()
+        if store is None:
+            return None
+        
+        try:
+            result = store.frequency(word.lower().strip(), documents)
+        except KeyError as e:
+            print(MESSAGES['unknown_document'].format(document=e.args[0]))
+            return None
+        
+        self._print_subcorpus_title(store, documents)
+        if result['count']:
+            print(MESSAGES['subcorpus_word'].format(
+                word=result['word'], count=NUMBER_FORMAT.format(result['count']),
+                rank=result['rank'], per_million=result['per_million']))
+        else:
+            print(MESSAGES['subcorpus_word_missing'].format(word=result['word']))
+        print(MESSAGES['total_words'].format(count=NUMBER_FORMAT.format(result['total_words'])))
+        print(MESSAGES['unique_words'].format(count=NUMBER_FORMAT.format(result['unique_words'])))
+        return result
+    
+    def subcorpus_top(self, documents=None, top_n: int = MAX_DISPLAY_WORDS) -> List[tuple]:
+        """Самые частые слова в наборе документов (None - все документы)"""
+        store = self._require_documents()
+        if store is None:
+            return []
+        
+        try:
+            words = store.top(top_n, documents)
+        except KeyError as e:
+            print(MESSAGES['unknown_document'].format(document=e.args[0]))
+            return []
+        
+        self._print_subcorpus_title(store, documents)
+        print(f"=== {MESSAGES['subcorpus_top'].format(count=len(words))} ===")
+        for i, (word, count) in enumerate(words):
+            formatted_count = NUMBER_FORMAT.format(count)
+            print(f"{i+1:3d}. {word:20s} : {formatted_count:>8s}")
+        return words
+    
+    def _print_subcorpus_title(self, store: DocumentStore, documents):
+        if documents is None:
+            names = MESSAGES['subcorpus_all']
+        else:
+            names = ', '.join(store.documents[i] for i in store.resolve(documents))
+        print(f"\n=== {MESSAGES['subcorpus_title'].format(documents=names)} ===")
+    
+    # ==================== КОНКОРДАНС ====================
+    
+    def concordance(self, word: str, limit: int = KWIC_LINES, width: int = KWIC_WIDTH) -> List[Dict]:
+        """Слово в контексте: до limit вхождений с width словами слева и справа"""
+        if not self.current_data:
+            print(MESSAGES['no_dictionary_loaded'])
+            return []
+        
+        index = self.get_positional_index()
+        if index is None:
+            print(MESSAGES['positions_not_found'].format(language=LANGUAGES[self.current_language]))
+            return []
+        
+        word = word.lower().strip()
+        lines = index.concordance(word, limit, width)
+        if not lines:
+            print(MESSAGES['word_not_found'].format(word=word))
+            return []
+        
+        print(f"\n=== {MESSAGES['concordance_title'].format(word=word, count=len(lines), total=lines[0]['total'])} ===")
+        for line in lines:
+            print(f"{line['left']:>{width * 9}s} [{line['word']}] {line['right']}")
+            print(f"{'':>{width * 9}s} {MESSAGES['concordance_source'].format(document=line['document'], offset=line['offset'])}")
+        return lines
\ No newline at end of file
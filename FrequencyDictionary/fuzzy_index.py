@@ -0,0 +1,145 @@
+"""Нечеткий поиск слов (индекс удалений SymSpell) для исправления опечаток"""
+
+import numpy as np
+from array import array
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+
+def deletes(word: str, max_distance: int) -> Set[str]:
+    """Само слово и все строки, получаемые из него удалением до max_distance символов"""
+    result = {word}
+    level = {word}
+    for _ in range(max_distance):
+        level = {item[:i] + item[i + 1:] for item in level if item for i in range(len(item))}
+        result |= level
+    return result
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """Расстояние Дамерау-Левенштейна (перестановка соседних символов - одна правка);
+    при превышении max_distance возвращает max_distance + 1"""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    # Общие начало и конец не меняют расстояние: таблица строится только для различающейся середины
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    end = 0
+    while end < len(a) - start and end < len(b) - start and a[-1 - end] == b[-1 - end]:
+        end += 1
+    a, b = a[start:len(a) - end], b[start:len(b) - end]
+    if not a or not b:
+        return min(len(a) + len(b), max_distance + 1)
+
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous2, previous = previous, current
+    return min(previous[-1], max_distance + 1)
+
+
+class FuzzyIndex:
+    """Индекс удалений (SymSpell) для поиска слов на расстоянии правки до max_distance
+
+    Для каждого слова словаря запоминаются строки, получаемые удалением
+    до max_distance символов из его первых prefix_length символов. Слова
+    на расстоянии не больше max_distance от запроса имеют с ним общую
+    такую строку, поэтому кандидаты находятся по удалениям запроса без
+    перебора словаря и затем проверяются точным расстоянием.
+
+    Хэши удалений хранятся в отсортированном массиве NumPy (keys) вместе
+    с номерами слов (ids). Слова, добавленные после построения, попадают
+    в небольшой словарь added; удаленные помечаются в removed.
+    """
+
+    def __init__(self, words: List[str], keys: np.ndarray, ids: np.ndarray,
+                 max_distance: int, prefix_length: int):
+        self.words = words
+        self.word_ids = {word: i for i, word in enumerate(words)}
+        self.keys = keys
+        self.ids = ids
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.added: Dict[int, List[int]] = {}
+        self.removed: Set[int] = set()
+
+    @classmethod
+    def build(cls, words: Iterable[str], max_distance: int, prefix_length: int) -> 'FuzzyIndex':
+        words = list(words)
+        keys, ids = array('q'), array('i')
+        for i, word in enumerate(words):
+            hashes = [hash(item) for item in deletes(word[:prefix_length], max_distance)]
+            keys.extend(hashes)
+            ids.extend([i] * len(hashes))
+
+        keys = np.frombuffer(keys, dtype=np.int64)
+        ids = np.frombuffer(ids, dtype=np.int32)
+        order = np.argsort(keys, kind='stable')
+        return cls(words, keys[order], ids[order], max_distance, prefix_length)
+
+    # ==================== ИЗМЕНЕНИЕ ====================
+
+    def add(self, word: str):
+        """Слово появилось в словаре"""
+        if word in self.word_ids:
+            self.removed.discard(self.word_ids[word])
+            return
+        index = len(self.words)
+        self.words.append(word)
+        self.word_ids[word] = index
+        for item in deletes(word[:self.prefix_length], self.max_distance):
+            self.added.setdefault(hash(item), []).append(index)
+
+    def remove(self, word: str):
+        """Слово удалено из словаря"""
+        if word in self.word_ids:
+            self.removed.add(self.word_ids[word])
+
+    def update(self, added: Iterable[str] = (), removed: Iterable[str] = ()):
+        """Пакет удалений и добавлений (каждое слово - O(1))"""
+        for word in removed:
+            self.remove(word)
+        for word in added:
+            self.add(word)
+
+    # ==================== ПОИСК ====================
+
+    def candidates(self, word: str, max_distance: int) -> Set[int]:
+        """Номера слов с общей строкой удалений (без проверки расстояния)"""
+        hashes = np.fromiter((hash(item) for item in deletes(word[:self.prefix_length], max_distance)),
+                             dtype=np.int64)
+        starts = np.searchsorted(self.keys, hashes, side='left')
+        ends = np.searchsorted(self.keys, hashes, side='right')
+        found = set()
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            found.update(self.ids[start:end].tolist())
+        for value in hashes.tolist():
+            found.update(self.added.get(value, ()))
+        return found - self.removed
+
+    def lookup(self, word: str, count: Callable[[str], Optional[int]], max_distance: Optional[int] = None,
+               limit: Optional[int] = None) -> List[Tuple[str, int, int]]:
+        """Слова на расстоянии от 1 до max_distance: (слово, расстояние, частота)
+        по возрастанию расстояния и убыванию частоты; count(слово) - частота или None"""
+        max_distance = self.max_distance if max_distance is None else min(max_distance, self.max_distance)
+        found = []
+        for index in self.candidates(word, max_distance):
+            candidate = self.words[index]
+            if candidate == word:
+                continue
+            distance = edit_distance(word, candidate, max_distance)
+            if distance > max_distance:
+                continue
+            frequency = count(candidate)
+            if frequency is not None:
+                found.append((candidate, distance, frequency))
+        found.sort(key=lambda item: (item[1], -item[2], item[0]))
+        return found[:limit]
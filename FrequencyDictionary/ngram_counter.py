@@ -0,0 +1,150 @@
+"""Подсчет n-грамм с ограниченной памятью"""
+
+import heapq
+import tempfile
+from itertools import islice
+import numpy as np
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+
+def count_unique(keys: np.ndarray, counts: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Уникальные ключи и суммы их частот (сортировка + reduceat)"""
+    if counts is None:
+        return np.unique(keys, return_counts=True)
+    order = np.argsort(keys, kind='stable')
+    keys, counts = keys[order], counts[order]
+    if not len(keys):
+        return keys, counts
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    return keys[starts], np.add.reduceat(counts, starts)
+
+
+class NgramCounter:
+    """Частоты n-грамм по кодам слов
+
+    n-грамма упаковывается в одно число int64 (по 63 // n бит на код слова).
+    Ключи копятся в буфере; заполненный буфер сворачивается в пары
+    (ключ, частота), которые раскладываются по разделам (ключ mod partitions)
+    и сбрасываются на диск. При сборке каждый раздел суммируется отдельно,
+    поэтому в памяти одновременно находится не больше одного раздела.
+    """
+
+    # Пар (ключ, частота), читаемых из отсортированного раздела за раз
+    READ_BLOCK = 65536
+
+    def __init__(self, n: int, chunk_size: int, partitions: int, spill_dir: Optional[Path] = None):
+        if n < 2:
+            raise ValueError("n должно быть не меньше 2")
+        self.n = n
+        self.bits = 63 // n
+        self.max_code = (1 << self.bits) - 1
+        self.chunk_size = chunk_size
+        self.partitions = partitions
+        self._tmp = tempfile.TemporaryDirectory(dir=spill_dir)
+        self.spill_dir = Path(self._tmp.name)
+        self.buffer: List[np.ndarray] = []
+        self.buffered = 0
+        self.runs = 0
+        self.total = 0
+
+    def pack(self, codes: np.ndarray) -> np.ndarray:
+        """Ключи всех n-грамм последовательности кодов"""
+        codes = np.asarray(codes, dtype=np.int64)
+        if len(codes) < self.n:
+            return np.zeros(0, dtype=np.int64)
+        if codes.max() > self.max_code:
+            raise OverflowError(f"Слишком большой словарь для {self.n}-грамм: {codes.max() + 1} слов")
+        count = len(codes) - self.n + 1
+        keys = np.zeros(count, dtype=np.int64)
+        for j in range(self.n):
+            keys = (keys << self.bits) | codes[j:j + count]
+        return keys
+
+    def unpack(self, keys: np.ndarray) -> np.ndarray:
+        """Коды слов n-грамм (массив keys × n)"""
+        keys = np.asarray(keys, dtype=np.int64)
+        codes = np.empty((len(keys), self.n), dtype=np.int64)
+        for j in range(self.n - 1, -1, -1):
+            codes[:, j] = keys & self.max_code
+            keys = keys >> self.bits
+        return codes
+
+    def add(self, codes: np.ndarray):
+        """Добавление последовательности кодов (n-граммы не пересекают ее границы)"""
+        keys = self.pack(codes)
+        self.buffer.append(keys)
+        self.buffered += len(keys)
+        self.total += len(keys)
+        if self.buffered >= self.chunk_size:
+            self.spill()
+
+    def spill(self):
+        """Свертка буфера и сброс по разделам на диск"""
+        if not self.buffered:
+            return
+        keys, counts = count_unique(np.concatenate(self.buffer))
+        parts = keys % self.partitions
+        for part in range(self.partitions):
+            mask = parts == part
+            if mask.any():
+                np.save(self.spill_dir / f"part{part}_run{self.runs}_keys.npy", keys[mask])
+                np.save(self.spill_dir / f"part{part}_run{self.runs}_counts.npy", counts[mask])
+        self.runs += 1
+        self.buffer, self.buffered = [], 0
+
+    def results(self, min_count: int = 1) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Итоговые частоты по разделам: (ключи, частоты) с частотой >= min_count"""
+        self.spill()
+        for part in range(self.partitions):
+            key_files = sorted(self.spill_dir.glob(f"part{part}_run*_keys.npy"))
+            if not key_files:
+                continue
+            keys = np.concatenate([np.load(path) for path in key_files])
+            counts = np.concatenate([np.load(str(path).replace('_keys.npy', '_counts.npy')) for path in key_files])
+            keys, counts = count_unique(keys, counts)
+            keep = counts >= min_count
+            yield keys[keep], counts[keep]
+
+    def sorted_runs(self, min_count: int = 1) -> List[Tuple[Path, Path]]:
+        """Итоговые частоты разделов, отсортированные по убыванию частоты
+        (при равной частоте - по ключу) и сохраненные на диск: пути (ключи, частоты)"""
+        runs = []
+        for part, (keys, counts) in enumerate(self.results(min_count)):
+            order = np.lexsort((keys, -counts))
+            keys_path = self.spill_dir / f"sorted{part}_keys.npy"
+            counts_path = self.spill_dir / f"sorted{part}_counts.npy"
+            np.save(keys_path, keys[order])
+            np.save(counts_path, counts[order])
+            runs.append((keys_path, counts_path))
+        return runs
+
+    def read_run(self, keys_path: Path, counts_path: Path) -> Iterator[Tuple[int, int]]:
+        """Пары (ключ, частота) отсортированного раздела, читаемые с диска блоками"""
+        keys = np.load(keys_path, mmap_mode='r')
+        counts = np.load(counts_path, mmap_mode='r')
+        for start in range(0, len(keys), self.READ_BLOCK):
+            end = start + self.READ_BLOCK
+            yield from zip(keys[start:end].tolist(), counts[start:end].tolist())
+
+    def sorted_ngrams(self, vocabulary: Sequence[str], min_count: int = 1) -> Iterator[Tuple[str, int]]:
+        """Пары (n-грамма, частота) по убыванию частоты, при равной частоте - по ключу
+
+        Отсортированные разделы сливаются k-путевым слиянием (heapq.merge),
+        поэтому в памяти находятся только текущие блоки разделов; ключи
+        расшифровываются в слова блоками. vocabulary - слова по кодам.
+        """
+        vocabulary = np.asarray(vocabulary, dtype=object)
+        runs = [self.read_run(keys_path, counts_path) for keys_path, counts_path in self.sorted_runs(min_count)]
+        merged = heapq.merge(*runs, key=lambda item: (-item[1], item[0]))
+        while True:
+            block = list(islice(merged, self.READ_BLOCK))
+            if not block:
+                return
+            keys, counts = zip(*block)
+            words = vocabulary[self.unpack(np.array(keys, dtype=np.int64))]
+            for parts, count in zip(words.tolist(), counts):
+                yield ' '.join(parts), count
+
+    def close(self):
+        self._tmp.cleanup()
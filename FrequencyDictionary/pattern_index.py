@@ -0,0 +1,192 @@
+"""Поиск слов по окончанию, шаблону (* и ?) и регулярному выражению"""
+
+import re
+import numpy as np
+from array import array
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Set
+
+# Границы слова в триграммах: '\x02слово\x03' (в очищенных словах таких символов нет)
+WORD_START = '\x02'
+WORD_END = '\x03'
+# Верхняя граница для поиска по началу строки через bisect: prefix <= s < prefix + MAX_CHAR
+MAX_CHAR = '\U0010ffff'
+
+
+def trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def wildcard_to_regex(pattern: str) -> str:
+    """Шаблон с * (любая последовательность) и ? (один символ) → регулярное выражение для fullmatch"""
+    return ''.join('.*' if char == '*' else '.' if char == '?' else re.escape(char) for char in pattern)
+
+
+def wildcard_literals(pattern: str) -> List[str]:
+    """Обязательные подстроки шаблона (с границами слова, если шаблон к ним привязан)"""
+    runs = re.split(r'[*?]', pattern)
+    runs[0] = WORD_START + runs[0]
+    runs[-1] = runs[-1] + WORD_END
+    return [run for run in runs if run]
+
+
+def regex_literals(pattern: str) -> Optional[List[str]]:
+    """Подстроки, которые обязательно есть в любом совпадении регулярного выражения
+
+    Разбор консервативный: выражения с группами и альтернативами не сужаются
+    (None - нужен полный перебор). Символ перед *, ?, {m,n} необязателен
+    и в подстроку не входит; классы, точка и экранированные классы (\\w, \\d)
+    разрывают подстроку.
+    """
+    if '|' in pattern or '(' in pattern:
+        return None
+
+    runs, current, i = [], '', 0
+    if pattern.startswith('^'):
+        current, i = WORD_START, 1
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            escaped = pattern[i + 1:i + 2]
+            if escaped and not escaped.isalnum():
+                current += escaped
+            else:
+                runs.append(current)
+                current = ''
+            i += 2
+            continue
+        if char in '*?{':
+            runs.append(current[:-1])
+            current = ''
+            if char == '{':
+                i = pattern.find('}', i) if '}' in pattern[i:] else len(pattern)
+        elif char == '$' and i == len(pattern) - 1:
+            current += WORD_END
+        elif char in '+.^$[':
+            runs.append(current)
+            current = ''
+            if char == '[':
+                # Конец класса: ']' сразу после '[' или '[^' - символ класса
+                end = i + 1 + (pattern[i + 1:i + 2] == '^')
+                end = pattern.find(']', end + 1)
+                i = end if end != -1 else len(pattern)
+        else:
+            current += char
+        i += 1
+    runs.append(current)
+    return [run for run in runs if run]
+
+
+class PatternIndex:
+    """Индексы словаря для поиска по окончанию и по шаблону
+
+    reversed - отсортированный список перевернутых слов: слова с окончанием
+    находятся двумя bisect как диапазон перевернутых слов с перевернутым
+    окончанием в начале. postings - номера слов для каждой триграммы слова
+    с границами: кандидаты для шаблона - пересечение списков триграмм его
+    обязательных подстрок, затем каждый кандидат проверяется выражением.
+    """
+
+    def __init__(self, words: List[str], reversed_words: List[str], postings: Dict[str, array]):
+        self.words = words
+        self.word_ids = {word: i for i, word in enumerate(words)}
+        self.reversed = reversed_words
+        self.postings = postings
+        self.removed: Set[int] = set()
+
+    @classmethod
+    def build(cls, words: Iterable[str]) -> 'PatternIndex':
+        words = list(words)
+        postings: Dict[str, array] = {}
+        for i, word in enumerate(words):
+            for gram in trigrams(WORD_START + word + WORD_END):
+                if gram not in postings:
+                    postings[gram] = array('i')
+                postings[gram].append(i)
+        return cls(words, sorted(word[::-1] for word in words), postings)
+
+    # ==================== ИЗМЕНЕНИЕ ====================
+
+    def _register(self, word: str) -> bool:
+        """Учет появившегося слова в номерах и списках триграмм (False - слово уже есть)"""
+        if word in self.word_ids:
+            index = self.word_ids[word]
+            if index not in self.removed:
+                return False
+            self.removed.discard(index)
+        else:
+            # Новые номера больше прежних, списки триграмм остаются отсортированными
+            index = len(self.words)
+            self.words.append(word)
+            self.word_ids[word] = index
+            for gram in trigrams(WORD_START + word + WORD_END):
+                self.postings.setdefault(gram, array('i')).append(index)
+        return True
+
+    def _unregister(self, word: str) -> bool:
+        """Учет удаленного слова (False - слова нет)"""
+        index = self.word_ids.get(word)
+        if index is None or index in self.removed:
+            return False
+        self.removed.add(index)
+        return True
+
+    def add(self, word: str):
+        """Слово появилось в словаре"""
+        if self._register(word):
+            insort(self.reversed, word[::-1])
+
+    def remove(self, word: str):
+        """Слово удалено из словаря"""
+        if self._unregister(word):
+            del self.reversed[bisect_left(self.reversed, word[::-1])]
+
+    def update(self, added: Iterable[str] = (), removed: Iterable[str] = ()):
+        """Пакет удалений и добавлений: reversed пересобирается одним слиянием
+        с отсортированными новыми словами, а не вставкой каждого слова"""
+        dropped = {word[::-1] for word in removed if self._unregister(word)}
+        inserted = sorted(word[::-1] for word in added if self._register(word))
+        if len(dropped) + len(inserted) <= 1:
+            # Одно слово дешевле сдвинуть в списке, чем пересобрать список
+            for key in dropped:
+                del self.reversed[bisect_left(self.reversed, key)]
+            for key in inserted:
+                insort(self.reversed, key)
+            return
+        kept = [key for key in self.reversed if key not in dropped] if dropped else self.reversed
+        # Два отсортированных участка: сортировка (timsort) сливает их за линейное время
+        self.reversed = sorted(kept + inserted)
+
+    # ==================== ПОИСК ====================
+
+    def with_suffix(self, suffix: str) -> List[str]:
+        """Слова с окончанием suffix"""
+        key = suffix[::-1]
+        start = bisect_left(self.reversed, key)
+        end = bisect_left(self.reversed, key + MAX_CHAR)
+        return [word[::-1] for word in self.reversed[start:end]]
+
+    def candidates(self, literals: Optional[List[str]]) -> Iterable[str]:
+        """Слова, содержащие все триграммы подстрок literals (все слова, если триграмм нет)"""
+        grams = set().union(*(trigrams(literal) for literal in literals)) if literals else set()
+        if not grams:
+            return (word for i, word in enumerate(self.words) if i not in self.removed)
+        if any(gram not in self.postings for gram in grams):
+            return []
+
+        lists = sorted((self.postings[gram] for gram in grams), key=len)
+        ids = np.array(lists[0], dtype=np.int32)
+        for postings in lists[1:]:
+            if not len(ids):
+                break
+            ids = np.intersect1d(ids, np.array(postings, dtype=np.int32), assume_unique=True)
+        return (self.words[i] for i in ids.tolist() if i not in self.removed)
+
+    def match(self, pattern: str, regex: bool = False) -> List[str]:
+        """Слова по шаблону с * и ? (целиком) или по регулярному выражению (re.search);
+        для неверного выражения - re.error"""
+        if regex:
+            compiled, literals = re.compile(pattern), regex_literals(pattern)
+        else:
+            compiled, literals = re.compile(f"^{wildcard_to_regex(pattern)}$"), wildcard_literals(pattern)
+        return [word for word in self.candidates(literals) if compiled.search(word)]
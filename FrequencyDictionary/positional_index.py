@@ -0,0 +1,279 @@
+"""Позиционный индекс для конкорданса (слово в контексте)"""
+
+import json
+import os
+import numpy as np
+from pathlib import Path
+from typing import Dict, List, Optional, Iterable, Tuple
+
+
+def varint_sizes(values: np.ndarray) -> np.ndarray:
+    """Количество байт varint для каждого числа"""
+    sizes = np.ones(len(values), dtype=np.int64)
+    rest = np.asarray(values, dtype=np.uint64) >> np.uint64(7)
+    while rest.any():
+        sizes += rest > 0
+        rest >>= np.uint64(7)
+    return sizes
+
+
+def encode_varints(values: np.ndarray) -> np.ndarray:
+    """Кодирование неотрицательных чисел в varint (7 бит на байт, старший бит - продолжение)"""
+    values = np.asarray(values, dtype=np.uint64)
+    sizes = varint_sizes(values)
+
+    out = np.zeros(int(sizes.sum()), dtype=np.uint8)
+    starts = np.cumsum(sizes) - sizes
+    for byte in range(int(sizes.max()) if len(sizes) else 0):
+        active = sizes > byte
+        chunk = (values[active] >> np.uint64(7 * byte)) & np.uint64(0x7F)
+        more = (sizes[active] > byte + 1).astype(np.uint64) << np.uint64(7)
+        out[starts[active] + byte] = (chunk | more).astype(np.uint8)
+    return out
+
+
+def decode_varints(data: np.ndarray) -> np.ndarray:
+    """Декодирование последовательности varint"""
+    data = np.asarray(data, dtype=np.uint8)
+    if not len(data):
+        return np.zeros(0, dtype=np.int64)
+    ends = np.flatnonzero(data < 0x80)
+    starts = np.r_[0, ends[:-1] + 1]
+    # Номер байта внутри числа
+    shifts = np.arange(len(data)) - np.repeat(starts, ends - starts + 1)
+    parts = (data & 0x7F).astype(np.int64) << (7 * shifts)
+    return np.add.reduceat(parts, starts)
+
+
+class PositionalIndex:
+    """Позиции слов в корпусе
+
+    Корпус хранится как поток кодов слов (tokens), для каждого слова - список
+    позиций в потоке, закодированный разностями и varint (postings + offsets).
+    Массивы открываются через memory map, поэтому запрос читает с диска только
+    позиции нужного слова и окна контекста. Документ и смещение в нем
+    определяются по началам документов в потоке.
+
+    При исправлении слова поток не переписывается: список позиций старого
+    кода сливается со списком нового слова, старый код скрывается, а в
+    aliases запоминается, каким словом показывать его в контексте.
+    """
+
+    SUFFIXES = {'meta': '.json', 'postings': '_postings.bin', 'offsets': '_offsets.npy', 'tokens': '_tokens.npy'}
+
+    def __init__(self, documents: List[str], document_starts: List[int], vocabulary: List[str],
+                 tokens: np.ndarray, postings: np.ndarray, offsets: np.ndarray,
+                 hidden: Iterable[int] = (), aliases: Iterable[Tuple[int, int]] = ()):
+        self.documents = list(documents)
+        self.document_starts = np.asarray(document_starts, dtype=np.int64)
+        self.vocabulary = list(vocabulary)
+        # Коды удаленных из словаря слов: остаются в контексте, но не ищутся
+        self.hidden = set(hidden)
+        # Код исправленного слова → код слова, к которому перешли его позиции
+        self.aliases = {int(code): int(target) for code, target in aliases}
+        self.word_ids = {word: i for i, word in enumerate(self.vocabulary) if i not in self.hidden}
+        self.tokens = tokens
+        self.postings = postings
+        self.offsets = offsets
+
+    # ==================== ПОСТРОЕНИЕ И ХРАНЕНИЕ ====================
+
+    @staticmethod
+    def build_postings(tokens: np.ndarray, n_words: int):
+        """Сжатые списки позиций для всех слов потока"""
+        positions = np.argsort(tokens, kind='stable')
+        counts = np.bincount(tokens, minlength=n_words)
+        group_starts = np.cumsum(counts) - counts
+
+        # Разности позиций внутри списка слова (первая - сама позиция)
+        deltas = np.diff(positions, prepend=0)
+        deltas[group_starts[counts > 0]] = positions[group_starts[counts > 0]]
+
+        postings = encode_varints(deltas)
+        byte_ends = np.cumsum(varint_sizes(deltas))
+        offsets = np.zeros(n_words + 1, dtype=np.int64)
+        ends = group_starts + counts
+        offsets[1:] = np.where(counts > 0, byte_ends[np.maximum(ends - 1, 0)], 0)
+        # Для слов без позиций смещение равно концу предыдущего слова
+        offsets[1:] = np.maximum.accumulate(offsets[1:])
+        return postings, offsets
+
+    @classmethod
+    def build(cls, documents: Dict[str, List[int]], vocabulary: List[str]):
+        """Построение из потоков кодов слов по документам (имя документа → коды)"""
+        names = list(documents)
+        lengths = [len(codes) for codes in documents.values()]
+        tokens = np.concatenate([np.asarray(codes, dtype=np.int32) for codes in documents.values()]) \
+            if names else np.zeros(0, dtype=np.int32)
+        postings, offsets = cls.build_postings(tokens, len(vocabulary))
+        starts = np.r_[0, np.cumsum(lengths)[:-1]] if names else []
+        return cls(names, starts, vocabulary, tokens, postings, offsets)
+
+    @classmethod
+    def paths(cls, base_path: Path) -> Dict[str, Path]:
+        base_path = Path(base_path)
+        return {name: base_path.with_name(base_path.name + suffix) for name, suffix in cls.SUFFIXES.items()}
+
+    def save(self, base_path: Path):
+        """Сохранение (через временные файлы, чтобы не затронуть открытые memory map)"""
+        paths = self.paths(base_path)
+        arrays = {'postings': self.postings, 'offsets': self.offsets, 'tokens': self.tokens}
+        for name, array in arrays.items():
+            tmp_path = paths[name].with_name(paths[name].name + '.tmp')
+            with open(tmp_path, 'wb') as f:
+                if name == 'postings':
+                    np.asarray(array).tofile(f)
+                else:
+                    np.save(f, np.asarray(array))
+            os.replace(tmp_path, paths[name])
+
+        meta = {
+            'documents': self.documents,
+            'document_starts': self.document_starts.tolist(),
+            'vocabulary': self.vocabulary,
+            'hidden': sorted(self.hidden),
+            'aliases': sorted(self.aliases.items())
+        }
+        tmp_path = paths['meta'].with_name(paths['meta'].name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp_path, paths['meta'])
+
+    @classmethod
+    def load(cls, base_path: Path) -> Optional['PositionalIndex']:
+        paths = cls.paths(base_path)
+        if not all(path.exists() for path in paths.values()):
+            return None
+        with open(paths['meta'], 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        postings = np.memmap(paths['postings'], dtype=np.uint8, mode='r') \
+            if paths['postings'].stat().st_size else np.zeros(0, dtype=np.uint8)
+        return cls(meta['documents'], meta['document_starts'], meta['vocabulary'],
+                   np.load(paths['tokens'], mmap_mode='r'), postings,
+                   np.load(paths['offsets'], mmap_mode='r'),
+                   meta.get('hidden', ()), meta.get('aliases', ()))
+
+    # ==================== ИЗМЕНЕНИЕ ====================
+
+    def _word_id(self, word: str) -> int:
+        if word not in self.word_ids:
+            self.word_ids[word] = len(self.vocabulary)
+            self.vocabulary.append(word)
+            # У нового слова пока нет позиций
+            self.offsets = np.append(self.offsets, self.offsets[-1])
+        return self.word_ids[word]
+
+    def _code_positions(self, code: int) -> np.ndarray:
+        start, end = int(self.offsets[code]), int(self.offsets[code + 1])
+        return np.cumsum(decode_varints(self.postings[start:end]))
+
+    def _replace_postings(self, replacements: Dict[int, np.ndarray]):
+        """Новые списки позиций для нескольких кодов: остальные списки копируются
+        без декодирования, смещения сдвигаются на изменение длины"""
+        sizes = np.diff(np.asarray(self.offsets, dtype=np.int64))
+        pieces = []
+        previous = 0
+        for code in sorted(replacements):
+            positions = replacements[code]
+            encoded = encode_varints(np.diff(positions, prepend=0)) if len(positions) \
+                else np.zeros(0, dtype=np.uint8)
+            pieces.append(np.asarray(self.postings[previous:int(self.offsets[code])]))
+            pieces.append(encoded)
+            previous = int(self.offsets[code + 1])
+            sizes[code] = len(encoded)
+        pieces.append(np.asarray(self.postings[previous:]))
+        self.postings = np.concatenate(pieces)
+        self.offsets = np.r_[0, np.cumsum(sizes)]
+
+    def resolved_tokens(self) -> np.ndarray:
+        """Поток кодов, в котором коды исправленных слов заменены итоговыми"""
+        if not self.aliases:
+            return np.asarray(self.tokens)
+        table = np.arange(len(self.vocabulary), dtype=np.int32)
+        for code, target in self.aliases.items():
+            table[code] = target
+        return table[np.asarray(self.tokens)]
+
+    def merge_word(self, wrong: str, correct: str):
+        """Позиции слова wrong переходят к correct (коды в потоке заменяются)"""
+        self.remap_words({wrong: correct})
+
+    def delete_word(self, word: str):
+        """Слово удалено из словаря (в контексте остается, но не ищется)"""
+        self.remap_words({word: None})
+
+    def remap_words(self, mapping: Dict[str, Optional[str]]):
+        """Переносы (слово → новое слово) и удаления (слово → None)
+
+        Позиции перенесенного слова сливаются (оба списка отсортированы) с
+        позициями нового слова; переписываются только эти списки, поток
+        кодов и списки остальных слов не пересчитываются.
+        """
+        old_ids = {word: self.word_ids.pop(word) for word in mapping if word in self.word_ids}
+        if not old_ids:
+            return
+        self.hidden.update(old_ids.values())
+        replacements = {}
+        for word, code in old_ids.items():
+            if mapping[word] is None:
+                continue
+            target = self._word_id(mapping[word])
+            moved = replacements.pop(code, None)
+            if moved is None:
+                moved = self._code_positions(code)
+            current = replacements.get(target)
+            if current is None:
+                current = self._code_positions(target)
+            replacements[target] = np.insert(current, np.searchsorted(current, moved), moved)
+            replacements[code] = np.zeros(0, dtype=np.int64)
+            for alias, alias_target in self.aliases.items():
+                if alias_target == code:
+                    self.aliases[alias] = target
+            self.aliases[code] = target
+        if replacements:
+            self._replace_postings(replacements)
+
+    def add_document(self, name: str, words: List[str]):
+        """Добавление документа в конец потока и пересчет списков позиций"""
+        codes = np.fromiter((self._word_id(word) for word in words), dtype=np.int32, count=len(words))
+
+        self.documents.append(name)
+        self.document_starts = np.append(self.document_starts, len(self.tokens))
+        self.tokens = np.concatenate([np.asarray(self.tokens), codes])
+        self.postings, self.offsets = self.build_postings(self.resolved_tokens(), len(self.vocabulary))
+
+    # ==================== ЗАПРОСЫ ====================
+
+    def positions(self, word: str) -> np.ndarray:
+        """Позиции слова в потоке"""
+        code = self.word_ids.get(word)
+        if code is None:
+            return np.zeros(0, dtype=np.int64)
+        return self._code_positions(code)
+
+    def display_word(self, code: int) -> str:
+        """Слово, которым код показывается в контексте (с учетом исправлений)"""
+        return self.vocabulary[self.aliases.get(code, code)]
+
+    def concordance(self, word: str, limit: int = 10, width: int = 5) -> List[Dict]:
+        """Строки конкорданса: до limit вхождений с width словами контекста с каждой стороны"""
+        positions = self.positions(word)
+        total = len(positions)
+        lines = []
+        for position in positions[:limit].tolist():
+            document = int(np.searchsorted(self.document_starts, position, side='right')) - 1
+            doc_start = int(self.document_starts[document])
+            doc_end = int(self.document_starts[document + 1]) if document + 1 < len(self.documents) \
+                else len(self.tokens)
+
+            left = self.tokens[max(doc_start, position - width):position]
+            right = self.tokens[position + 1:min(doc_end, position + 1 + width)]
+            lines.append({
+                'document': self.documents[document],
+                'offset': position - doc_start,
+                'left': ' '.join(self.display_word(code) for code in left.tolist()),
+                'word': self.display_word(int(self.tokens[position])),
+                'right': ' '.join(self.display_word(code) for code in right.tolist()),
+                'total': total
+            })
+        return lines
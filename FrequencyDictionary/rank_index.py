@@ -0,0 +1,171 @@
+"""Запросы по диапазону частот и рангу слова (индекс, отсортированный по частоте)"""
+
+import numpy as np
+from typing import Dict, List, Mapping, Optional, Tuple
+
+
+class RankIndex:
+    """Слова словаря, упорядоченные по убыванию частоты
+
+    words и counts - слова и частоты в порядке рангов (ранг 1 - самое частое
+    слово; при равной частоте слова идут в порядке словаря, как в списке
+    «Частота ↓»). Диапазон частот находится двумя бинарными поисками по keys
+    (частоты со знаком минус, по возрастанию), ранг слова - по обратной
+    перестановке ranks за O(1): word_ids - номер слова в порядке словаря,
+    order - номер слова на каждой позиции, ranks - позиция по номеру.
+
+    update() переносит измененные слова на новые позиции, сдвигая только
+    участок массивов между старой и новой позицией.
+    """
+
+    def __init__(self, words: List[str], counts: np.ndarray, word_ids: Dict[str, int],
+                 order: np.ndarray, ranks: np.ndarray):
+        self.words = words
+        self.counts = counts
+        self.keys = -counts
+        self.word_ids = word_ids
+        self.order = order
+        self.ranks = ranks
+        # Номер следующего нового слова (новые слова попадают в конец словаря)
+        self.next_id = len(ranks)
+
+    @classmethod
+    def build(cls, word_counts: Mapping[str, int]) -> 'RankIndex':
+        words = list(word_counts)
+        counts = np.fromiter((word_counts[word] for word in words), dtype=np.int64, count=len(words))
+        # Устойчивая сортировка: равные частоты остаются в порядке словаря
+        order = np.argsort(-counts, kind='stable')
+        ranks = np.empty_like(order)
+        ranks[order] = np.arange(len(order))
+        return cls([words[i] for i in order.tolist()], counts[order],
+                   {word: i for i, word in enumerate(words)}, order, ranks)
+
+    # ==================== ИЗМЕНЕНИЕ ====================
+
+    def update(self, changes: Mapping[str, Tuple[Optional[int], Optional[int]]]):
+        """Учет изменившихся частот (слово → (старая, новая частота), None - слова нет)
+
+        Существующие слова удаляются или переносятся по одному; новые слова
+        (в порядке changes - в нем они добавлены в словарь) вставляются
+        одним проходом после всех переносов.
+        """
+        added = []
+        for word, (old, new) in changes.items():
+            if old == new:
+                continue
+            if old is None:
+                added.append((word, new))
+            elif new is None:
+                self._delete(word)
+            else:
+                self._move(word, new)
+        if added:
+            self._insert(added)
+
+    def _move(self, word: str, count: int):
+        word_id = self.word_ids[word]
+        old = int(self.ranks[word_id])
+        self.counts[old] = count
+        self.keys[old] = -count
+        new = self._new_position(old, count, word_id)
+        if new < old:
+            span = slice(new, old + 1)
+            shift = 1
+        else:
+            span = slice(old, new + 1)
+            shift = -1
+        for array in (self.counts, self.keys, self.order):
+            array[span] = np.roll(array[span], shift)
+        self.words.insert(new, self.words.pop(old))
+        self.ranks[self.order[span]] = np.arange(span.start, span.stop)
+
+    def _new_position(self, position: int, count: int, word_id: int) -> int:
+        """Новая позиция слова, стоящего на position, среди остальных слов
+        (по частоте, при равной частоте - по номеру слова)"""
+        left = self._search(self.keys[:position], self.order[:position], count, word_id)
+        if left < position:
+            return left
+        return position + self._search(self.keys[position + 1:], self.order[position + 1:], count, word_id)
+
+    @staticmethod
+    def _search(keys: np.ndarray, order: np.ndarray, count: int, word_id: int) -> int:
+        lo = int(np.searchsorted(keys, -count, side='left'))
+        hi = int(np.searchsorted(keys, -count, side='right'))
+        return lo + int(np.searchsorted(order[lo:hi], word_id))
+
+    def _delete(self, word: str):
+        word_id = self.word_ids.pop(word)
+        position = int(self.ranks[word_id])
+        self.ranks[word_id] = -1
+        del self.words[position]
+        self.counts = np.delete(self.counts, position)
+        self.keys = np.delete(self.keys, position)
+        self.order = np.delete(self.order, position)
+        self.ranks[self.order[position:]] -= 1
+
+    def _insert(self, added: List[Tuple[str, int]]):
+        # Новые номера больше всех прежних: слово встает в конец группы слов своей частоты
+        ids = np.arange(self.next_id, self.next_id + len(added))
+        self.next_id += len(added)
+        counts = np.array([count for _, count in added], dtype=np.int64)
+        arrival = np.lexsort((ids, -counts))
+        counts, ids = counts[arrival], ids[arrival]
+        words = [added[i][0] for i in arrival.tolist()]
+        positions = np.searchsorted(self.keys, -counts, side='right')
+
+        merged_words = []
+        previous = 0
+        for position, word in zip(positions.tolist(), words):
+            merged_words.extend(self.words[previous:position])
+            merged_words.append(word)
+            previous = position
+        merged_words.extend(self.words[previous:])
+        self.words = merged_words
+
+        self.counts = np.insert(self.counts, positions, counts)
+        self.keys = -self.counts
+        self.order = np.insert(self.order, positions, ids)
+        self.ranks = np.concatenate([self.ranks, np.empty(len(ids), dtype=self.ranks.dtype)])
+        for word, word_id in zip(words, ids.tolist()):
+            self.word_ids[word] = word_id
+        # Позиции изменились только начиная с первой вставки
+        first = int(positions[0])
+        self.ranks[self.order[first:]] = np.arange(first, len(self.order))
+
+    # ==================== ЗАПРОСЫ ====================
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def count_range(self, min_count: int, max_count: Optional[int] = None) -> Tuple[int, int]:
+        """Позиции [start, end) слов с частотой от min_count до max_count включительно"""
+        start = 0 if max_count is None else int(np.searchsorted(self.keys, -max_count, side='left'))
+        end = int(np.searchsorted(self.keys, -min_count, side='right'))
+        return start, max(start, end)
+
+    def in_range(self, min_count: int, max_count: Optional[int] = None,
+                 offset: int = 0, limit: Optional[int] = None) -> Tuple[List[Tuple[str, int]], int]:
+        """Страница слов с частотой в диапазоне (по убыванию частоты) и их общее число"""
+        start, end = self.count_range(min_count, max_count)
+        page_start = min(start + offset, end)
+        page_end = end if limit is None else min(page_start + limit, end)
+        page = list(zip(self.words[page_start:page_end], self.counts[page_start:page_end].tolist()))
+        return page, end - start
+
+    def at_rank(self, rank: int) -> Optional[Tuple[str, int]]:
+        """Слово и частота на ранге rank (с 1)"""
+        if not 1 <= rank <= len(self.words):
+            return None
+        return self.words[rank - 1], int(self.counts[rank - 1])
+
+    def rank(self, word: str) -> Optional[int]:
+        """Ранг слова (с 1) или None, если слова нет"""
+        word_id = self.word_ids.get(word)
+        if word_id is None:
+            return None
+        return int(self.ranks[word_id]) + 1
+
+    def tied_ranks(self, count: int) -> Tuple[int, int]:
+        """Первый и последний ранг слов с частотой count"""
+        start, end = self.count_range(count, count)
+        return start + 1, end
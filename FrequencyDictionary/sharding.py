@@ -0,0 +1,90 @@
+"""Разбиение словаря на шарды по хэшу слова и параллельная сборка шардов"""
+
+import json
+import os
+import shutil
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+SHARD_FILE_TEMPLATE = "shard_{index:03d}.json"
+MANIFEST_FILE = "manifest.json"
+
+
+def shard_of(word: str, shards: int) -> int:
+    """Номер шарда слова (crc32 стабилен между запусками, в отличие от hash())"""
+    return zlib.crc32(word.encode('utf-8')) % shards
+
+
+def shard_path(directory: Path, index: int) -> Path:
+    return Path(directory) / SHARD_FILE_TEMPLATE.format(index=index)
+
+
+def write_json(path: Path, data):
+    """Атомарная запись JSON (через временный файл)"""
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def replace_directory(tmp_dir: Path, directory: Path):
+    """Замена каталога шардов собранным во временном каталоге"""
+    old_dir = directory.with_name(directory.name + '.old')
+    if old_dir.exists():
+        shutil.rmtree(old_dir)
+    if directory.exists():
+        os.replace(directory, old_dir)
+    os.replace(tmp_dir, directory)
+    if old_dir.exists():
+        shutil.rmtree(old_dir)
+
+
+def run_parallel(function, tasks: List, workers: int) -> List:
+    """Выполнение задач в процессах (workers = 1 - в текущем процессе)"""
+    if workers == 1 or len(tasks) <= 1:
+        return [function(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(function, tasks))
+
+
+def count_file(task: Tuple) -> Tuple[int, Optional[str]]:
+    """Этап 1: частоты одного файла, разложенные по шардам (part_<файл>_<шард>.json);
+    возвращает (число слов, текст ошибки чтения или None)"""
+    data_dir, file_path, language, shards, build_dir, file_index = task
+    # Импорт здесь: модуль загружается и в процессах сборки
+    from frequency_dictionary import FrequencyDictionary
+    fd = FrequencyDictionary(data_dir, build_dir)
+
+    parts: List[Dict[str, int]] = [{} for _ in range(shards)]
+    total = 0
+    try:
+        for word in fd.iter_file_words(Path(file_path), language):
+            part = parts[shard_of(word, shards)]
+            part[word] = part.get(word, 0) + 1
+            total += 1
+    except Exception as e:
+        return 0, str(e)
+
+    for index, part in enumerate(parts):
+        if part:
+            write_json(Path(build_dir) / f"part_{file_index}_{index}.json", part)
+    return total, None
+
+
+def merge_shard(task: Tuple) -> Tuple[int, int]:
+    """Этап 2: сумма частичных частот шарда по всем файлам; возвращает (слов, уникальных)"""
+    build_dir, index, file_count = task
+    counts: Dict[str, int] = {}
+    for file_index in range(file_count):
+        part_path = Path(build_dir) / f"part_{file_index}_{index}.json"
+        if not part_path.exists():
+            continue
+        with open(part_path, 'r', encoding='utf-8') as f:
+            for word, count in json.load(f).items():
+                counts[word] = counts.get(word, 0) + count
+        part_path.unlink()
+
+    write_json(shard_path(build_dir, index), counts)
+    return sum(counts.values()), len(counts)
@@ -0,0 +1,154 @@
+"""Приближенный подсчет частот с ограниченной памятью (Count-Min Sketch + Misra-Gries)"""
+
+import hashlib
+import math
+import numpy as np
+from typing import Dict, List, Tuple
+
+# Оценка памяти на одну запись словаря Python (слово + частота)
+ENTRY_BYTES = 200
+
+
+def word_hashes(words: List[str]) -> np.ndarray:
+    """Стабильные 64-битные хэши слов (встроенный hash() меняется между запусками)"""
+    return np.fromiter(
+        (int.from_bytes(hashlib.blake2b(word.encode('utf-8'), digest_size=8).digest(), 'little')
+         for word in words),
+        dtype=np.uint64, count=len(words))
+
+
+class CountMinSketch:
+    """Count-Min Sketch: таблица depth × width счетчиков
+
+    Оценка частоты не меньше истинной и с вероятностью 1 - δ превышает ее
+    не больше чем на ε·N, где ε = e / width, δ = e^(-depth), N - сумма частот.
+    Номера столбцов строк получаются из одного хэша: h1 + i·h2 mod width.
+    """
+
+    def __init__(self, width: int, depth: int):
+        self.width = max(1, width)
+        self.depth = max(1, depth)
+        self.table = np.zeros((self.depth, self.width), dtype=np.int64)
+        self.total = 0
+
+    @classmethod
+    def from_memory(cls, memory_bytes: int, depth: int):
+        return cls(memory_bytes // (8 * depth), depth)
+
+    def _columns(self, hashes: np.ndarray) -> np.ndarray:
+        h1 = hashes & np.uint64(0xFFFFFFFF)
+        h2 = (hashes >> np.uint64(32)) | np.uint64(1)
+        rows = np.arange(self.depth, dtype=np.uint64)[:, None]
+        return ((h1 + rows * h2) % np.uint64(self.width)).astype(np.int64)
+
+    def add(self, hashes: np.ndarray, counts: np.ndarray):
+        """Добавление частот слов (по хэшам)"""
+        columns = self._columns(hashes)
+        for row in range(self.depth):
+            np.add.at(self.table[row], columns[row], counts)
+        self.total += int(counts.sum())
+
+    def estimate(self, hashes: np.ndarray) -> np.ndarray:
+        """Оценки частот (минимум по строкам)"""
+        columns = self._columns(hashes)
+        return self.table[np.arange(self.depth)[:, None], columns].min(axis=0)
+
+    @property
+    def epsilon(self) -> float:
+        return math.e / self.width
+
+    @property
+    def delta(self) -> float:
+        return math.exp(-self.depth)
+
+
+class MisraGries:
+    """Сводка Misra-Gries: не больше capacity слов-кандидатов
+
+    Частоты принимаются пакетами (частоты блока текста). После слияния
+    с пакетом из всех счетчиков вычитается (capacity + 1)-я по величине
+    частота, неположительные удаляются. Частота каждого слова занижена
+    не больше чем на N / (capacity + 1), поэтому в сводке гарантированно
+    остаются все слова с частотой выше этой границы.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, capacity)
+        self.counts: Dict[str, int] = {}
+        self.total = 0
+
+    def merge(self, counts: Dict[str, int]):
+        """Слияние с частотами очередного блока"""
+        for word, count in counts.items():
+            self.counts[word] = self.counts.get(word, 0) + count
+            self.total += count
+        if len(self.counts) <= self.capacity:
+            return
+
+        values = np.fromiter(self.counts.values(), dtype=np.int64, count=len(self.counts))
+        threshold = int(np.partition(values, len(values) - self.capacity - 1)[len(values) - self.capacity - 1])
+        self.counts = {word: count - threshold for word, count in self.counts.items() if count > threshold}
+
+    @property
+    def error_bound(self) -> float:
+        return self.total / (self.capacity + 1)
+
+
+class ApproximateCounter:
+    """Частоты самых частых слов в пределах заданного объема памяти
+
+    Половина памяти отводится Count-Min Sketch, половина - сводке
+    Misra-Gries и частотам текущего блока (не больше capacity слов каждая).
+    Итоговые частоты - оценки Count-Min Sketch для слов сводки, но не меньше
+    нижней границы из сводки.
+    """
+
+    def __init__(self, memory_bytes: int, depth: int):
+        self.sketch = CountMinSketch.from_memory(memory_bytes // 2, depth)
+        self.capacity = max(1, memory_bytes // 2 // (2 * ENTRY_BYTES))
+        self.summary = MisraGries(self.capacity)
+        self.block: Dict[str, int] = {}
+
+    def add(self, word: str):
+        self.block[word] = self.block.get(word, 0) + 1
+        if len(self.block) >= self.capacity:
+            self.flush()
+
+    def flush(self):
+        """Перенос частот блока в скетч и сводку"""
+        if not self.block:
+            return
+        words = list(self.block)
+        counts = np.fromiter(self.block.values(), dtype=np.int64, count=len(words))
+        self.sketch.add(word_hashes(words), counts)
+        self.summary.merge(self.block)
+        self.block = {}
+
+    def results(self) -> List[Tuple[str, int]]:
+        """Пары (слово, оценка частоты) по убыванию частоты"""
+        self.flush()
+        words = list(self.summary.counts)
+        if not words:
+            return []
+        lower = np.fromiter(self.summary.counts.values(), dtype=np.int64, count=len(words))
+        estimates = np.maximum(self.sketch.estimate(word_hashes(words)), lower)
+        order = np.argsort(-estimates, kind='stable')
+        return [(words[i], int(estimates[i])) for i in order.tolist()]
+
+    @property
+    def total(self) -> int:
+        return self.sketch.total + sum(self.block.values())
+
+    def error_bounds(self) -> Dict:
+        """Границы ошибок (в словоупотреблениях и параметрах скетча)"""
+        return {
+            'count_min_width': self.sketch.width,
+            'count_min_depth': self.sketch.depth,
+            # Завышение оценки: не больше epsilon·N с вероятностью 1 - delta
+            'epsilon': self.sketch.epsilon,
+            'delta': self.sketch.delta,
+            'max_overestimate': math.ceil(self.sketch.epsilon * self.sketch.total),
+            'capacity': self.capacity,
+            # Слова с частотой выше этой границы гарантированно сохранены
+            'min_guaranteed_count': math.ceil(self.summary.error_bound)
+        }
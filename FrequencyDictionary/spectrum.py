@@ -0,0 +1,79 @@
+"""Частотный спектр словаря и показатели лексического богатства"""
+
+import math
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class FrequencySpectrum:
+    """Спектр V(m) - число слов, встретившихся ровно m раз
+
+    Все показатели выражаются через спектр: N = Σ m·V(m), V = Σ V(m),
+    поэтому после построения (один проход по частотам) они считаются за
+    O(числа различных частот), а изменения словаря учитываются за O(1)
+    на слово (update). Слова с частотой 0 (добавленные вручную) хранятся
+    в V(0), но в показатели не входят.
+    """
+
+    def __init__(self, spectrum: Optional[Dict[int, int]] = None):
+        self.spectrum: Counter = Counter(spectrum or {})
+
+    @classmethod
+    def build(cls, counts: Iterable[int]) -> 'FrequencySpectrum':
+        return cls(Counter(counts))
+
+    def update(self, old: Optional[int], new: Optional[int]):
+        """Частота слова изменилась с old на new (None - слова не было / больше нет)"""
+        if old is not None:
+            self.spectrum[old] -= 1
+            if not self.spectrum[old]:
+                del self.spectrum[old]
+        if new is not None:
+            self.spectrum[new] += 1
+
+    def __getitem__(self, m: int) -> int:
+        return self.spectrum.get(m, 0)
+
+    def items(self) -> List[Tuple[int, int]]:
+        """Пары (m, V(m)) с m > 0 по возрастанию m"""
+        return sorted((m, v) for m, v in self.spectrum.items() if m > 0 and v > 0)
+
+    def measures(self, good_turing_max: int = 5) -> Dict:
+        """Показатели лексического богатства
+
+        ttr - доля уникальных слов V/N; yule_k - K Юла 10⁴·(Σm²V(m) - N)/N²;
+        simpson_d - вероятность, что два случайных слова текста (без возврата)
+        совпадают: Σ V(m)·m(m-1) / N(N-1); honore_r - 100·ln N / (1 - V(1)/V)
+        (None, если все слова встретились по одному разу); good_turing -
+        вероятность нового слова V(1)/N и скорректированные частоты
+        r* = (r+1)·V(r+1)/V(r) для r до good_turing_max.
+        """
+        items = self.items()
+        tokens = sum(m * v for m, v in items)
+        types = sum(v for _, v in items)
+        hapax, dis = self[1], self[2]
+        result = {
+            'tokens': tokens,
+            'types': types,
+            'hapax_legomena': hapax,
+            'dis_legomena': dis,
+            'distinct_frequencies': len(items),
+            'ttr': None, 'yule_k': None, 'simpson_d': None, 'honore_r': None,
+            'good_turing': {'unseen_probability': None, 'adjusted_counts': {}}
+        }
+        if not tokens:
+            return result
+
+        squares = sum(m * m * v for m, v in items)
+        result['ttr'] = types / tokens
+        result['yule_k'] = 1e4 * (squares - tokens) / (tokens * tokens)
+        if tokens > 1:
+            result['simpson_d'] = (squares - tokens) / (tokens * (tokens - 1))
+        if hapax < types:
+            result['honore_r'] = 100 * math.log(tokens) / (1 - hapax / types)
+        result['good_turing'] = {
+            'unseen_probability': hapax / tokens,
+            'adjusted_counts': {r: (r + 1) * self[r + 1] / self[r]
+                                for r in range(1, good_turing_max + 1) if self[r]}
+        }
+        return result
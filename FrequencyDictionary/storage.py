@@ -0,0 +1,650 @@
+"""Хранилища словарей: JSON-файл (по умолчанию), SQLite и JSON-шарды"""
+
+import heapq
+import json
+import locale
+import os
+import shutil
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import ItemsView, MutableMapping, ValuesView
+from contextlib import contextmanager
+from itertools import islice
+from operator import itemgetter
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sharding import MANIFEST_FILE, replace_directory, shard_of, shard_path, write_json
+from config import SHARD_COUNT, SHARD_CACHE_SIZE
+
+# Верхняя граница для поиска по префиксу через диапазон: prefix <= word < prefix + MAX_CHAR
+MAX_CHAR = '\U0010ffff'
+
+
+def collation_is_binary() -> bool:
+    """Совпадает ли текущая локаль сортировки с порядком кодовых точек"""
+    return locale.setlocale(locale.LC_COLLATE) in ('C', 'POSIX')
+
+
+class DictionaryBackend(ABC):
+    """Хранилище одного словаря
+
+    Данные словаря (self.data) - отображение с ключами word_counts,
+    total_words, unique_words и дополнительными полями создания.
+    Запросы по умолчанию выполняются перебором word_counts; хранилища
+    с индексами переопределяют их.
+    """
+
+    SUFFIX = ''
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.data = None
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    @abstractmethod
+    def load(self) -> MutableMapping:
+        """Открытие словаря; возвращает self.data"""
+
+    @abstractmethod
+    def save(self, data: MutableMapping):
+        """Сохранение изменений"""
+
+    @abstractmethod
+    def write(self, word_counts: Iterable[Tuple[str, int]], meta: Dict) -> int:
+        """Создание словаря из потока пар (слово, частота) и полей meta
+        (word_counts и unique_words в meta не учитываются); возвращает число слов"""
+
+    @abstractmethod
+    def rollback(self):
+        """Отмена несохраненных изменений"""
+
+    def close(self):
+        pass
+
+    @contextmanager
+    def transaction(self):
+        """Группа изменений: сохраняется целиком или откатывается при ошибке"""
+        try:
+            yield self.data
+        except Exception:
+            self.rollback()
+            raise
+        self.save(self.data)
+
+    # ==================== ЗАПРОСЫ ====================
+
+    def sorted_page(self, by_freq: bool = False, reverse: bool = False,
+                    offset: int = 0, limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Страница отсортированного списка (по частоте - по убыванию, если не reverse)"""
+        words = self.sort_words(list(self.data['word_counts'].items()), by_freq, reverse)
+        end = None if limit is None else offset + limit
+        return words[offset:end]
+
+    def search(self, prefix: str, limit: Optional[int] = None, by_freq: bool = True,
+               reverse: bool = False) -> Tuple[List[Tuple[str, int]], int]:
+        """Слова с префиксом (по умолчанию по убыванию частоты, не больше limit) и их общее число"""
+        found = [(w, c) for w, c in self.data['word_counts'].items() if w.startswith(prefix)]
+        return self.sort_words(found, by_freq, reverse)[:limit], len(found)
+
+    @staticmethod
+    def sort_words(words: List[Tuple[str, int]], by_freq: bool, reverse: bool) -> List[Tuple[str, int]]:
+        if by_freq:
+            words.sort(key=lambda x: x[1], reverse=not reverse)
+        else:
+            words.sort(key=lambda x: locale.strxfrm(x[0]), reverse=reverse)
+        return words
+
+    def stats(self) -> Dict:
+        return {'total_words': self.data['total_words'], 'unique_words': self.data['unique_words']}
+
+
+class JsonBackend(DictionaryBackend):
+    """Словарь в одном JSON-файле, в памяти - обычный dict"""
+
+    SUFFIX = '.json'
+
+    def load(self) -> Dict:
+        with open(self.path, 'r', encoding='utf-8') as f:
+            self.data = json.load(f)
+        return self.data
+
+    def save(self, data: Dict):
+        # Через временный файл: при ошибке записи прежний словарь не повреждается
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def write(self, word_counts: Iterable[Tuple[str, int]], meta: Dict) -> int:
+        """Потоковая запись (формат совпадает с json.dump(..., indent=2))"""
+        unique = 0
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write('{\n  "word_counts": {')
+                for word, count in word_counts:
+                    f.write(',\n    ' if unique else '\n    ')
+                    f.write(f"{json.dumps(word, ensure_ascii=False)}: {int(count)}")
+                    unique += 1
+                f.write('\n  }' if unique else '}')
+                fields = {'total_words': meta['total_words'], 'unique_words': unique}
+                fields.update((key, value) for key, value in meta.items()
+                              if key not in fields and key != 'word_counts')
+                for key, value in fields.items():
+                    value = json.dumps(value, ensure_ascii=False, indent=2).replace('\n', '\n  ')
+                    f.write(f",\n  {json.dumps(key, ensure_ascii=False)}: {value}")
+                f.write('\n}')
+            os.replace(tmp_path, self.path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+        return unique
+
+    def rollback(self):
+        # Данные перечитываются в тот же объект (на него могут ссылаться снаружи)
+        with open(self.path, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+        self.data.clear()
+        self.data.update(saved)
+
+
+class SqliteConnection:
+    """Соединение SQLite, общее для потоков веб-сервера
+
+    Каждый запрос выполняется и читается под блокировкой: потоки не
+    перемешивают шаги запросов и фиксацию транзакции. Результаты отдаются
+    готовыми строками (fetchone/fetchall), длинные выборки - пакетами (rows).
+    """
+
+    FETCH_ROWS = 10_000
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.lock = threading.Lock()
+
+    def fetchone(self, sql: str, params: Tuple = ()) -> Optional[Tuple]:
+        with self.lock:
+            return self.conn.execute(sql, params).fetchone()
+
+    def fetchall(self, sql: str, params: Tuple = ()) -> List[Tuple]:
+        with self.lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def rows(self, sql: str, params: Tuple = ()) -> Iterator[Tuple]:
+        """Строки выборки, читаемые пакетами по FETCH_ROWS (lock берется на каждый пакет)"""
+        with self.lock:
+            cursor = self.conn.execute(sql, params)
+        while True:
+            with self.lock:
+                batch = cursor.fetchmany(self.FETCH_ROWS)
+            if not batch:
+                return
+            yield from batch
+
+    def execute(self, sql: str, params: Tuple = ()) -> int:
+        """Изменяющий запрос; возвращает число затронутых строк"""
+        with self.lock:
+            return self.conn.execute(sql, params).rowcount
+
+    def executemany(self, sql: str, rows: Iterable[Tuple]):
+        with self.lock:
+            self.conn.executemany(sql, rows)
+
+    def commit(self):
+        with self.lock:
+            self.conn.commit()
+
+    def rollback(self):
+        with self.lock:
+            self.conn.rollback()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+class SqliteWordCounts(MutableMapping):
+    """Частоты слов в таблице SQLite с интерфейсом dict"""
+
+    def __init__(self, conn: SqliteConnection):
+        self.conn = conn
+
+    def __getitem__(self, word):
+        row = self.conn.fetchone("SELECT count FROM words WHERE word = ?", (word,))
+        if row is None:
+            raise KeyError(word)
+        return row[0]
+
+    def __setitem__(self, word, count):
+        self.conn.execute("INSERT INTO words (word, count) VALUES (?, ?) "
+                          "ON CONFLICT(word) DO UPDATE SET count = excluded.count", (word, int(count)))
+
+    def __delitem__(self, word):
+        if self.conn.execute("DELETE FROM words WHERE word = ?", (word,)) == 0:
+            raise KeyError(word)
+
+    def __contains__(self, word):
+        return self.conn.fetchone("SELECT 1 FROM words WHERE word = ?", (word,)) is not None
+
+    def __iter__(self):
+        for (word,) in self.conn.rows("SELECT word FROM words ORDER BY rowid"):
+            yield word
+
+    def __len__(self):
+        return self.conn.fetchone("SELECT COUNT(*) FROM words")[0]
+
+    def rows(self):
+        yield from self.conn.rows("SELECT word, count FROM words ORDER BY rowid")
+
+    def items(self):
+        return _RowItems(self)
+
+    def values(self):
+        return _RowValues(self)
+
+
+class _RowItems(ItemsView):
+    def __iter__(self):
+        yield from self._mapping.rows()
+
+
+class _RowValues(ValuesView):
+    def __iter__(self):
+        for _, count in self._mapping.rows():
+            yield count
+
+
+class SqliteData(MutableMapping):
+    """Данные словаря в SQLite: word_counts - таблица words, остальные поля - таблица meta"""
+
+    def __init__(self, conn: SqliteConnection):
+        self.conn = conn
+        self.word_counts = SqliteWordCounts(conn)
+
+    def __getitem__(self, key):
+        if key == 'word_counts':
+            return self.word_counts
+        row = self.conn.fetchone("SELECT value FROM meta WHERE key = ?", (key,))
+        if row is None:
+            raise KeyError(key)
+        return json.loads(row[0])
+
+    def __setitem__(self, key, value):
+        if key == 'word_counts':
+            self.conn.execute("DELETE FROM words")
+            self.conn.executemany("INSERT INTO words (word, count) VALUES (?, ?)", value.items())
+            return
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                          (key, json.dumps(value, ensure_ascii=False)))
+
+    def __delitem__(self, key):
+        if key == 'word_counts' or \
+                self.conn.execute("DELETE FROM meta WHERE key = ?", (key,)) == 0:
+            raise KeyError(key)
+
+    def __iter__(self):
+        yield 'word_counts'
+        for (key,) in self.conn.fetchall("SELECT key FROM meta"):
+            yield key
+
+    def __len__(self):
+        return 1 + self.conn.fetchone("SELECT COUNT(*) FROM meta")[0]
+
+
+class SqliteBackend(DictionaryBackend):
+    """Словарь в базе SQLite
+
+    Таблица words (word - первичный ключ, индекс по count): поиск по префиксу
+    идет диапазоном по первичному ключу, страницы по частоте - по индексу
+    count. Изменения копятся в транзакции и фиксируются при save().
+    """
+
+    SUFFIX = '.sqlite'
+    BATCH_ROWS = 50_000
+
+    def __init__(self, path: Path):
+        super().__init__(path)
+        self.conn = None
+
+    @staticmethod
+    def connect(path: Path) -> SqliteConnection:
+        # Веб интерфейс обращается к словарю из разных потоков (см. SqliteConnection)
+        conn = sqlite3.connect(str(path), check_same_thread=False)
+        conn.create_collation('LOCALE', locale.strcoll)
+        return SqliteConnection(conn)
+
+    def load(self) -> SqliteData:
+        self.close()
+        self.conn = self.connect(self.path)
+        self.data = SqliteData(self.conn)
+        return self.data
+
+    def save(self, data: MutableMapping):
+        self.conn.commit()
+
+    def rollback(self):
+        self.conn.rollback()
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def write(self, word_counts: Iterable[Tuple[str, int]], meta: Dict) -> int:
+        """Создание базы: строки вставляются пакетами, индекс по частоте строится в конце"""
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        if tmp_path.exists():
+            tmp_path.unlink()
+        conn = self.connect(tmp_path)
+        try:
+            conn.execute("CREATE TABLE words (word TEXT PRIMARY KEY, count INTEGER NOT NULL)")
+            conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            rows = iter(word_counts)
+            while True:
+                batch = [(word, int(count)) for word, count in islice(rows, self.BATCH_ROWS)]
+                if not batch:
+                    break
+                conn.executemany("INSERT INTO words (word, count) VALUES (?, ?)", batch)
+            conn.execute("CREATE INDEX words_count ON words (count)")
+
+            data = SqliteData(conn)
+            unique = len(data.word_counts)
+            data['total_words'] = meta['total_words']
+            data['unique_words'] = unique
+            for key, value in meta.items():
+                if key not in ('word_counts', 'total_words', 'unique_words'):
+                    data[key] = value
+            conn.commit()
+        finally:
+            conn.close()
+
+        if self.conn is not None:
+            self.close()
+        try:
+            os.replace(tmp_path, self.path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+        return unique
+
+    @staticmethod
+    def order_by(by_freq: bool, reverse: bool) -> str:
+        """ORDER BY для тех же порядков, что и sort_words (равные частоты - в порядке добавления)"""
+        if by_freq:
+            return "count ASC, rowid" if reverse else "count DESC, rowid"
+        # Индекс по word подходит только для порядка кодовых точек
+        collate = '' if collation_is_binary() else ' COLLATE LOCALE'
+        return f"word{collate} {'DESC' if reverse else 'ASC'}"
+
+    def sorted_page(self, by_freq: bool = False, reverse: bool = False,
+                    offset: int = 0, limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        return self.conn.fetchall(f"SELECT word, count FROM words ORDER BY {self.order_by(by_freq, reverse)} "
+                                  "LIMIT ? OFFSET ?", (-1 if limit is None else limit, offset))
+
+    def search(self, prefix: str, limit: Optional[int] = None, by_freq: bool = True,
+               reverse: bool = False) -> Tuple[List[Tuple[str, int]], int]:
+        bounds = (prefix, prefix + MAX_CHAR)
+        found = self.conn.fetchall(
+            f"SELECT word, count FROM words WHERE word >= ? AND word < ? "
+            f"ORDER BY {self.order_by(by_freq, reverse)} LIMIT ?",
+            bounds + (-1 if limit is None else limit,))
+        total = self.conn.fetchone("SELECT COUNT(*) FROM words WHERE word >= ? AND word < ?", bounds)[0]
+        return found, total
+
+
+class ShardedWordCounts(MutableMapping):
+    """Частоты слов по шардам с интерфейсом dict: обращение к слову загружает только его шард"""
+
+    def __init__(self, backend: 'ShardedBackend'):
+        self.backend = backend
+
+    def _shard(self, word, dirty: bool = False) -> Dict[str, int]:
+        return self.backend.shard(shard_of(word, self.backend.shards), dirty)
+
+    def __getitem__(self, word):
+        return self._shard(word)[word]
+
+    def __setitem__(self, word, count):
+        self._shard(word, dirty=True)[word] = int(count)
+
+    def __delitem__(self, word):
+        shard = self._shard(word)
+        if word not in shard:
+            raise KeyError(word)
+        del self._shard(word, dirty=True)[word]
+
+    def __contains__(self, word):
+        return word in self._shard(word)
+
+    def __iter__(self):
+        for index in range(self.backend.shards):
+            yield from self.backend.shard(index)
+
+    def __len__(self):
+        return sum(self.backend.shard_unique(index) for index in range(self.backend.shards))
+
+    def rows(self):
+        for index in range(self.backend.shards):
+            yield from self.backend.shard(index).items()
+
+    def items(self):
+        return _RowItems(self)
+
+    def values(self):
+        return _RowValues(self)
+
+
+class ShardedBackend(DictionaryBackend):
+    """Словарь, разбитый по хэшу слова на SHARD_COUNT JSON-файлов в каталоге
+
+    manifest.json хранит поля словаря и размеры шардов. Шарды загружаются
+    по одному при обращении, в памяти остается не больше SHARD_CACHE_SIZE
+    неизмененных шардов; измененные держатся до save(). Поиск слова читает
+    один шард, глобальные запросы (страницы, поиск по префиксу, статистика)
+    собирают частичные результаты шардов и сливают их.
+    Индексы слов FrequencyDictionary (нечеткий поиск, шаблоны, ранги) при
+    первом обращении строятся по всем шардам и держат весь словарь в памяти.
+
+    Кэш шардов (loaded, dirty) меняется под self.lock: веб-сервер обслуживает
+    запросы в нескольких потоках, и одновременные загрузка и вытеснение
+    шардов не должны портить порядок OrderedDict.
+    """
+
+    SUFFIX = '.shards'
+
+    def __init__(self, path: Path, shards: int = SHARD_COUNT, cache_size: int = SHARD_CACHE_SIZE):
+        super().__init__(path)
+        self.shards = shards
+        self.cache_size = max(1, cache_size)
+        self.manifest = None
+        self.loaded: 'OrderedDict[int, Dict[str, int]]' = OrderedDict()
+        self.dirty = set()
+        self.lock = threading.Lock()
+
+    def exists(self) -> bool:
+        return (self.path / MANIFEST_FILE).exists()
+
+    def _read_manifest(self) -> Dict:
+        with open(self.path / MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def load(self) -> Dict:
+        self.manifest = self._read_manifest()
+        self.shards = self.manifest['shards']
+        with self.lock:
+            self.loaded.clear()
+            self.dirty.clear()
+        # Поля словаря - обычный dict, word_counts - представление шардов
+        self.data = {'word_counts': ShardedWordCounts(self), **self.manifest['meta']}
+        return self.data
+
+    def shard(self, index: int, dirty: bool = False) -> Dict[str, int]:
+        """Частоты шарда (загружаются при первом обращении)"""
+        with self.lock:
+            if index in self.loaded:
+                self.loaded.move_to_end(index)
+            else:
+                with open(shard_path(self.path, index), 'r', encoding='utf-8') as f:
+                    self.loaded[index] = json.load(f)
+                # Вытесняются давно использованные неизмененные шарды
+                for old in [i for i in self.loaded if i not in self.dirty and i != index]:
+                    if len(self.loaded) <= self.cache_size:
+                        break
+                    del self.loaded[old]
+            if dirty:
+                self.dirty.add(index)
+            return self.loaded[index]
+
+    def shard_unique(self, index: int) -> int:
+        with self.lock:
+            if index in self.loaded:
+                return len(self.loaded[index])
+            return self.manifest['shard_unique'][index]
+
+    def shard_words(self, index: int) -> int:
+        with self.lock:
+            if index in self.loaded:
+                return sum(self.loaded[index].values())
+            return self.manifest['shard_words'][index]
+
+    def save(self, data: Dict):
+        # Сначала шарды, затем манифест: манифест описывает уже записанные шарды
+        with self.lock:
+            for index in sorted(self.dirty):
+                write_json(shard_path(self.path, index), self.loaded[index])
+                self.manifest['shard_words'][index] = sum(self.loaded[index].values())
+                self.manifest['shard_unique'][index] = len(self.loaded[index])
+            self.manifest['meta'] = {key: value for key, value in data.items() if key != 'word_counts'}
+            write_json(self.path / MANIFEST_FILE, self.manifest)
+            self.dirty.clear()
+
+    def rollback(self):
+        with self.lock:
+            for index in self.dirty:
+                del self.loaded[index]
+            self.dirty.clear()
+        self.manifest = self._read_manifest()
+        word_counts = self.data['word_counts']
+        self.data.clear()
+        self.data['word_counts'] = word_counts
+        self.data.update(self.manifest['meta'])
+
+    def close(self):
+        with self.lock:
+            self.loaded.clear()
+            self.dirty.clear()
+
+    def write(self, word_counts: Iterable[Tuple[str, int]], meta: Dict) -> int:
+        """Создание шардов из потока пар: пары раскладываются по файлам шардов
+        на диске, затем шарды по одному переводятся в JSON"""
+        build_dir = self.path.with_name(self.path.name + '.tmp')
+        if build_dir.exists():
+            shutil.rmtree(build_dir)
+        build_dir.mkdir(parents=True)
+        try:
+            parts = [open(build_dir / f"part_{index}.tsv", 'w', encoding='utf-8')
+                     for index in range(self.shards)]
+            try:
+                for word, count in word_counts:
+                    parts[shard_of(word, self.shards)].write(f"{word}\t{int(count)}\n")
+            finally:
+                for part in parts:
+                    part.close()
+
+            sizes = []
+            for index in range(self.shards):
+                part_path = build_dir / f"part_{index}.tsv"
+                counts = {}
+                with open(part_path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        word, count = line.rstrip('\n').split('\t')
+                        counts[word] = int(count)
+                part_path.unlink()
+                write_json(shard_path(build_dir, index), counts)
+                sizes.append((sum(counts.values()), len(counts)))
+            return self.commit_build(build_dir, sizes, meta)
+        finally:
+            if build_dir.exists():
+                shutil.rmtree(build_dir)
+
+    def commit_build(self, build_dir: Path, sizes: List[Tuple[int, int]], meta: Dict) -> int:
+        """Запись манифеста собранных в build_dir шардов (sizes - слов и уникальных
+        по шардам) и замена ими словаря; возвращает число уникальных слов"""
+        unique = sum(shard_unique for _, shard_unique in sizes)
+        fields = {'total_words': meta['total_words'], 'unique_words': unique}
+        fields.update((key, value) for key, value in meta.items()
+                      if key not in fields and key != 'word_counts')
+        write_json(Path(build_dir) / MANIFEST_FILE, {
+            'shards': len(sizes),
+            'shard_words': [words for words, _ in sizes],
+            'shard_unique': [shard_unique for _, shard_unique in sizes],
+            'meta': fields
+        })
+        self.close()
+        replace_directory(Path(build_dir), self.path)
+        return unique
+
+    # ==================== ЗАПРОСЫ (по шардам со слиянием) ====================
+
+    @staticmethod
+    def sort_key(by_freq: bool):
+        return itemgetter(1) if by_freq else (lambda item: locale.strxfrm(item[0]))
+
+    @classmethod
+    def select(cls, items: List[Tuple[str, int]], k: Optional[int], by_freq: bool,
+               reverse: bool) -> List[Tuple[str, int]]:
+        """Первые k пар шарда в порядке sort_words"""
+        if k is None or k >= len(items):
+            return cls.sort_words(items, by_freq, reverse)
+        # По частоте порядок по умолчанию - убывание
+        descending = (not reverse) if by_freq else reverse
+        choose = heapq.nlargest if descending else heapq.nsmallest
+        return choose(k, items, key=cls.sort_key(by_freq))
+
+    def gather(self, select_shard, limit: Optional[int], by_freq: bool,
+               reverse: bool) -> List[Tuple[str, int]]:
+        """Слияние упорядоченных частичных результатов шардов (select_shard(шард) -> список)"""
+        parts = [select_shard(self.shard(index)) for index in range(self.shards)]
+        descending = (not reverse) if by_freq else reverse
+        merged = heapq.merge(*parts, key=self.sort_key(by_freq), reverse=descending)
+        return list(islice(merged, limit))
+
+    def sorted_page(self, by_freq: bool = False, reverse: bool = False,
+                    offset: int = 0, limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        k = None if limit is None else offset + limit
+        page = self.gather(lambda shard: self.select(list(shard.items()), k, by_freq, reverse),
+                           k, by_freq, reverse)
+        return page[offset:]
+
+    def search(self, prefix: str, limit: Optional[int] = None, by_freq: bool = True,
+               reverse: bool = False) -> Tuple[List[Tuple[str, int]], int]:
+        total = 0
+
+        def select_shard(shard):
+            nonlocal total
+            found = [(w, c) for w, c in shard.items() if w.startswith(prefix)]
+            total += len(found)
+            return self.select(found, limit, by_freq, reverse)
+
+        return self.gather(select_shard, limit, by_freq, reverse), total
+
+    def stats(self) -> Dict:
+        shards = [{'total_words': self.shard_words(index), 'unique_words': self.shard_unique(index)}
+                  for index in range(self.shards)]
+        return {
+            'total_words': self.data['total_words'],
+            'unique_words': sum(shard['unique_words'] for shard in shards),
+            'shards': shards
+        }
+
+
+BACKENDS = {
+    'json': JsonBackend,
+    'sqlite': SqliteBackend,
+    'sharded': ShardedBackend
+}
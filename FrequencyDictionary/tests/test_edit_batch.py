@@ -0,0 +1,47 @@
+"""Цепочки правок сводятся к одному итоговому изменению на слово"""
+
+from edit_batch import EditBatch, parse_edits
+
+
+def plan(word_counts, lines):
+    return EditBatch(word_counts, lambda word: word).plan(parse_edits(lines))
+
+
+def test_chained_edits_collapse_to_net_changes():
+    word_counts = {'der': 3, 'hund': 2, 'katze': 1, 'bellt': 1}
+    batch = plan(word_counts, [
+        'correct hund hunde',
+        'correct hunde tier',
+        'add maus',
+        'delete maus',
+        'correct katze tier',
+        'delete bellt'
+    ])
+    assert batch.errors == []
+    assert batch.changes == {'hund': None, 'hunde': None, 'tier': 3,
+                             'maus': None, 'katze': None, 'bellt': None}
+    # Вхождения корпуса переносятся сразу в итоговое слово
+    assert batch.corpus_mapping['hund'] == 'tier'
+    assert batch.corpus_mapping['katze'] == 'tier'
+    assert batch.corpus_mapping['bellt'] is None
+    assert 'der' not in batch.corpus_mapping
+
+    data = {'word_counts': dict(word_counts), 'total_words': 7, 'unique_words': 4}
+    batch.apply(data)
+    assert data == {'word_counts': {'der': 3, 'tier': 3}, 'total_words': 6, 'unique_words': 2}
+
+
+def test_word_corrected_back_keeps_its_count():
+    word_counts = {'hund': 2, 'katze': 1}
+    batch = plan(word_counts, ['correct hund hunt', 'correct hunt hund'])
+    assert batch.errors == []
+    assert batch.changes == {'hund': 2, 'hunt': None}
+    assert batch.corpus_mapping == {'hund': 'hund', 'hunt': 'hund'}
+    assert batch.total_delta == 0 and batch.unique_delta == 0
+
+
+def test_failed_edit_does_not_change_the_plan():
+    batch = plan({'hund': 2}, ['delete hund', 'correct hund tier'])
+    assert [number for number, _ in batch.errors] == [2]
+    assert batch.changes == {'hund': None}
+    assert batch.operations['correct'] == 0
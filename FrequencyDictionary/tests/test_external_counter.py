@@ -0,0 +1,33 @@
+"""Подсчет во внешней памяти дает точные частоты"""
+
+import random
+from collections import Counter
+
+import pytest
+
+from external_counter import ExternalCounter
+
+
+def zipf_corpus(seed, tokens, vocabulary):
+    rng = random.Random(seed)
+    words = [f"wort{i}" for i in range(vocabulary)]
+    weights = [1 / rank for rank in range(1, vocabulary + 1)]
+    return rng.choices(words, weights, k=tokens)
+
+
+@pytest.mark.parametrize('memory_bytes, fan_in', [(10 ** 9, 4), (20000, 16), (20000, 2)])
+def test_results_match_exact_counts(tmp_path, memory_bytes, fan_in):
+    corpus = zipf_corpus(memory_bytes + fan_in, 20000, 3000)
+    counter = ExternalCounter(memory_bytes, fan_in, spill_dir=tmp_path)
+    try:
+        for word in corpus:
+            counter.add(word)
+        results = list(counter.results())
+        spilled = counter.files_written
+    finally:
+        counter.close()
+
+    assert results == sorted(Counter(corpus).items())
+    assert counter.total == len(corpus)
+    # Маленькая память должна действительно вызывать сброс прогонов
+    assert (spilled > 0) == (memory_bytes < 10 ** 9)
@@ -0,0 +1,64 @@
+"""Подсказки нечеткого индекса совпадают с перебором словаря"""
+
+import random
+
+import pytest
+
+from fuzzy_index import FuzzyIndex, edit_distance
+
+
+def reference_distance(a, b):
+    """Расстояние Дамерау-Левенштейна (оптимальное выравнивание строк) полной таблицей"""
+    table = [[i + j if i * j == 0 else 0 for j in range(len(b) + 1)] for i in range(len(a) + 1)]
+    for i in range(1, len(a) + 1):
+        for j in range(1, len(b) + 1):
+            table[i][j] = min(table[i - 1][j] + 1, table[i][j - 1] + 1,
+                              table[i - 1][j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                table[i][j] = min(table[i][j], table[i - 2][j - 2] + 1)
+    return table[-1][-1]
+
+
+def brute_force(word, counts, max_distance):
+    found = [(other, reference_distance(word, other), count) for other, count in counts.items() if other != word]
+    found = [item for item in found if item[1] <= max_distance]
+    return sorted(found, key=lambda item: (item[1], -item[2], item[0]))
+
+
+def random_words(rng, n):
+    return {''.join(rng.choice('abcä') for _ in range(rng.randint(1, 7))) for _ in range(n)}
+
+
+def test_edit_distance_matches_reference():
+    rng = random.Random(3)
+    words = sorted(random_words(rng, 200))
+    for a in words[:60]:
+        for b in words:
+            expected = reference_distance(a, b)
+            assert edit_distance(a, b, 2) == min(expected, 3)
+
+
+@pytest.mark.parametrize('prefix_length', [4, 10])
+def test_lookup_matches_brute_force(prefix_length):
+    rng = random.Random(prefix_length)
+    counts = {word: rng.randint(1, 50) for word in random_words(rng, 300)}
+    index = FuzzyIndex.build(counts, max_distance=2, prefix_length=prefix_length)
+    for query in sorted(random_words(rng, 80)) + sorted(counts)[:40]:
+        for max_distance in (1, 2):
+            assert index.lookup(query, counts.get, max_distance) == brute_force(query, counts, max_distance)
+
+
+def test_lookup_after_update_matches_brute_force():
+    rng = random.Random(7)
+    counts = {word: rng.randint(1, 50) for word in random_words(rng, 200)}
+    index = FuzzyIndex.build(counts, max_distance=2, prefix_length=7)
+
+    removed = sorted(counts)[::3]
+    for word in removed:
+        del counts[word]
+    added = sorted(random_words(rng, 40) - set(counts))
+    counts.update({word: rng.randint(1, 50) for word in added})
+    index.update(added=added, removed=removed)
+
+    for query in sorted(random_words(rng, 60)):
+        assert index.lookup(query, counts.get) == brute_force(query, counts, 2)
@@ -0,0 +1,25 @@
+"""Индекс шаблонов: пакетные изменения совпадают с построением заново"""
+
+import random
+
+from pattern_index import PatternIndex
+
+
+def test_batch_update_matches_rebuild():
+    generator = random.Random(5)
+    letters = 'abcdeäö'
+    words = sorted({''.join(generator.choice(letters) for _ in range(generator.randint(2, 7))) for _ in range(800)})
+    current = set(words[:300])
+    index = PatternIndex.build(sorted(current))
+
+    for _ in range(20):
+        removed = generator.sample(sorted(current), 10)
+        added = generator.sample([word for word in words if word not in current], 10) + removed[:2]
+        index.update(added, removed)
+        current = (current - set(removed)) | set(added)
+
+    rebuilt = PatternIndex.build(sorted(current))
+    assert index.reversed == rebuilt.reversed
+    for pattern in ('a*', '*e', '?b*', '*cd*'):
+        assert sorted(index.match(pattern)) == sorted(rebuilt.match(pattern))
+    assert index.with_suffix('ä') == rebuilt.with_suffix('ä')
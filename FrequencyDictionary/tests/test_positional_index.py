@@ -0,0 +1,60 @@
+"""Позиционный индекс: исправления слов совпадают с построением заново"""
+
+import random
+
+import numpy as np
+
+from positional_index import PositionalIndex
+
+
+def build(documents):
+    vocabulary = sorted({word for words in documents.values() for word in words})
+    ids = {word: i for i, word in enumerate(vocabulary)}
+    return PositionalIndex.build({name: [ids[word] for word in words] for name, words in documents.items()},
+                                 vocabulary)
+
+
+def assert_same(index, documents):
+    rebuilt = build(documents)
+    for word in rebuilt.vocabulary:
+        assert index.positions(word).tolist() == rebuilt.positions(word).tolist()
+        assert index.concordance(word, limit=3, width=2) == rebuilt.concordance(word, limit=3, width=2)
+
+
+def test_merge_keeps_token_stream(tmp_path):
+    documents = {'a.txt': 'the cat saw teh dog and the cat'.split(), 'b.txt': 'teh end'.split()}
+    index = build(documents)
+    tokens = np.asarray(index.tokens).copy()
+
+    index.remap_words({'teh': 'the'})
+    assert np.array_equal(index.tokens, tokens)
+    assert index.positions('the').tolist() == [0, 3, 6, 8]
+    assert index.positions('teh').tolist() == []
+    assert index.concordance('the', limit=2, width=1)[1]['word'] == 'the'
+
+    index.save(tmp_path / 'index')
+    loaded = PositionalIndex.load(tmp_path / 'index')
+    assert loaded.positions('the').tolist() == [0, 3, 6, 8]
+    assert loaded.concordance('end', width=1)[0]['left'] == 'the'
+
+
+def test_random_remaps_match_rebuild():
+    generator = random.Random(3)
+    words = [f"w{i}" for i in range(40)]
+    documents = {f"doc{d}": [generator.choice(words) for _ in range(200)] for d in range(3)}
+    index = build(documents)
+
+    for step in range(30):
+        present = sorted({word for text in documents.values() for word in text})
+        source = generator.choice(present)
+        target = generator.choice(words + [f"new{step}"])
+        if source == target:
+            continue
+        index.remap_words({source: target})
+        documents = {name: [target if word == source else word for word in text]
+                     for name, text in documents.items()}
+        if step % 10 == 9:
+            text = [generator.choice(words) for _ in range(50)]
+            index.add_document(f"extra{step}", text)
+            documents[f"extra{step}"] = text
+    assert_same(index, documents)
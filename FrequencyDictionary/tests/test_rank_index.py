@@ -0,0 +1,76 @@
+"""Индекс рангов: обновление при правках совпадает с построением заново"""
+
+import random
+
+from rank_index import RankIndex
+
+
+def assert_same(index, word_counts):
+    rebuilt = RankIndex.build(word_counts)
+    assert index.words == rebuilt.words
+    assert index.counts.tolist() == rebuilt.counts.tolist()
+    assert index.keys.tolist() == rebuilt.keys.tolist()
+    for word in word_counts:
+        assert index.rank(word) == rebuilt.rank(word)
+    for low, high in ((0, 0), (1, 2), (3, 10), (5, None)):
+        assert index.in_range(low, high) == rebuilt.in_range(low, high)
+
+
+def apply(word_counts, changes):
+    for word, (_, new) in changes.items():
+        if new is None:
+            del word_counts[word]
+        else:
+            word_counts[word] = new
+
+
+def test_edit_moves_word_without_rebuild(monkeypatch):
+    word_counts = {'a': 5, 'b': 3, 'c': 3, 'd': 1, 'e': 8}
+    index = RankIndex.build(word_counts)
+    monkeypatch.setattr(RankIndex, 'build', None)
+
+    changes = {'d': (1, 6)}
+    apply(word_counts, changes)
+    index.update(changes)
+
+    assert index.rank('d') == 2
+    assert index.at_rank(2) == ('d', 6)
+    assert index.in_range(3, 5) == ([('a', 5), ('b', 3), ('c', 3)], 3)
+    assert index.rank('a') == 3 and index.rank('c') == 5
+
+
+def test_correct_delete_and_add():
+    word_counts = {'a': 5, 'b': 3, 'c': 3, 'd': 1, 'e': 8}
+    index = RankIndex.build(word_counts)
+
+    # correct b → c, delete e, add f, g and e again
+    for changes in ({'b': (3, None), 'c': (3, 6)}, {'e': (8, None)}, {'f': (None, 0), 'g': (None, 3), 'e': (None, 3)}):
+        apply(word_counts, changes)
+        index.update(changes)
+        assert_same(index, word_counts)
+    assert index.rank('b') is None
+    assert index.at_rank(len(word_counts)) == ('f', 0)
+
+
+def test_random_edits_match_rebuild():
+    generator = random.Random(7)
+    word_counts = {f"w{i}": generator.randint(0, 20) for i in range(300)}
+    index = RankIndex.build(word_counts)
+    next_word = 300
+
+    for _ in range(200):
+        changes = {}
+        for _ in range(generator.randint(1, 5)):
+            action = generator.random()
+            existing = [word for word in word_counts if word not in changes]
+            if action < 0.2 or not existing:
+                word, old, new = f"w{next_word}", None, generator.randint(0, 20)
+                next_word += 1
+            else:
+                word = generator.choice(existing)
+                old = word_counts[word]
+                new = None if action < 0.35 else generator.randint(0, 25)
+            changes[word] = (old, new)
+        apply(word_counts, changes)
+        index.update(changes)
+    assert_same(index, word_counts)
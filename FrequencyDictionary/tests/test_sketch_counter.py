@@ -0,0 +1,30 @@
+"""Приближенные частоты укладываются в заявленные границы ошибок"""
+
+import random
+from collections import Counter
+
+from sketch_counter import ApproximateCounter
+
+
+def test_estimates_stay_within_error_bounds():
+    rng = random.Random(5)
+    words = [f"wort{i}" for i in range(5000)]
+    corpus = rng.choices(words, [1 / rank for rank in range(1, len(words) + 1)], k=50000)
+    exact = Counter(corpus)
+
+    counter = ApproximateCounter(memory_bytes=80000, depth=4)
+    for word in corpus:
+        counter.add(word)
+    results = counter.results()
+    bounds = counter.error_bounds()
+
+    assert counter.total == len(corpus)
+    assert len(results) <= counter.capacity
+    estimates = dict(results)
+    for word, estimate in estimates.items():
+        assert exact[word] <= estimate <= exact[word] + bounds['max_overestimate']
+
+    # Все достаточно частые слова сохранены
+    frequent = {word for word, count in exact.items() if count > bounds['min_guaranteed_count']}
+    assert frequent and frequent <= set(estimates)
+    assert [word for word, _ in results[:5]] == [word for word, _ in exact.most_common(5)]
@@ -0,0 +1,51 @@
+"""Спектр и индекс рангов после исправления слов совпадают с построенными заново"""
+
+import pytest
+
+from frequency_dictionary import FrequencyDictionary
+from rank_index import RankIndex
+from spectrum import FrequencySpectrum
+
+
+@pytest.fixture
+def dictionary(tmp_path):
+    corpus = tmp_path / 'data' / 'german'
+    corpus.mkdir(parents=True)
+    (corpus / 'text.txt').write_text("der hund und der katze und der hund bellt laut\n", encoding='utf-8')
+    fd = FrequencyDictionary(tmp_path / 'data', tmp_path / 'dictionaries', backend='json')
+    assert fd.create_dictionary('german')
+    assert fd.load_dictionary('german')
+    # Спектр и индекс строятся до правок, чтобы правки обновляли их, а не строили заново
+    fd.get_spectrum()
+    fd.get_rank_index()
+    return fd
+
+
+def assert_consistent(fd):
+    word_counts = fd.current_data['word_counts']
+    assert fd.spectrum.spectrum == FrequencySpectrum.build(word_counts.values()).spectrum
+    assert fd.rank_index.words == RankIndex.build(word_counts).words
+
+
+def test_correct_word_to_itself_is_rejected(dictionary):
+    word_counts = dict(dictionary.current_data['word_counts'])
+    spectrum = dict(dictionary.spectrum.spectrum)
+
+    assert not dictionary.correct_word('hund', 'hund')
+    assert dictionary.current_data['word_counts'] == word_counts
+    assert dict(dictionary.spectrum.spectrum) == spectrum
+    assert_consistent(dictionary)
+
+
+def test_correct_word_updates_spectrum(dictionary):
+    assert dictionary.correct_word('katze', 'hund')
+    assert dictionary.correct_word('bellt', 'bellen')
+    assert dictionary.current_data['word_counts']['hund'] == 3
+    assert_consistent(dictionary)
+
+
+def test_record_count_change_keeps_original_count():
+    changes = {}
+    FrequencyDictionary.record_count_change(changes, 'hund', 2, None)
+    FrequencyDictionary.record_count_change(changes, 'hund', None, 5)
+    assert changes == {'hund': (2, 5)}
@@ -0,0 +1,63 @@
+"""Хранилища json, sqlite и sharded одинаково сохраняют одни и те же правки"""
+
+import pytest
+
+from frequency_dictionary import FrequencyDictionary
+from storage import BACKENDS
+
+TEXT = "der hund und der katze und der hund bellt laut\n"
+EDITS = [
+    'correct hund hunde',
+    'merge katze hunde tier',
+    'delete laut',
+    'add maus',
+    'correct bellt bellen'
+]
+EXPECTED = {'der': 3, 'und': 2, 'tier': 3, 'maus': 0, 'bellen': 1}
+
+
+def open_dictionary(root, backend):
+    fd = FrequencyDictionary(root / 'data', root / 'dictionaries', backend=backend)
+    assert fd.load_dictionary('german')
+    return fd
+
+
+@pytest.fixture(params=sorted(BACKENDS))
+def root(request, tmp_path):
+    corpus = tmp_path / 'data' / 'german'
+    corpus.mkdir(parents=True)
+    (corpus / 'text.txt').write_text(TEXT, encoding='utf-8')
+    fd = FrequencyDictionary(tmp_path / 'data', tmp_path / 'dictionaries', backend=request.param)
+    assert fd.create_dictionary('german')
+    return tmp_path, request.param
+
+
+def test_edits_round_trip(root):
+    path, backend = root
+    fd = open_dictionary(path, backend)
+    report = fd.apply_edits([(number, line.split()) for number, line in enumerate(EDITS, 1)])
+    assert report['applied']
+    fd.backend.close()
+
+    data = open_dictionary(path, backend).current_data
+    assert dict(data['word_counts'].items()) == EXPECTED
+    assert data['total_words'] == sum(EXPECTED.values())
+    assert data['unique_words'] == len(EXPECTED)
+
+
+def test_failed_transaction_is_rolled_back(root):
+    path, backend = root
+    fd = open_dictionary(path, backend)
+    with pytest.raises(RuntimeError):
+        with fd.backend.transaction() as data:
+            del data['word_counts']['hund']
+            data['word_counts']['tier'] = 5
+            data['total_words'] += 3
+            raise RuntimeError
+    assert fd.current_data['word_counts'].get('hund') == 2
+    assert 'tier' not in fd.current_data['word_counts']
+    assert fd.current_data['total_words'] == 10
+    fd.backend.close()
+
+    data = open_dictionary(path, backend).current_data
+    assert data['word_counts'].get('hund') == 2 and data['total_words'] == 10
@@ -2,12 +2,15 @@
 
 import os
 import tempfile
+import unicodedata
 from pathlib import Path
 from flask import Flask, render_template, request, jsonify, redirect, url_for, flash
-from werkzeug.utils import secure_filename
 
 from frequency_dictionary import FrequencyDictionary
-from config import DEFAULT_DATA_DIR, DEFAULT_DICT_DIR, LANGUAGES, WEB_CONFIG, WEB_MESSAGES, MAX_DISPLAY_WORDS, MAX_SEARCH_RESULTS
+from edit_batch import parse_edits
+from config import (DEFAULT_DATA_DIR, DEFAULT_DICT_DIR, LANGUAGES, WEB_CONFIG, WEB_MESSAGES, MAX_DISPLAY_WORDS,
+                    MAX_SEARCH_RESULTS, KWIC_LINES, KWIC_WIDTH, FUZZY_MAX_DISTANCE, FUZZY_SUGGESTIONS,
+                    TYPO_MAX_COUNT)
 
 
 class FrequencyDictionaryWeb:
@@ -40,7 +43,8 @@ class FrequencyDictionaryWeb:
         def load_language():
             """Загрузка словаря языка"""
             language = request.form.get('language')
-            if language and self.fd.load_dictionary(language):
+            ngram = int(request.form.get('ngram', 1))
+            if language and self.fd.load_dictionary(language, ngram):
                 self.current_language = language
                 flash(WEB_MESSAGES['dictionary_loaded'].format(
                     language=LANGUAGES.get(language, language)), 'success')
@@ -54,10 +58,11 @@ class FrequencyDictionaryWeb:
             if not self.fd.current_data:
                 return jsonify({'error': 'Словарь не загружен'})
             
+            # Для шардированного словаря - также размеры шардов; lexical - спектр и лексическое богатство
             return jsonify({
                 'language': LANGUAGES.get(self.current_language, self.current_language),
-                'total_words': self.fd.current_data['total_words'],
-                'unique_words': self.fd.current_data['unique_words']
+                **self.fd.backend.stats(),
+                'lexical': self.fd.lexical_stats()
             })
         
         @self.app.route('/words')
@@ -70,31 +75,172 @@ class FrequencyDictionaryWeb:
             sort_by = request.args.get('sort', 'alphabet')  # alphabet, frequency
             reverse = request.args.get('reverse', 'false').lower() == 'true'
             limit = int(request.args.get('limit', MAX_DISPLAY_WORDS))
+            offset = int(request.args.get('offset', 0))
             search = request.args.get('search', '').strip()
+            # Окончание, шаблон с * и ? или регулярное выражение (вместо начала слова search)
+            suffix = request.args.get('suffix', '').strip().lower()
+            pattern = request.args.get('pattern', '').strip().lower()
+            regex = request.args.get('regex', '').strip()
+            by_freq = sort_by == 'frequency'
             
-            words = list(self.fd.current_data['word_counts'].items())
+            try:
+                if suffix:
+                    words, _ = self.fd.find_suffix(suffix, limit, by_freq, reverse)
+                elif pattern:
+                    words, _ = self.fd.find_pattern(pattern, limit, False, by_freq, reverse)
+                elif regex:
+                    words, _ = self.fd.find_pattern(regex, limit, True, by_freq, reverse)
+                elif search:
+                    words, _ = self.fd.find_prefix(search.lower(), min(limit, MAX_SEARCH_RESULTS), by_freq, reverse)
+                else:
+                    words = self.fd.sorted_words(by_freq, reverse, offset, limit)
+            except ValueError as e:
+                return jsonify({'error': str(e)})
+            
+            return jsonify({
+                'words': [{'word': w, 'count': c} for w, c in words],
+                'total_found': len(words),
+                'search_term': search or suffix or pattern or regex
+            })
+        
+        @self.app.route('/documents')
+        def documents():
+            """API для списка документов корпуса"""
+            if not self.fd.current_data:
+                return jsonify({'error': 'Словарь не загружен'})
             
-            # Фильтрация по поиску
-            if search:
-                words = [(w, c) for w, c in words if w.startswith(search.lower())]
-                limit = min(limit, MAX_SEARCH_RESULTS)
+            store = self.fd.get_document_store()
+            if store is None:
+                return jsonify({'error': 'Частоты по документам не найдены'})
             
-            # Сортировка
-            if sort_by == 'frequency':
-                words.sort(key=lambda x: x[1], reverse=not reverse)
-            else:  # alphabet
-                import locale
-                words.sort(key=lambda x: locale.strxfrm(x[0]), reverse=reverse)
+            return jsonify({
+                'documents': [{'name': name, 'total_words': int(count)}
+                              for name, count in zip(store.documents, store.document_lengths())]
+            })
+        
+        @self.app.route('/subcorpus')
+        def subcorpus():
+            """API для частот по набору документов"""
+            if not self.fd.current_data:
+                return jsonify({'error': 'Словарь не загружен'})
             
-            # Ограничиваем результат
-            words = words[:limit]
+            store = self.fd.get_document_store()
+            if store is None:
+                return jsonify({'error': 'Частоты по документам не найдены'})
             
+            # docs - имена документов через запятую (по умолчанию все)
+            docs = [doc for doc in request.args.get('docs', '').split(',') if doc.strip()]
+            documents = [doc.strip() for doc in docs] or None
+            word = request.args.get('word', '').strip().lower()
+            limit = int(request.args.get('limit', MAX_DISPLAY_WORDS))
+            
+            try:
+                if word:
+                    return jsonify(store.frequency(word, documents))
+                return jsonify({
+                    'words': [{'word': w, 'count': c} for w, c in store.top(limit, documents)],
+                    'documents': [store.documents[i] for i in store.resolve(documents)]
+                })
+            except KeyError as e:
+                return jsonify({'error': f"Документ не найден: {e.args[0]}"})
+        
+        @self.app.route('/concordance')
+        def concordance():
+            """API для конкорданса (слово в контексте)"""
+            if not self.fd.current_data:
+                return jsonify({'error': 'Словарь не загружен'})
+            
+            index = self.fd.get_positional_index()
+            if index is None:
+                return jsonify({'error': 'Позиционный индекс не найден'})
+            
+            word = request.args.get('word', '').strip().lower()
+            if not word:
+                return jsonify({'error': 'Слово не указано'})
+            limit = int(request.args.get('limit', KWIC_LINES))
+            width = int(request.args.get('width', KWIC_WIDTH))
+            
+            lines = index.concordance(word, limit, width)
             return jsonify({
-                'words': [{'word': w, 'count': c} for w, c in words],
-                'total_found': len(words),
-                'search_term': search
+                'word': word,
+                'total': lines[0]['total'] if lines else 0,
+                'lines': [{key: line[key] for key in ('document', 'offset', 'left', 'word', 'right')}
+                          for line in lines]
+            })
+        
+        @self.app.route('/suggest')
+        def suggest():
+            """API для вариантов исправления слова (нечеткий поиск)"""
+            if not self.fd.current_data:
+                return jsonify({'error': 'Словарь не загружен'})
+            
+            word = request.args.get('word', '').strip().lower()
+            if not word:
+                return jsonify({'error': 'Слово не указано'})
+            max_distance = int(request.args.get('max_distance', FUZZY_MAX_DISTANCE))
+            limit = int(request.args.get('limit', FUZZY_SUGGESTIONS))
+            
+            return jsonify({
+                'word': word,
+                'exists': word in self.fd.current_data['word_counts'],
+                'suggestions': [{'word': w, 'distance': d, 'count': c}
+                                for w, d, c in self.fd.find_similar(word, max_distance, limit)]
+            })
+        
+        @self.app.route('/typos')
+        def typos():
+            """API для предложений исправления редких слов; edits - правки для /apply_edits"""
+            if not self.fd.current_data:
+                return jsonify({'error': 'Словарь не загружен'})
+            
+            max_count = int(request.args.get('max_count', TYPO_MAX_COUNT))
+            limit = int(request.args.get('limit', MAX_DISPLAY_WORDS))
+            proposals = self.fd.find_typos(max_count)
+            return jsonify({
+                'total_found': len(proposals),
+                'typos': proposals[:limit],
+                'edits': [['correct', item['word'], item['target']] for item in proposals[:limit]]
             })
         
+        @self.app.route('/frequency_range')
+        def frequency_range():
+            """API для слов с частотой от min до max включительно (max не указан - без ограничения)"""
+            if not self.fd.current_data:
+                return jsonify({'error': 'Словарь не загружен'})
+            
+            min_count = int(request.args.get('min', 0))
+            max_count = request.args.get('max')
+            max_count = int(max_count) if max_count else None
+            limit = int(request.args.get('limit', MAX_DISPLAY_WORDS))
+            offset = int(request.args.get('offset', 0))
+            
+            words, total = self.fd.words_by_count(min_count, max_count, offset, limit)
+            return jsonify({
+                'min': min_count,
+                'max': max_count,
+                'total_found': total,
+                'words': [{'word': w, 'count': c} for w, c in words]
+            })
+        
+        @self.app.route('/rank')
+        def rank():
+            """API для ранга слова (word) или слова на ранге (rank)"""
+            if not self.fd.current_data:
+                return jsonify({'error': 'Словарь не загружен'})
+            
+            word = request.args.get('word', '').strip().lower()
+            if not word:
+                rank_value = int(request.args.get('rank', 0))
+                found = self.fd.word_at_rank(rank_value)
+                if not found:
+                    return jsonify({'error': f'Ранг {rank_value} вне словаря'})
+                word = found[0]
+            
+            info = self.fd.word_rank(word)
+            if not info:
+                return jsonify({'error': f"Слово '{word}' не найдено"})
+            return jsonify(info)
+        
         @self.app.route('/word_action', methods=['POST'])
         def word_action():
             """API для действий со словами"""
@@ -118,11 +264,8 @@ class FrequencyDictionaryWeb:
                     if word:
                         # Для веб интерфейса удаляем без подтверждения
                         word = word.lower().strip()
-                        if word in self.fd.current_data['word_counts']:
-                            count = self.fd.current_data['word_counts'].pop(word)
-                            self.fd.current_data['total_words'] -= count
-                            self.fd.current_data['unique_words'] = len(self.fd.current_data['word_counts'])
-                            self.fd.save_current()
+                        report = self.fd.apply_edits([(1, ['delete', word])])
+                        if report and report['applied']:
                             return jsonify({
                                 'success': True,
                                 'message': f"Слово '{word}' удалено"
@@ -148,6 +291,28 @@ class FrequencyDictionaryWeb:
             except Exception as e:
                 return jsonify({'error': str(e)})
         
+        @self.app.route('/apply_edits', methods=['POST'])
+        def apply_edits():
+            """API для пакета правок: JSON {"edits": [["correct", "a", "b"], ...] или текст файла правок,
+            "dry_run": true/false}"""
+            if not self.fd.current_data:
+                return jsonify({'error': 'Словарь не загружен'})
+            
+            payload = request.get_json(silent=True) or {}
+            edits = payload.get('edits')
+            if isinstance(edits, str):
+                edits = edits.splitlines()
+            if not isinstance(edits, list) or not edits:
+                return jsonify({'error': 'Правки не указаны'})
+            
+            try:
+                report = self.fd.apply_edits(parse_edits(edits), bool(payload.get('dry_run')))
+                if report is None:
+                    return jsonify({'error': 'Ошибка применения правок'})
+                return jsonify({'success': report['applied'], **report})
+            except Exception as e:
+                return jsonify({'error': str(e)})
+        
         @self.app.route('/upload_text', methods=['POST'])
         def upload_text():
             """Загрузка текстового файла"""
@@ -165,17 +330,18 @@ class FrequencyDictionaryWeb:
                 return jsonify({'error': 'Поддерживаются только .txt файлы'})
             
             try:
-                # Сохраняем во временный файл
-                with tempfile.NamedTemporaryFile(mode='w+', suffix='.txt', delete=False, encoding='utf-8') as tmp_file:
-                    content = file.read().decode('utf-8')
-                    tmp_file.write(content)
+                # Сохраняем во временный файл со случайным именем (кодировка определяется при чтении);
+                # имя документа - исходное имя файла, в том числе кириллическое
+                with tempfile.NamedTemporaryFile(suffix='.txt', delete=False) as tmp_file:
+                    tmp_file.write(file.read())
                     tmp_file_path = tmp_file.name
+                document_name = unicodedata.normalize('NFC', os.path.basename(file.filename.replace('\\', '/')))
                 
                 # Обрабатываем файл
                 old_total = self.fd.current_data['total_words']
                 old_unique = self.fd.current_data['unique_words']
                 
-                success = self.fd.add_text_file(tmp_file_path)
+                success = self.fd.add_text_file(tmp_file_path, document_name or None)
                 
                 # Удаляем временный файл
                 os.unlink(tmp_file_path)
@@ -0,0 +1,143 @@
+"""Бутстреп-оценка доверительных интервалов статистик"""
+
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from config import *
+
+
+def _sub_batches(size, row_length):
+    """Разбиение пакета так, чтобы матрица выборок помещалась в BOOTSTRAP_MAX_CELLS"""
+    step = max(1, BOOTSTRAP_MAX_CELLS // max(1, row_length))
+    for start in range(0, size, step):
+        yield min(step, size - start)
+
+
+def _zipf_chunk(payload, size, seed):
+    """Коэффициенты Ципфа для пакета мультиномиальных выборок"""
+    probabilities, n_tokens, top_n = payload
+    rng = np.random.default_rng(seed)
+    ranks = np.arange(1, top_n + 1)
+
+    values = []
+    for batch in _sub_batches(size, len(probabilities)):
+        samples = rng.multinomial(n_tokens, probabilities, size=batch)[:, :-1]
+        # Ранги пересчитываются в каждой выборке
+        top = -np.sort(-samples, axis=1)[:, :top_n]
+        values.append(np.mean(top * ranks, axis=1))
+    return np.concatenate(values)
+
+
+def dense_codes(values):
+    """Плотные коды значений (0..K-1 в порядке возрастания) и их количество"""
+    uniques, codes = np.unique(values, return_inverse=True)
+    return codes, len(uniques)
+
+
+def _rowwise_midranks(codes, weights, n_codes):
+    """Средние ранги для каждой строки с учетом весов
+
+    Наблюдение с весом w считается за w одинаковых наблюдений, поэтому при
+    единичных весах получаются обычные ранги Спирмена со связками.
+    """
+    batch = codes.shape[0]
+    flat = (np.arange(batch)[:, None] * n_codes + codes).ravel()
+    totals = np.bincount(flat, weights=weights.ravel(), minlength=batch * n_codes).reshape(batch, n_codes)
+    midranks = np.cumsum(totals, axis=1) - totals + (totals + 1) / 2
+    return np.take_along_axis(midranks, codes, axis=1)
+
+
+def _rowwise_pearson(x, y, w):
+    """Взвешенный коэффициент корреляции Пирсона для каждой строки"""
+    total = w.sum(axis=1, keepdims=True)
+    x = x - (w * x).sum(axis=1, keepdims=True) / total
+    y = y - (w * y).sum(axis=1, keepdims=True) / total
+    denominator = np.sqrt((w * x * x).sum(axis=1) * (w * y * y).sum(axis=1))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (w * x * y).sum(axis=1) / denominator
+
+
+def _spearman_rows(payload, idx):
+    """Коэффициенты Спирмена для выборок, заданных матрицей индексов"""
+    x_codes, n_x, y_codes, n_y, weights = payload
+    w = weights[idx]
+    return _rowwise_pearson(_rowwise_midranks(x_codes[idx], w, n_x),
+                            _rowwise_midranks(y_codes[idx], w, n_y), w)
+
+
+def _spearman_chunk(payload, size, seed):
+    """Коэффициенты Спирмена для пакета выборок пар с возвращением"""
+    rng = np.random.default_rng(seed)
+    n = len(payload[0])
+
+    values = []
+    for batch in _sub_batches(size, n):
+        idx = rng.integers(0, n, size=(batch, n))
+        values.append(_spearman_rows(payload, idx))
+    return np.concatenate(values)
+
+
+def _spearman_payload(x, y, weights=None):
+    x_codes, n_x = dense_codes(x)
+    y_codes, n_y = dense_codes(y)
+    if weights is None:
+        weights = np.ones(len(x_codes))
+    return x_codes, n_x, y_codes, n_y, np.asarray(weights, dtype=np.float64)
+
+
+def weighted_spearman(x, y, weights=None):
+    """Коэффициент Спирмена; с весами - по словоупотреблениям, а не по словам"""
+    payload = _spearman_payload(x, y, weights)
+    return _spearman_rows(payload, np.arange(len(payload[0]))[None, :])[0]
+
+
+def bootstrap(chunk_func, payload, replicates=BOOTSTRAP_REPLICATES, seed=BOOTSTRAP_SEED,
+              workers=BOOTSTRAP_WORKERS):
+    """Запуск бутстрепа пакетами
+
+    Каждый пакет получает собственное зерно из SeedSequence(seed),
+    поэтому результат не зависит от количества процессов.
+    """
+    sizes = [min(BOOTSTRAP_BATCH, replicates - start) for start in range(0, replicates, BOOTSTRAP_BATCH)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    if workers > 1 and len(sizes) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunks = list(executor.map(chunk_func, [payload] * len(sizes), sizes, seeds))
+    else:
+        chunks = [chunk_func(payload, size, s) for size, s in zip(sizes, seeds)]
+
+    return np.concatenate(chunks)
+
+
+def confidence_interval(values, level=BOOTSTRAP_CONFIDENCE):
+    """Процентильный доверительный интервал (nan, если конечных значений нет)"""
+    values = values[np.isfinite(values)]
+    if not len(values):
+        return {'low': np.nan, 'high': np.nan, 'level': level, 'std': np.nan}
+    alpha = (1 - level) / 2
+    low, high = np.quantile(values, [alpha, 1 - alpha])
+    std = np.std(values, ddof=1) if len(values) > 1 else np.nan
+    return {'low': low, 'high': high, 'level': level, 'std': std}
+
+
+def zipf_coefficient_ci(sorted_counts, top_n=TOP_WORDS_ZIPF, replicates=BOOTSTRAP_REPLICATES,
+                        seed=BOOTSTRAP_SEED, workers=BOOTSTRAP_WORKERS):
+    """Доверительный интервал среднего f·r по top_n словам
+
+    Корпус пересэмплируется как мультиномиальная выборка словоупотреблений.
+    Отдельно моделируются 2·top_n самых частых слов (только они могут
+    попасть в top_n), остальные объединены в одну категорию.
+    """
+    n_tokens = int(sorted_counts.sum())
+    head = np.asarray(sorted_counts[:2 * top_n], dtype=np.float64)
+    probabilities = np.append(head, n_tokens - head.sum()) / n_tokens
+
+    values = bootstrap(_zipf_chunk, (probabilities, n_tokens, top_n), replicates, seed, workers)
+    return confidence_interval(values)
+
+
+def spearman_ci(x, y, weights=None, replicates=BOOTSTRAP_REPLICATES, seed=BOOTSTRAP_SEED,
+                workers=BOOTSTRAP_WORKERS):
+    """Доверительный интервал коэффициента Спирмена (выборка пар с возвращением)"""
+    values = bootstrap(_spearman_chunk, _spearman_payload(x, y, weights), replicates, seed, workers)
+    return confidence_interval(values)
@@ -0,0 +1,267 @@
+"""Извлечение словосочетаний: совместная встречаемость в окне и меры ассоциации"""
+
+import numpy as np
+from scipy.special import xlogy
+from tqdm import tqdm
+from config import *
+from corpus_context import get_context
+from corpus_stream import CorpusReader
+from result_cache import run_cached
+from table_writer import TableWriter
+
+# Меры ассоциации: ключ → (заголовок, описание)
+ASSOCIATION_MEASURES = {
+    'LL': ('Log-likelihood', 'G² Даннинга = 2 × Σ O·ln(O/E) по таблице 2×2'),
+    'PMI': ('PMI', 'log₂(O / E)'),
+    't': ('t-score', '(O - E) / √O')
+}
+
+
+def reduce_pairs(keys, counts):
+    """Суммирование частот одинаковых ключей"""
+    order = np.argsort(keys, kind='stable')
+    keys, counts = keys[order], counts[order]
+    if not len(keys):
+        return keys, counts
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    return keys[starts], np.add.reduceat(counts, starts)
+
+
+def cooccurrence_counts(codes, file_lengths, n_words, window=COLLOCATION_WINDOW,
+                        chunk_size=COLLOCATION_CHUNK_TOKENS):
+    """Частоты упорядоченных пар (u, v), где v стоит не дальше window слов после u
+
+    Пары не пересекают границы файлов. Ключ пары - одно число u × n_words + v.
+    Корпус обрабатывается блоками по chunk_size позиций; частичные суммы
+    сворачиваются, когда их суммарный размер превышает chunk_size.
+    Возвращает ключи, частоты и число всех учтенных пар.
+    """
+    codes = np.asarray(codes)
+    file_ends = np.cumsum(file_lengths)
+    parts, buffered, total_pairs = [], 0, 0
+
+    for start in tqdm(range(0, len(codes), chunk_size), desc="Подсчет пар"):
+        positions = np.arange(start, min(start + chunk_size, len(codes)))
+        # Конец файла, которому принадлежит позиция
+        limits = file_ends[np.searchsorted(file_ends, positions, side='right')]
+        left = codes[positions].astype(np.int64) * n_words
+
+        chunk_keys = []
+        for distance in range(1, window + 1):
+            valid = positions + distance < limits
+            chunk_keys.append(left[valid] + codes[positions[valid] + distance])
+        keys, counts = np.unique(np.concatenate(chunk_keys), return_counts=True)
+        total_pairs += int(counts.sum())
+
+        parts.append((keys, counts.astype(np.int64)))
+        buffered += len(keys)
+        if buffered > chunk_size and len(parts) > 1:
+            parts = [reduce_pairs(np.concatenate([k for k, _ in parts]), np.concatenate([c for _, c in parts]))]
+            buffered = len(parts[0][0])
+
+    if not parts:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), 0
+    keys, counts = reduce_pairs(np.concatenate([k for k, _ in parts]), np.concatenate([c for _, c in parts]))
+    return keys, counts, total_pairs
+
+
+def association_scores(observed, p1, p2, total_pairs):
+    """Меры ассоциации для всех пар сразу
+
+    observed - частоты пар, p1 и p2 - относительные частоты первого и второго
+    слова, total_pairs - число всех пар. Таблица сопряженности 2×2 строится
+    на множестве пар: R1 = p1·N, C1 = p2·N, ожидаемая частота E = p1·p2·N.
+    """
+    observed = observed.astype(np.float64)
+    n = float(total_pairs)
+    row, col = p1 * n, p2 * n
+    expected = row * col / n
+
+    # Ячейки таблицы (частоты из словаря могут не совпадать с корпусом - не ниже 0)
+    o = [observed, np.maximum(row - observed, 0), np.maximum(col - observed, 0),
+         np.maximum(n - row - col + observed, 0)]
+    e = [expected, row * (n - col) / n, (n - row) * col / n, (n - row) * (n - col) / n]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_likelihood = 2 * sum(xlogy(oi, oi) - xlogy(oi, ei) for oi, ei in zip(o, e))
+        # Отрицательная ассоциация (O < E) отмечается знаком
+        log_likelihood = np.where(observed < expected, -log_likelihood, log_likelihood)
+        pmi = np.log2(observed / expected)
+        t_score = (observed - expected) / np.sqrt(observed)
+
+    return {'expected': expected, 'LL': log_likelihood, 'PMI': pmi, 't': t_score}
+
+
+def top_indices(scores, k):
+    """Индексы k наибольших значений по убыванию"""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    head = np.argpartition(-scores, k - 1)[:k]
+    return head[np.lexsort((head, -scores[head]))]
+
+
+class CollocationAnalyzer:
+    """Анализ словосочетаний (пары слов в окне)"""
+
+    def __init__(self, language, context=None, window=COLLOCATION_WINDOW, table_format='xlsx'):
+        self.language = language
+        self.context = context or get_context(language)
+        # window: максимальное расстояние между словами пары (1 - соседние слова)
+        if window < 1:
+            raise ValueError(f"Окно словосочетаний должно быть не меньше 1: {window}")
+        self.window = window
+        self.table_format = table_format
+        self.reader = CorpusReader(language)
+
+    def corpus_files(self):
+        """Текстовые файлы корпуса языка"""
+        return self.reader.corpus_files()
+
+    def unigram_probabilities(self, vocabulary, codes):
+        """Относительные частоты слов корпуса по частотному словарю
+
+        Для слов, которых нет в словаре, берется частота в самом корпусе.
+        """
+        word_counts = self.context.word_counts
+        dictionary_total = int(self.context.counts.sum())
+        counts = np.fromiter((word_counts.get(word, 0) for word in vocabulary.tolist()),
+                             dtype=np.float64, count=len(vocabulary))
+        probabilities = counts / dictionary_total
+
+        missing = counts == 0
+        if missing.any():
+            corpus_counts = np.bincount(codes, minlength=len(vocabulary))
+            probabilities[missing] = corpus_counts[missing] / len(codes)
+        return probabilities, int(np.count_nonzero(missing))
+
+    def calculate_collocations(self, top_n=COLLOCATION_TOP, min_count=COLLOCATION_MIN_COUNT):
+        """Частоты пар, меры ассоциации и топ-N пар по каждой мере"""
+        codes, vocabulary, file_lengths = self.reader.encode(self.corpus_files())
+        n_words = len(vocabulary)
+
+        print(f"Подсчет совместной встречаемости (окно {self.window})...")
+        keys, observed, total_pairs = cooccurrence_counts(codes, file_lengths, n_words, self.window)
+        distinct_pairs = len(keys)
+
+        # Меры для редких пар ненадежны (особенно PMI)
+        frequent = observed >= min_count
+        keys, observed = keys[frequent], observed[frequent]
+        first, second = keys // n_words, keys % n_words
+
+        probabilities, missing = self.unigram_probabilities(vocabulary, codes)
+        scores = association_scores(observed, probabilities[first], probabilities[second], total_pairs)
+
+        def rows(indices):
+            return [{
+                'word1': vocabulary[first[i]],
+                'word2': vocabulary[second[i]],
+                'observed': int(observed[i]),
+                'expected': float(scores['expected'][i]),
+                'LL': float(scores['LL'][i]),
+                'PMI': float(scores['PMI'][i]),
+                't': float(scores['t'][i])
+            } for i in indices.tolist()]
+
+        return {
+            'window': self.window,
+            'min_count': min_count,
+            'total_words': len(codes),
+            'total_pairs': total_pairs,
+            'distinct_pairs': distinct_pairs,
+            'scored_pairs': len(keys),
+            'missing_words': missing,
+            'top': {measure: rows(top_indices(scores[measure], top_n)) for measure in ASSOCIATION_MEASURES}
+        }
+
+    def save_table(self, results, path, fmt='xlsx'):
+        """Таблица топ-пар: по листу на каждую меру"""
+        header = ['Ранг', 'Слово 1', 'Слово 2', 'Частота', 'Ожидаемая'] + \
+                 [title for title, _ in ASSOCIATION_MEASURES.values()]
+
+        def table_rows(items):
+            for rank, item in enumerate(items, 1):
+                yield [rank, item['word1'], item['word2'], item['observed'], round(item['expected'], 3)] + \
+                      [round(item[measure], 3) for measure in ASSOCIATION_MEASURES]
+
+        measures = list(ASSOCIATION_MEASURES)
+        with TableWriter(path, header, ASSOCIATION_MEASURES[measures[0]][0], fmt) as writer:
+            writer.write_rows(table_rows(results['top'][measures[0]]))
+            for measure in measures[1:]:
+                writer.add_sheet(ASSOCIATION_MEASURES[measure][0], header, table_rows(results['top'][measure]))
+
+            writer.add_sheet('Информация', ['Параметр', 'Значение'], [
+                ['Язык', LANGUAGES[self.language]],
+                ['Всего слов в корпусе', f"{results['total_words']:,}"],
+                ['Окно', results['window']],
+                ['Всего пар', f"{results['total_pairs']:,}"],
+                ['Различных пар', f"{results['distinct_pairs']:,}"],
+                ['Минимальная частота пары', results['min_count']],
+                ['Оценено пар', f"{results['scored_pairs']:,}"]
+            ])
+
+        print(f"Таблица сохранена: {writer.path}")
+        return writer.path
+
+    def generate_report(self, results, top_n=COLLOCATION_REPORT_TOP):
+        """Генерация текстового отчета (top_n пар для каждой меры)"""
+        report = []
+        report.append(f"=== СЛОВОСОЧЕТАНИЯ - {LANGUAGES[self.language].upper()} ===\n")
+        report.append(f"Всего слов в корпусе: {results['total_words']:,}")
+        window = "соседние слова" if results['window'] == 1 else f"до {results['window']} слов вправо"
+        report.append(f"Окно: {window}")
+        report.append(f"Всего пар: {results['total_pairs']:,}")
+        report.append(f"Различных пар: {results['distinct_pairs']:,}")
+        report.append(f"Оценено пар (частота >= {results['min_count']}): {results['scored_pairs']:,}")
+        if results['missing_words']:
+            report.append(f"Слов нет в частотном словаре (частота по корпусу): {results['missing_words']:,}")
+
+        report.append("\nЧастоты слов - из частотного словаря; E = p(u)·p(v)·N (N - число пар)")
+        for title, formula in ASSOCIATION_MEASURES.values():
+            report.append(f"{title}: {formula}")
+
+        for measure, (title, _) in ASSOCIATION_MEASURES.items():
+            top = results['top'][measure][:top_n]
+            report.append(f"\nТоп-{len(top)} по {title}:")
+            report.append(f"{'Ранг':>5} {'Пара':>30} {'O':>8} {'E':>10} {'LL':>10} {'PMI':>7} {'t':>7}")
+            report.append("-" * 83)
+            for rank, item in enumerate(top, 1):
+                pair = f"{item['word1']} {item['word2']}"
+                report.append(f"{rank:>5} {pair:>30} {item['observed']:>8} {item['expected']:>10.2f} "
+                              f"{item['LL']:>10.1f} {item['PMI']:>7.2f} {item['t']:>7.2f}")
+
+        return "\n".join(report)
+
+    def analyze(self, cache=None, renderer=None):
+        """Полный анализ"""
+        print(f"\n--- Словосочетания для {LANGUAGES[self.language]} ---")
+
+        suffix = f"_w{self.window}" if self.window != COLLOCATION_WINDOW else ''
+        table_path = TABLES_DIR / f"collocations_{self.language}{suffix}.{self.table_format}"
+        report_path = OUTPUT_DIR / f"collocations_report_{self.language}{suffix}.txt"
+
+        def compute():
+            results = self.calculate_collocations()
+            self.save_table(results, table_path, self.table_format)
+            return results, self.generate_report(results)
+
+        return run_cached(cache, 'collocations', self.language, [self.context.path] + self.corpus_files(),
+                          {'window': self.window, 'min_count': COLLOCATION_MIN_COUNT,
+                           'top_n': COLLOCATION_TOP, 'table_format': self.table_format,
+                           'measures': list(ASSOCIATION_MEASURES)},
+                          [table_path], report_path, compute)
+
+
+def analyze_all_languages():
+    """Анализ для всех языков"""
+    all_results = {}
+
+    for lang in LANGUAGES.keys():
+        analyzer = CollocationAnalyzer(lang)
+        all_results[lang] = analyzer.analyze()
+
+    return all_results
+
+
+if __name__ == "__main__":
+    analyze_all_languages()
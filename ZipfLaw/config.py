@@ -8,11 +8,13 @@ DATA_DIR = Path("../FrequencyDictionary/data")
 OUTPUT_DIR = Path("output")
 PLOTS_DIR = OUTPUT_DIR / "plots"
 TABLES_DIR = OUTPUT_DIR / "tables"
+CACHE_DIR = OUTPUT_DIR / "cache"
 
 # Создание директорий
 OUTPUT_DIR.mkdir(exist_ok=True)
 PLOTS_DIR.mkdir(exist_ok=True)
 TABLES_DIR.mkdir(exist_ok=True)
+CACHE_DIR.mkdir(exist_ok=True)
 
 # Языки
 LANGUAGES = {
@@ -43,12 +45,50 @@ FUNCTION_WORDS = {
 # Параметры для графиков
 PLOT_STYLE = 'seaborn-v0_8-darkgrid'
 PLOT_DPI = 300
+PLOT_BACKEND = 'Agg'  # Неинтерактивный бэкенд (графики только сохраняются в файлы)
+PLOT_FORMAT = 'png'  # Формат графиков: png или svg
+PREVIEW_DPI = 72  # Разрешение в режиме быстрого предпросмотра
 FIGURE_SIZE = (12, 8)
 
 # Параметры для анализа
 TOP_WORDS_ZIPF = 100  # Количество слов для анализа закона Ципфа
+ZIPF_BINS_PER_DECADE = 10  # Число логарифмических бинов рангов на декаду при подгонке
 SEGMENT_SIZE = 250000  # Размер сегмента для коэффициента Жуйана (в словах)
 TOP_WORDS_JUYAN = 50  # Количество слов в итоговой таблице Жуйана
+JUYAN_SWEEP_CHUNK = 10000  # Размер блока (в словах) для перебора размеров сегмента
+JUYAN_SWEEP_SIZES = [10000, 25000, 50000, 100000, 250000, 500000]  # Размеры сегмента (кратны блоку)
+JUYAN_SWEEP_PLOT_WORDS = 10  # Количество слов на графике D от размера сегмента
+HEAPS_POINTS_PER_DECADE = 10  # Точек V(N) на декаду длины текста (закон Хипса)
+HEAPS_MIN_TOKENS = 1000  # Минимальная длина текста для точек подгонки закона Хипса
+HEAPS_HLL_PRECISION = 14  # Точность HyperLogLog (2^p регистров, ошибка ~1.04/√2^p)
+COLLOCATION_WINDOW = 1  # Окно словосочетаний: максимальное расстояние до второго слова (1 - соседние)
+COLLOCATION_MIN_COUNT = 5  # Минимальная частота пары для расчета мер ассоциации
+COLLOCATION_TOP = 100  # Количество пар в таблице для каждой меры
+COLLOCATION_REPORT_TOP = 20  # Количество пар в текстовом отчете для каждой меры
+COLLOCATION_CHUNK_TOKENS = 1_000_000  # Позиций корпуса в одном блоке подсчета пар
+KEYNESS_MIN_COUNT = 5  # Минимальная общая частота слова в двух корпусах для списков ключевых слов
+KEYNESS_MIN_LL = 6.63  # Минимальный |LL| ключевого слова (критическое значение χ² для p < 0.01)
+KEYNESS_TOP = 100  # Количество ключевых слов в таблице для каждого корпуса
+KEYNESS_REPORT_TOP = 20  # Количество ключевых слов в текстовом отчете для каждого корпуса
+
+# Параметры бутстрепа (доверительные интервалы)
+BOOTSTRAP_REPLICATES = 2000  # Количество бутстреп-выборок
+BOOTSTRAP_FULL_REPLICATES = 200  # Количество выборок для анализа по всему словарю
+BOOTSTRAP_CONFIDENCE = 0.95  # Уровень доверия
+BOOTSTRAP_SEED = 42  # Зерно генератора (результаты воспроизводимы)
+BOOTSTRAP_BATCH = 250  # Выборок в одном пакете (пакет - единица работы процесса)
+BOOTSTRAP_MAX_CELLS = 5_000_000  # Ограничение размера матрицы выборок в памяти
+BOOTSTRAP_WORKERS = 1  # Количество процессов (1 - в текущем процессе)
+
+# Параметры кэша результатов
+CACHE_MAX_AGE_DAYS = 30  # Записи старше этого срока удаляются при очистке
+
+# Паттерны очистки слов (удаляются все символы, кроме букв языка, дефиса и апострофа)
+CLEAN_PATTERNS = {
+    'english': r'[^a-zA-Z\-\']',
+    'german': r'[^a-zA-ZäöüÄÖÜß\-\']',
+    'russian': r'[^а-яёА-ЯЁ\-]'
+}
 
 # Кодировки для чтения файлов
 ENCODINGS = ['utf-8', 'cp1251', 'latin-1', 'cp1252']
\ No newline at end of file
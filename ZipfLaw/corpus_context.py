@@ -0,0 +1,94 @@
+"""Общий контекст частотного словаря для всех анализаторов"""
+
+import json
+import numpy as np
+from config import *
+
+
+class DictionaryContext:
+    """Частотный словарь языка, загружаемый один раз за сессию"""
+
+    def __init__(self, language):
+        self.language = language
+        self.path = FREQ_DICT_DIR / f"{language}_dictionary.json"
+        self.data = None
+        self.mtime = None
+        self._views = {}
+
+    def load(self):
+        """Загрузка словаря (пропускается, если файл не изменился)"""
+        mtime = self.path.stat().st_mtime_ns
+        if self.data is not None and mtime == self.mtime:
+            return self
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            self.data = json.load(f)
+
+        self.mtime = mtime
+        # Производные представления строятся заново по требованию
+        self._views = {}
+        return self
+
+    def _view(self, name, build):
+        """Ленивое вычисление производного представления"""
+        self.load()
+        if name not in self._views:
+            self._views[name] = build()
+        return self._views[name]
+
+    @property
+    def word_counts(self):
+        """Словарь слово → частота"""
+        return self.load().data['word_counts']
+
+    @property
+    def words(self):
+        """Массив слов в порядке словаря"""
+        return self._view('words', lambda: np.array(list(self.word_counts.keys()), dtype=object))
+
+    @property
+    def counts(self):
+        """Массив частот в порядке словаря"""
+        return self._view('counts', lambda: np.fromiter(
+            self.word_counts.values(), dtype=np.int64, count=len(self.word_counts)))
+
+    @property
+    def lengths(self):
+        """Массив длин слов в порядке словаря"""
+        return self._view('lengths', lambda: np.fromiter(
+            (len(word) for word in self.word_counts), dtype=np.int64, count=len(self.word_counts)))
+
+    @property
+    def order(self):
+        """Индексы слов по убыванию частоты (устойчивая сортировка)"""
+        return self._view('order', lambda: np.argsort(-self.counts, kind='stable'))
+
+    @property
+    def sorted_counts(self):
+        """Частоты по убыванию"""
+        return self._view('sorted_counts', lambda: self.counts[self.order])
+
+    @property
+    def ranks(self):
+        """Массив рангов 1..V"""
+        return self._view('ranks', lambda: np.arange(1, len(self.counts) + 1))
+
+    @property
+    def sorted_words(self):
+        """Пары (слово, частота) по убыванию частоты"""
+        return self._view('sorted_words', lambda: list(zip(
+            self.words[self.order].tolist(), self.sorted_counts.tolist())))
+
+    def top_words(self, top_n):
+        """Список top_n самых частых слов"""
+        return self.words[self.order[:top_n]].tolist()
+
+
+_contexts = {}
+
+
+def get_context(language):
+    """Контекст словаря языка, общий для всей сессии"""
+    if language not in _contexts:
+        _contexts[language] = DictionaryContext(language)
+    return _contexts[language]
@@ -0,0 +1,94 @@
+"""Потоковое чтение корпуса: файлы языка → очищенные слова"""
+
+import re
+import numpy as np
+from array import array
+from tqdm import tqdm
+from config import *
+
+
+def iter_decoded_lines(file_path, encodings=ENCODINGS):
+    """Строки файла, декодируемые по мере чтения (файл читается с диска один раз)
+
+    Строка декодируется текущей кодировкой (вначале - первой из encodings).
+    Если строка в ней не читается, для нее и остальной части файла берется
+    следующая подходящая кодировка; уже выданные строки не перечитываются.
+    Все кодировки из ENCODINGS совместимы с ASCII, поэтому деление на строки
+    по b'\\n' от кодировки не зависит.
+    """
+    current = 0
+    with open(file_path, 'rb') as f:
+        for raw in f:
+            while True:
+                try:
+                    yield raw.decode(encodings[current])
+                    break
+                except UnicodeDecodeError:
+                    current += 1
+                    if current == len(encodings):
+                        raise ValueError(f"Не удалось прочитать файл: {file_path}")
+
+
+class CorpusReader:
+    """Чтение текстов корпуса языка с очисткой слов"""
+
+    def __init__(self, language):
+        self.language = language
+        self.clean_pattern = re.compile(CLEAN_PATTERNS.get(language, r'[^\w\-\']'))
+
+    def clean_word(self, word):
+        """Очистка слова"""
+        cleaned = self.clean_pattern.sub('', word.lower()).strip('-')
+        if not cleaned or cleaned.replace('-', '').replace("'", '') == '':
+            return None
+        return cleaned
+
+    def corpus_files(self):
+        """Текстовые файлы корпуса языка"""
+        return sorted((DATA_DIR / self.language).glob("*.txt"))
+
+    def read_file(self, file_path):
+        """Чтение файла целиком (одно чтение с диска, см. iter_decoded_lines)"""
+        return ''.join(iter_decoded_lines(file_path))
+
+    def iter_file_tokens(self, file_path):
+        """Очищенные слова одного файла (построчно, без загрузки файла в память)"""
+        for line in iter_decoded_lines(file_path):
+            for word in line.split():
+                cleaned = self.clean_word(word)
+                if cleaned:
+                    yield cleaned
+
+    def iter_tokens(self, files=None, desc="Чтение файлов"):
+        """Очищенные слова всех файлов корпуса подряд"""
+        files = self.corpus_files() if files is None else files
+        for file_path in tqdm(files, desc=desc):
+            try:
+                yield from self.iter_file_tokens(file_path)
+            except Exception as e:
+                print(f"Ошибка при чтении {file_path}: {e}")
+
+    def encode(self, files=None):
+        """Корпус в виде массива кодов слов
+
+        Возвращает коды словоупотреблений (int32), словарь кодов (код → слово)
+        и длины файлов в словах (в порядке files).
+        """
+        files = self.corpus_files() if files is None else files
+        ids = {}
+        codes = array('i')
+        file_lengths = []
+        for file_path in tqdm(files, desc="Чтение файлов"):
+            start = len(codes)
+            try:
+                for word in self.iter_file_tokens(file_path):
+                    code = ids.get(word)
+                    if code is None:
+                        code = ids[word] = len(ids)
+                    codes.append(code)
+            except Exception as e:
+                print(f"Ошибка при чтении {file_path}: {e}")
+            file_lengths.append(len(codes) - start)
+
+        vocabulary = np.array(list(ids), dtype=object)
+        return np.frombuffer(codes, dtype=np.int32), vocabulary, np.array(file_lengths, dtype=np.int64)
@@ -0,0 +1,138 @@
+"""Меры распределенности слов по сегментам корпуса"""
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+
+def segment_matrix(codes, segment_ids, n_segments, n_words):
+    """Разреженная матрица частот сегмент × слово"""
+    matrix = csr_matrix((np.ones(len(codes), dtype=np.int64), (segment_ids, codes)),
+                        shape=(n_segments, n_words))
+    matrix.sum_duplicates()
+    return matrix
+
+
+class DispersionEngine:
+    """Расчет мер распределенности для всех слов за один векторизованный проход
+
+    Меры:
+    - D Жуйана в принятой здесь форме: D = 100 × (1 - σ / (μ × √(n-1))),
+      где n - число сегментов, содержащих слово;
+    - DP Гриса: 0.5 × Σ|vᵢ/f - sᵢ| (0 - равномерно, 1 - в одном сегменте);
+    - D2 Кэрролла: энтропия распределения частот по сегментам / log k;
+    - S Розенгрена и скорректированная частота AF = (Σ√(sᵢvᵢ))².
+
+    sᵢ - доля сегмента в корпусе. Если длины сегментов не заданы, сегменты
+    считаются равными (sᵢ = 1/k), и μ, σ считаются по самим частотам, как
+    в исходном расчете. При неравных сегментах (например, по одному на файл)
+    частоты приводятся к среднему размеру сегмента: xᵢ = vᵢ / (k·sᵢ).
+    """
+
+    def __init__(self, matrix, segment_lengths=None):
+        self.matrix = csr_matrix(matrix)
+        self.n_segments, self.n_words = self.matrix.shape
+        if segment_lengths is None:
+            self.shares = np.full(self.n_segments, 1 / self.n_segments)
+        else:
+            segment_lengths = np.asarray(segment_lengths, dtype=np.float64)
+            self.shares = segment_lengths / segment_lengths.sum()
+        self._measures = None
+
+    @property
+    def measures(self):
+        """Все меры (массивы по словам; NaN, где мера не определена)"""
+        if self._measures is None:
+            self._measures = self._compute()
+        return self._measures
+
+    def _compute(self):
+        k = self.n_segments
+        coo = self.matrix.tocoo()
+        words, v = coo.col, coo.data.astype(np.float64)
+        s = self.shares[coo.row]
+
+        def column_sum(values):
+            return np.bincount(words, weights=values, minlength=self.n_words)
+
+        frequency = column_sum(v)
+        n = np.bincount(words, minlength=self.n_words)
+
+        # Нормированные частоты; нулевые ячейки дают вклад 0 во все суммы ниже
+        x = v / (k * s)
+        mu = column_sum(x) / k
+        sigma = np.sqrt(np.maximum(column_sum(x * x) / k - mu ** 2, 0))
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            juilland = 100 * (1 - sigma / (mu * np.sqrt(n - 1)))
+            juilland[n < 2] = np.nan
+
+            # Σ по всем сегментам |pᵢ - sᵢ| = Σ по ненулевым (|pᵢ - sᵢ| - sᵢ) + 1
+            p = v / frequency[words]
+            dp = 0.5 * (column_sum(np.abs(p - s) - s) + 1)
+
+            # Энтропия распределения нормированных частот
+            q = x / column_sum(x)[words]
+            carroll = -column_sum(q * np.log(q)) / np.log(k)
+
+            adjusted = column_sum(np.sqrt(s * v)) ** 2
+            rosengren = adjusted / frequency
+
+        return {
+            'frequency': frequency.astype(np.int64),
+            'n': n,
+            'mu': mu,
+            'sigma': sigma,
+            'D': juilland,
+            'DP': dp,
+            'D2': carroll,
+            'S': rosengren,
+            'AF': adjusted
+        }
+
+    def column(self, index):
+        """Частоты слова по сегментам"""
+        return self.matrix[:, index].toarray().ravel()
+
+
+def chunk_counts(codes, columns, chunk_size):
+    """Накопленные частоты выбранных слов по мелким блокам корпуса
+
+    columns: код слова → столбец (-1 для слов, которые не нужны).
+    Возвращает массив (число блоков + 1) × столбцы, строка i - частоты
+    в первых i блоках, так что частоты любого отрезка из целых блоков
+    получаются разностью двух строк.
+    """
+    n_columns = int(columns.max()) + 1 if len(columns) else 0
+    n_chunks = -(-len(codes) // chunk_size)
+    selected = columns[codes]
+    mask = selected >= 0
+    chunk_ids = np.flatnonzero(mask) // chunk_size
+    counts = np.bincount(chunk_ids * n_columns + selected[mask],
+                         minlength=n_chunks * n_columns).reshape(n_chunks, n_columns)
+    cumulative = np.zeros((n_chunks + 1, n_columns), dtype=np.int64)
+    np.cumsum(counts, axis=0, out=cumulative[1:])
+    return cumulative
+
+
+def segment_bounds(total_words, segment_size, chunk_size):
+    """Границы сегментов (в блоках) по тому же правилу, что и основной расчет:
+    не меньше 4 сегментов, последний забирает остаток"""
+    num_segments = max(4, total_words // segment_size)
+    actual_segment_size = max(1, total_words // num_segments)
+    n_chunks = -(-total_words // chunk_size)
+    bounds = np.rint(np.arange(num_segments) * actual_segment_size / chunk_size).astype(np.int64)
+    return np.append(bounds, n_chunks)
+
+
+def sweep_dispersion(cumulative, total_words, chunk_size, segment_sizes):
+    """Меры распределенности для каждого размера сегмента из накопленных частот"""
+    sweep = []
+    for segment_size in segment_sizes:
+        bounds = segment_bounds(total_words, segment_size, chunk_size)
+        matrix = cumulative[bounds[1:]] - cumulative[bounds[:-1]]
+        # Длины сегментов в словах (последний блок может быть неполным)
+        word_bounds = np.minimum(bounds * chunk_size, total_words)
+        engine = DispersionEngine(matrix, np.diff(word_bounds))
+        sweep.append({'segment_size': segment_size, 'num_segments': len(bounds) - 1,
+                      'measures': engine.measures})
+    return sweep
@@ -1,27 +1,43 @@
 """Эмпирический закон Ципфа - длина слова обратно пропорциональна частоте"""
 
-import json
 import numpy as np
-import matplotlib.pyplot as plt
 from scipy.stats import spearmanr
 from config import *
+from rendering import plt
+from corpus_context import get_context
+from bootstrap import spearman_ci, weighted_spearman
+from result_cache import run_cached
+
+
+def length_aggregates(lengths, frequencies):
+    """Агрегаты по длинам слов: число слов, словоупотреблений и средняя частота"""
+    types = np.bincount(lengths)
+    tokens = np.bincount(lengths, weights=frequencies)
+    present = np.flatnonzero(types)
+    return {
+        'length': present,
+        'types': types[present],
+        'tokens': tokens[present].astype(np.int64),
+        'mean_frequency': tokens[present] / types[present]
+    }
 
 
 class EmpiricalZipfAnalyzer:
-    """Анализ эмпирического закона Ципфа для служебных слов"""
+    """Анализ эмпирического закона Ципфа для служебных слов или всего словаря"""
     
-    def __init__(self, language):
+    def __init__(self, language, context=None, full_vocabulary=False, token_weighted=False):
         self.language = language
+        self.context = context or get_context(language)
         self.word_counts = None
         self.function_words_data = []
+        # Режим всего словаря: все слова вместо списка FUNCTION_WORDS
+        self.full_vocabulary = full_vocabulary
+        # Корреляция по словоупотреблениям (каждое слово с весом своей частоты)
+        self.token_weighted = token_weighted
         
     def load_dictionary(self):
         """Загрузка частотного словаря"""
-        dict_path = FREQ_DICT_DIR / f"{self.language}_dictionary.json"
-        with open(dict_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        self.word_counts = data['word_counts']
+        self.word_counts = self.context.word_counts
         
     def extract_function_words(self):
         """Извлечение данных о служебных словах"""
@@ -52,20 +68,54 @@ class EmpiricalZipfAnalyzer:
         corr_coef, p_value = spearmanr(lengths, frequencies)
         
         return {
+            'mode': 'function',
             'lengths': lengths,
             'frequencies': frequencies,
             'correlation': corr_coef,
             'p_value': p_value,
+            'correlation_ci': spearman_ci(lengths, frequencies),
+            'by_length': length_aggregates(lengths, frequencies),
             'words': self.function_words_data
         }
     
-    def plot_empirical_zipf(self, results, save_path=None):
+    def calculate_full_vocabulary(self):
+        """Расчет корреляции между длиной и частотой по всему словарю"""
+        lengths = self.context.lengths
+        frequencies = self.context.counts
+        weights = frequencies if self.token_weighted else None
+        
+        if self.token_weighted:
+            # Для взвешенной корреляции P-значение не определено
+            corr_coef, p_value = weighted_spearman(lengths, frequencies, weights), None
+        else:
+            corr_coef, p_value = spearmanr(lengths, frequencies)
+        
+        return {
+            'mode': 'full',
+            'token_weighted': self.token_weighted,
+            'lengths': lengths,
+            'frequencies': frequencies,
+            'correlation': corr_coef,
+            'p_value': p_value,
+            'correlation_ci': spearman_ci(lengths, frequencies, weights,
+                                          replicates=BOOTSTRAP_FULL_REPLICATES),
+            'by_length': length_aggregates(lengths, frequencies),
+            'words': []
+        }
+    
+    def plot_empirical_zipf(self, results, save_path=None, dpi=PLOT_DPI):
         """Построение графика"""
         plt.style.use(PLOT_STYLE)
         fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
         
-        # График 1: Диаграмма рассеяния
-        ax1.scatter(results['lengths'], results['frequencies'], alpha=0.6, s=100, c='blue')
+        if results['mode'] == 'full':
+            # График 1: плотность точек (слов слишком много для диаграммы рассеяния)
+            hb = ax1.hexbin(results['lengths'], results['frequencies'], yscale='log',
+                            bins='log', gridsize=40, cmap='Blues', mincnt=1)
+            fig.colorbar(hb, ax=ax1, label='Количество слов')
+        else:
+            # График 1: Диаграмма рассеяния
+            ax1.scatter(results['lengths'], results['frequencies'], alpha=0.6, s=100, c='blue')
         
         # Аннотации для некоторых слов
         for i, item in enumerate(results['words'][:10]):  # Первые 10 слов
@@ -81,17 +131,10 @@ class EmpiricalZipfAnalyzer:
         ax1.grid(True, alpha=0.3)
         
         # График 2: Средняя частота по длинам
-        length_freq = {}
-        for item in results['words']:
-            length = item['length']
-            if length not in length_freq:
-                length_freq[length] = []
-            length_freq[length].append(item['frequency'])
-        
-        avg_lengths = sorted(length_freq.keys())
-        avg_frequencies = [np.mean(length_freq[l]) for l in avg_lengths]
-        
-        ax2.plot(avg_lengths, avg_frequencies, 'ro-', markersize=8, linewidth=2)
+        by_length = results['by_length']
+        ax2.plot(by_length['length'], by_length['mean_frequency'], 'ro-', markersize=8, linewidth=2)
+        if results['mode'] == 'full':
+            ax2.set_yscale('log')
         ax2.set_xlabel('Длина слова', fontsize=12)
         ax2.set_ylabel('Средняя частота', fontsize=12)
         ax2.set_title('Зависимость средней частоты от длины', fontsize=14)
@@ -100,7 +143,7 @@ class EmpiricalZipfAnalyzer:
         plt.tight_layout()
         
         if save_path:
-            plt.savefig(save_path, dpi=PLOT_DPI, bbox_inches='tight')
+            plt.savefig(save_path, dpi=dpi, bbox_inches='tight')
             print(f"График сохранен: {save_path}")
         
         plt.close()
@@ -109,42 +152,72 @@ class EmpiricalZipfAnalyzer:
         """Генерация отчета"""
         report = []
         report.append(f"=== ЭМПИРИЧЕСКИЙ ЗАКОН ЦИПФА - {LANGUAGES[self.language].upper()} ===\n")
-        report.append(f"Проанализировано служебных слов: {len(results['words'])}\n")
-        
-        report.append("Таблица служебных слов:")
-        report.append(f"{'№':>3} {'Слово':>10} {'Длина':>6} {'Частота':>10}")
-        report.append("-" * 35)
-        
-        for i, item in enumerate(results['words'], 1):
-            report.append(f"{i:>3} {item['word']:>10} {item['length']:>6} {item['frequency']:>10}")
+        if results['mode'] == 'full':
+            weighting = 'по словоупотреблениям' if results['token_weighted'] else 'по словам'
+            report.append(f"Проанализировано слов: {len(results['lengths']):,} (весь словарь, корреляция {weighting})\n")
+            
+            report.append("Агрегаты по длинам слов:")
+            report.append(f"{'Длина':>6} {'Слов':>10} {'Употреблений':>14} {'Ср. частота':>12}")
+            report.append("-" * 45)
+            
+            by_length = results['by_length']
+            for length, types, tokens, mean in zip(by_length['length'], by_length['types'],
+                                                   by_length['tokens'], by_length['mean_frequency']):
+                report.append(f"{length:>6} {types:>10} {tokens:>14} {mean:>12.2f}")
+            replicates = BOOTSTRAP_FULL_REPLICATES
+        else:
+            report.append(f"Проанализировано служебных слов: {len(results['words'])}\n")
+            
+            report.append("Таблица служебных слов:")
+            report.append(f"{'№':>3} {'Слово':>10} {'Длина':>6} {'Частота':>10}")
+            report.append("-" * 35)
+            
+            for i, item in enumerate(results['words'], 1):
+                report.append(f"{i:>3} {item['word']:>10} {item['length']:>6} {item['frequency']:>10}")
+            replicates = BOOTSTRAP_REPLICATES
         
         report.append(f"\nКоэффициент корреляции: {results['correlation']:.4f}")
-        report.append(f"P-значение: {results['p_value']:.6f}")
+        ci = results['correlation_ci']
+        report.append(f"{ci['level']:.0%} доверительный интервал (бутстреп, {replicates} выборок): "
+                      f"[{ci['low']:.4f}; {ci['high']:.4f}]")
+        if results['p_value'] is not None:
+            report.append(f"P-значение: {results['p_value']:.6f}")
         
         return "\n".join(report)
     
-    def analyze(self):
+    def analyze(self, cache=None, renderer=None):
         """Полный анализ"""
         print(f"\n--- Эмпирический закон Ципфа для {LANGUAGES[self.language]} ---")
         
-        self.load_dictionary()
-        self.extract_function_words()
-        results = self.calculate_correlation()
+        suffix = ''
+        if self.full_vocabulary:
+            suffix = '_full_weighted' if self.token_weighted else '_full'
+        plot_path = PLOTS_DIR / f"empirical_zipf_{self.language}{suffix}.png"
+        if renderer:
+            plot_path = renderer.output_path(plot_path)
+        report_path = OUTPUT_DIR / f"empirical_zipf_report_{self.language}{suffix}.txt"
         
-        # Сохраняем график
-        plot_path = PLOTS_DIR / f"empirical_zipf_{self.language}.png"
-        self.plot_empirical_zipf(results, plot_path)
-        
-        # Сохраняем отчет
-        report = self.generate_report(results)
-        report_path = OUTPUT_DIR / f"empirical_zipf_report_{self.language}.txt"
-        with open(report_path, 'w', encoding='utf-8') as f:
-            f.write(report)
-        
-        print(report)
-        print(f"\nОтчет сохранен: {report_path}")
-        
-        return results
+        def compute():
+            self.load_dictionary()
+            if self.full_vocabulary:
+                results = self.calculate_full_vocabulary()
+            else:
+                self.extract_function_words()
+                results = self.calculate_correlation()
+            
+            # Сохраняем график
+            if renderer:
+                renderer.submit(self, 'plot_empirical_zipf', results, plot_path)
+            else:
+                self.plot_empirical_zipf(results, plot_path)
+            return results, self.generate_report(results)
+        
+        return run_cached(cache, 'empirical_zipf', self.language, [self.context.path],
+                          {'function_words': FUNCTION_WORDS.get(self.language, []),
+                           'mode': suffix,
+                           'bootstrap': [BOOTSTRAP_REPLICATES, BOOTSTRAP_FULL_REPLICATES,
+                                         BOOTSTRAP_CONFIDENCE, BOOTSTRAP_SEED]},
+                          [plot_path], report_path, compute)
 
 
 def analyze_all_languages():
@@ -0,0 +1,207 @@
+"""Анализ закона Хипса: рост словаря V(N) с увеличением длины текста"""
+
+import hashlib
+import numpy as np
+from config import *
+from rendering import plt
+from corpus_context import get_context
+from corpus_stream import CorpusReader
+from result_cache import run_cached
+
+
+class HyperLogLog:
+    """Оценка числа различных слов с фиксированным расходом памяти (2^p байт)"""
+
+    def __init__(self, precision=HEAPS_HLL_PRECISION):
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = bytearray(self.m)
+        self.alpha = 0.7213 / (1 + 1.079 / self.m)
+
+    def add(self, word):
+        # Стабильный 64-битный хэш (встроенный hash() меняется между запусками)
+        h = int.from_bytes(hashlib.blake2b(word.encode('utf-8'), digest_size=8).digest(), 'little')
+        index = h & (self.m - 1)
+        rank = 64 - self.precision - (h >> self.precision).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def estimate(self):
+        registers = np.frombuffer(self.registers, dtype=np.uint8)
+        raw = self.alpha * self.m ** 2 / np.sum(np.exp2(-registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(registers == 0))
+        # Поправка для малых значений (линейный подсчет)
+        if raw <= 2.5 * self.m and zeros:
+            return self.m * np.log(self.m / zeros)
+        return raw
+
+    def __len__(self):
+        return int(round(self.estimate()))
+
+
+class HeapsAnalyzer:
+    """Анализ закона Хипса V(N) = K · N^β"""
+
+    def __init__(self, language, context=None, approximate=False):
+        self.language = language
+        self.context = context or get_context(language)
+        # approximate: HyperLogLog вместо множества всех встреченных слов
+        self.approximate = approximate
+        self.reader = CorpusReader(language)
+
+    def corpus_files(self):
+        """Текстовые файлы корпуса языка (те же, что для коэффициента Жуйана)"""
+        return self.reader.corpus_files()
+
+    def vocabulary_growth(self, points_per_decade=HEAPS_POINTS_PER_DECADE):
+        """Один проход по корпусу: V(N) в логарифмически равномерных точках"""
+        seen = HyperLogLog() if self.approximate else set()
+        step = 10 ** (1 / points_per_decade)
+
+        tokens, types = [], []
+        n = 0
+        checkpoint = 1
+        for word in self.reader.iter_tokens(self.corpus_files()):
+            seen.add(word)
+            n += 1
+            if n == checkpoint:
+                tokens.append(n)
+                types.append(len(seen))
+                checkpoint = max(checkpoint + 1, int(np.ceil(checkpoint * step)))
+
+        # Последняя точка - весь корпус
+        if n and (not tokens or tokens[-1] != n):
+            tokens.append(n)
+            types.append(len(seen))
+
+        return np.array(tokens, dtype=np.int64), np.array(types, dtype=np.int64)
+
+    def fit_heaps(self, tokens, types, min_tokens=HEAPS_MIN_TOKENS):
+        """Подгонка log V = log K + β·log N по точкам с N >= min_tokens"""
+        mask = tokens >= min_tokens
+        if np.count_nonzero(mask) < 2:
+            mask = tokens > 0
+        if np.count_nonzero(mask) < 2:
+            raise ValueError(f"Недостаточно данных для подгонки закона Хипса: {self.language}")
+
+        log_n = np.log(tokens[mask])
+        log_v = np.log(types[mask])
+        beta, log_k = np.polyfit(log_n, log_v, 1)
+
+        residuals = log_v - (log_k + beta * log_n)
+        r_squared = 1 - np.sum(residuals ** 2) / np.sum((log_v - log_v.mean()) ** 2)
+
+        return {'K': np.exp(log_k), 'beta': beta, 'r_squared': r_squared,
+                'n_points': int(np.count_nonzero(mask))}
+
+    def calculate_heaps(self):
+        """Расчет показателей закона Хипса"""
+        tokens, types = self.vocabulary_growth()
+        return {
+            'tokens': tokens,
+            'types': types,
+            'fit': self.fit_heaps(tokens, types),
+            'approximate': self.approximate,
+            'dictionary_types': len(self.context.words)
+        }
+
+    def plot_heaps(self, results, save_path=None, dpi=PLOT_DPI):
+        """Построение графика закона Хипса"""
+        plt.style.use(PLOT_STYLE)
+        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
+
+        tokens, types, fit = results['tokens'], results['types'], results['fit']
+        theoretical = fit['K'] * tokens.astype(np.float64) ** fit['beta']
+        label = f'V = {fit["K"]:.2f}·N^{fit["beta"]:.3f}'
+
+        # График 1: логарифмическая шкала
+        ax1.loglog(tokens, types, 'bo', markersize=4, label='Корпус')
+        ax1.loglog(tokens, theoretical, 'r--', linewidth=2, label=label)
+        ax1.set_xlabel('Длина текста (N)', fontsize=12)
+        ax1.set_ylabel('Размер словаря (V)', fontsize=12)
+        ax1.set_title(f'Закон Хипса - {LANGUAGES[self.language]}\n(логарифмическая шкала)', fontsize=14)
+        ax1.grid(True, alpha=0.3)
+        ax1.legend()
+
+        # График 2: линейная шкала
+        ax2.plot(tokens, types, 'b-', linewidth=2, label='Корпус')
+        ax2.plot(tokens, theoretical, 'r--', linewidth=2, label=label)
+        ax2.set_xlabel('Длина текста (N)', fontsize=12)
+        ax2.set_ylabel('Размер словаря (V)', fontsize=12)
+        ax2.set_title('Рост словаря', fontsize=14)
+        ax2.grid(True, alpha=0.3)
+        ax2.legend()
+
+        plt.tight_layout()
+
+        if save_path:
+            plt.savefig(save_path, dpi=dpi, bbox_inches='tight')
+            print(f"График сохранен: {save_path}")
+
+        plt.close()
+
+    def generate_report(self, results):
+        """Генерация текстового отчета"""
+        fit = results['fit']
+        report = []
+        report.append(f"=== ЗАКОН ХИПСА - {LANGUAGES[self.language].upper()} ===\n")
+        report.append(f"Длина корпуса (N): {results['tokens'][-1]:,}")
+        method = f"HyperLogLog, p={HEAPS_HLL_PRECISION}" if results['approximate'] else "точный подсчет"
+        report.append(f"Размер словаря (V): {results['types'][-1]:,} ({method})")
+        report.append(f"Слов в частотном словаре: {results['dictionary_types']:,}\n")
+
+        report.append("Формула: V(N) = K · N^β")
+        report.append(f"K = {fit['K']:.4f}")
+        report.append(f"β = {fit['beta']:.4f}")
+        report.append(f"R² (лог-шкала) = {fit['r_squared']:.4f}")
+        report.append(f"Точек для подгонки: {fit['n_points']} (N >= {HEAPS_MIN_TOKENS:,})\n")
+
+        report.append(f"{'N':>12} {'V':>10} {'V / N':>8}")
+        report.append("-" * 32)
+        # Примерно по одной точке на декаду
+        for i in range(0, len(results['tokens']), HEAPS_POINTS_PER_DECADE):
+            n, v = results['tokens'][i], results['types'][i]
+            report.append(f"{n:>12,} {v:>10,} {v / n:>8.4f}")
+
+        return "\n".join(report)
+
+    def analyze(self, cache=None, renderer=None):
+        """Полный анализ"""
+        print(f"\n--- Закон Хипса для {LANGUAGES[self.language]} ---")
+
+        suffix = '_hll' if self.approximate else ''
+        plot_path = PLOTS_DIR / f"heaps_{self.language}{suffix}.png"
+        if renderer:
+            plot_path = renderer.output_path(plot_path)
+        report_path = OUTPUT_DIR / f"heaps_report_{self.language}{suffix}.txt"
+
+        def compute():
+            results = self.calculate_heaps()
+
+            # Сохраняем график
+            if renderer:
+                renderer.submit(self, 'plot_heaps', results, plot_path)
+            else:
+                self.plot_heaps(results, plot_path)
+            return results, self.generate_report(results)
+
+        return run_cached(cache, 'heaps', self.language, [self.context.path] + self.corpus_files(),
+                          {'points_per_decade': HEAPS_POINTS_PER_DECADE,
+                           'min_tokens': HEAPS_MIN_TOKENS, 'approximate': self.approximate,
+                           'precision': HEAPS_HLL_PRECISION},
+                          [plot_path], report_path, compute)
+
+
+def analyze_all_languages():
+    """Анализ для всех языков"""
+    all_results = {}
+
+    for lang in LANGUAGES.keys():
+        analyzer = HeapsAnalyzer(lang)
+        all_results[lang] = analyzer.analyze()
+
+    return all_results
+
+
+if __name__ == "__main__":
+    analyze_all_languages()
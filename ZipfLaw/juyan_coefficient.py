@@ -1,214 +1,177 @@
 """Расчет коэффициента D Жуйана"""
 
-import json
-import re
 import numpy as np
-import pandas as pd
-from pathlib import Path
-from collections import defaultdict
+from itertools import islice
 from tqdm import tqdm
 from config import *
+from corpus_context import get_context
+from corpus_stream import CorpusReader
+from table_writer import TableWriter
+from dispersion import DispersionEngine, segment_matrix, chunk_counts, sweep_dispersion
+from rendering import plt
+from result_cache import run_cached
+
+# Меры распределенности в таблице и отчете (D - основная, по ней задание 3)
+DISPERSION_MEASURES = ['D', 'DP', 'D2', 'S', 'AF']
 
 
 class JuyanAnalyzer:
     """Анализ коэффициента Жуйана"""
     
-    def __init__(self, language):
+    def __init__(self, language, context=None, export='top', table_format='xlsx', segmentation='fixed',
+                 sweep=False):
         self.language = language
+        self.context = context or get_context(language)
         self.word_counts = None
-        self.segments = []
-        self.clean_pattern = self._get_clean_pattern()
-        
-    def _get_clean_pattern(self):
-        """Получение паттерна очистки для языка"""
-        patterns = {
-            'english': r'[^a-zA-Z\-\']',
-            'german': r'[^a-zA-ZäöüÄÖÜß\-\']',
-            'russian': r'[^а-яёА-ЯЁ\-]'
-        }
-        return patterns.get(self.language, r'[^\w\-\']')
+        self.engine = None
+        self.word_index = {}
+        # Сегменты: fixed - по SEGMENT_SIZE слов, files - по одному на файл корпуса
+        self.segmentation = segmentation
+        # Режим перебора размеров сегмента (JUYAN_SWEEP_SIZES) вместо основной таблицы
+        self.sweep = sweep
+        self._encoded = None
+        # Экспорт таблицы: top - TOP_WORDS_JUYAN слов, full - весь словарь
+        self.export = export
+        self.table_format = table_format
+        self.reader = CorpusReader(language)
     
     def clean_word(self, word):
         """Очистка слова"""
-        cleaned = re.sub(self.clean_pattern, '', word.lower()).strip('-')
-        if not cleaned or cleaned.replace('-', '').replace("'", '') == '':
-            return None
-        return cleaned
+        return self.reader.clean_word(word)
     
     def read_file(self, file_path):
         """Чтение файла с разными кодировками"""
-        for encoding in ENCODINGS:
-            try:
-                with open(file_path, 'r', encoding=encoding) as f:
-                    return f.read()
-            except UnicodeDecodeError:
-                continue
-        raise UnicodeDecodeError(f"Не удалось прочитать файл: {file_path}")
+        return self.reader.read_file(file_path)
+    
+    def encode_corpus(self):
+        """Коды слов корпуса (чтение файлов выполняется один раз)"""
+        if self._encoded is None:
+            self._encoded = self.reader.encode(self.corpus_files())
+        return self._encoded
     
     def split_into_segments(self, target_segment_size=SEGMENT_SIZE):
-        """Разбиение корпуса на сегменты"""
-        print(f"Разбиение корпуса на сегменты по {target_segment_size:,} слов...")
-        
-        # Читаем все файлы языка
-        lang_dir = DATA_DIR / self.language
-        txt_files = list(lang_dir.glob("*.txt"))
-        
-        all_words = []
-        for file_path in tqdm(txt_files, desc="Чтение файлов"):
-            try:
-                text = self.read_file(file_path)
-                words = text.split()
-                for word in words:
-                    cleaned = self.clean_word(word)
-                    if cleaned:
-                        all_words.append(cleaned)
-            except Exception as e:
-                print(f"Ошибка при чтении {file_path}: {e}")
-        
-        print(f"Всего слов в корпусе: {len(all_words):,}")
-        
-        # Разбиваем на сегменты
-        num_segments = max(4, len(all_words) // target_segment_size)
-        actual_segment_size = len(all_words) // num_segments
+        """Разбиение корпуса на сегменты и подсчет матрицы частот сегмент × слово"""
+        if self.segmentation == 'files':
+            print("Разбиение корпуса на сегменты по файлам...")
+        else:
+            print(f"Разбиение корпуса на сегменты по {target_segment_size:,} слов...")
+        
+        # Читаем все файлы языка построчно; слова хранятся кодами
+        codes, vocabulary, file_lengths = self.encode_corpus()
+        total_words = len(codes)
+        
+        print(f"Всего слов в корпусе: {total_words:,}")
+        
+        if self.segmentation == 'files':
+            # Один сегмент на файл; сегменты неравные, учитываются их длины
+            segment_lengths = file_lengths[file_lengths > 0]
+            num_segments = len(segment_lengths)
+            segment_ids = np.repeat(np.arange(num_segments), segment_lengths)
+        else:
+            # Равные сегменты, последний забирает остаток
+            segment_lengths = None
+            num_segments = max(4, total_words // target_segment_size)
+            actual_segment_size = max(1, total_words // num_segments)
+            segment_ids = np.minimum(np.arange(total_words) // actual_segment_size, num_segments - 1)
         
         print(f"Количество сегментов: {num_segments}")
-        print(f"Размер сегмента: ~{actual_segment_size:,} слов")
+        print(f"Размер сегмента: ~{total_words // max(1, num_segments):,} слов")
         
-        self.segments = []
-        for i in range(num_segments):
-            start = i * actual_segment_size
-            end = start + actual_segment_size if i < num_segments - 1 else len(all_words)
-            segment_words = all_words[start:end]
-            
-            # Подсчитываем частоты в сегменте
-            segment_counts = defaultdict(int)
-            for word in segment_words:
-                segment_counts[word] += 1
-            
-            self.segments.append(dict(segment_counts))
+        matrix = segment_matrix(codes, segment_ids, num_segments, len(vocabulary))
+        self.engine = DispersionEngine(matrix, segment_lengths)
+        self.word_index = {word: i for i, word in enumerate(vocabulary.tolist())}
         
-        return len(all_words), num_segments
+        return total_words, num_segments
     
     def calculate_juyan(self, word):
-        """Расчет коэффициента Жуйана для слова"""
-        # Собираем частоты слова в каждом сегменте
-        frequencies = []
-        n_segments_with_word = 0
-        
-        for segment in self.segments:
-            freq = segment.get(word, 0)
-            frequencies.append(freq)
-            if freq > 0:
-                n_segments_with_word += 1
-        
-        if n_segments_with_word < 2:
+        """Расчет коэффициента Жуйана (и других мер распределенности) для слова"""
+        index = self.word_index.get(word)
+        if index is None:
             return None
         
-        frequencies = np.array(frequencies)
-        
-        # Средняя частота
-        mu = np.mean(frequencies)
-        
-        # Стандартное отклонение
-        sigma = np.std(frequencies, ddof=0)  # Используем ddof=0 как в примере
-        
-        # Коэффициент Жуйана
-        if mu == 0:
+        measures = self.engine.measures
+        # Слово должно встречаться хотя бы в двух сегментах
+        if measures['n'][index] < 2:
             return None
         
-        n = n_segments_with_word
-        D = 100 * (1 - (sigma / (mu * np.sqrt(n - 1))))
-        
-        return {
-            'D': D,
-            'mu': mu,
-            'sigma': sigma,
-            'n': n,
-            'frequencies': frequencies
-        }
+        result = {name: measures[name][index] for name in DISPERSION_MEASURES}
+        result.update({
+            'mu': measures['mu'][index],
+            'sigma': measures['sigma'][index],
+            'n': int(measures['n'][index]),
+            'frequencies': self.engine.column(index)
+        })
+        return result
+    
+    def iter_results(self, total_words):
+        """Результаты по словам в порядке убывания частоты (генератор)
+
+        Слова, встречающиеся менее чем в двух сегментах, пропускаются
+        и не получают ранга.
+        """
+        # Все меры уже посчитаны для всего словаря; здесь только выборка
+        measures = {name: values.tolist() for name, values in self.engine.measures.items()}
+        
+        rank = 0
+        for word, total_count in self.context.sorted_words:
+            index = self.word_index.get(word)
+            if index is None or measures['n'][index] < 2:
+                continue
+            
+            rank += 1
+            item = {
+                'rank': rank,
+                'word': word,
+                'total_count': total_count,
+                # Относительная частота (на миллион слов)
+                'relative_freq': (total_count / total_words) * 1_000_000,
+                'mu': measures['mu'][index],
+                'sigma': measures['sigma'][index],
+                'n_segments': measures['n'][index]
+            }
+            item.update({name: measures[name][index] for name in DISPERSION_MEASURES})
+            yield item
     
     def analyze_top_words(self, top_n=TOP_WORDS_JUYAN):
         """Анализ топ-N слов по коэффициенту Жуйана"""
-        # Загружаем частотный словарь для получения списка слов
-        dict_path = FREQ_DICT_DIR / f"{self.language}_dictionary.json"
-        with open(dict_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        word_counts = data['word_counts']
-        
         # Разбиваем корпус на сегменты
         total_words, num_segments = self.split_into_segments()
         
         print(f"\nРасчет коэффициентов Жуйана...")
         
-        # Рассчитываем D для всех слов
-        results = []
-        for word, total_count in tqdm(word_counts.items(), desc="Обработка слов"):
-            juyan_data = self.calculate_juyan(word)
+        results = list(islice(self.iter_results(total_words), top_n))
+        return results, total_words, num_segments
+    
+    def save_table(self, results, total_words, num_segments, path=None, fmt='xlsx'):
+        """Потоковое сохранение таблицы результатов (results может быть генератором)"""
+        path = path or TABLES_DIR / f"juyan_{self.language}"
+        header = ['Ранг', 'Слово', 'Частота', 'Отн.частота', 'μ', 'σ', 'n'] + DISPERSION_MEASURES
+        
+        with TableWriter(path, header, 'Коэффициент Жуйана', fmt) as writer:
+            for item in tqdm(results, desc="Запись таблицы"):
+                writer.write_row([
+                    item['rank'], item['word'], item['total_count'],
+                    round(item['relative_freq'], 2), round(item['mu'], 2),
+                    round(item['sigma'], 2), item['n_segments']
+                ] + [round(item[name], 4) if name != 'D' else round(item[name], 2)
+                     for name in DISPERSION_MEASURES])
             
-            if juyan_data:
-                # Относительная частота (на миллион слов)
-                relative_freq = (total_count / total_words) * 1_000_000
-                
-                results.append({
-                    'word': word,
-                    'total_count': total_count,
-                    'relative_freq': relative_freq,
-                    'D': juyan_data['D'],
-                    'mu': juyan_data['mu'],
-                    'sigma': juyan_data['sigma'],
-                    'n_segments': juyan_data['n']
-                })
-        
-        # Сортируем по частоте
-        results.sort(key=lambda x: x['total_count'], reverse=True)
-        
-        # Добавляем ранг
-        for i, item in enumerate(results, 1):
-            item['rank'] = i
-        
-        return results[:top_n], total_words, num_segments
+            # Добавляем информацию о корпусе
+            writer.add_sheet('Информация', ['Параметр', 'Значение'], [
+                ['Язык', LANGUAGES[self.language]],
+                ['Всего слов в корпусе', f"{total_words:,}"],
+                ['Сегменты', 'по файлам' if self.segmentation == 'files' else 'равные'],
+                ['Количество сегментов', num_segments],
+                ['Размер сегмента', f"~{total_words // num_segments:,}"],
+                ['Проанализировано слов', writer.rows_written]
+            ])
+        
+        print(f"Таблица сохранена: {writer.path}")
+        return writer.path
     
     def save_to_excel(self, results, total_words, num_segments):
         """Сохранение результатов в Excel"""
-        df = pd.DataFrame(results)
-        
-        # Форматируем колонки
-        df = df[['rank', 'word', 'total_count', 'relative_freq', 'mu', 'sigma', 'n_segments', 'D']]
-        df.columns = ['Ранг', 'Слово', 'Частота', 'Отн.частота', 'μ', 'σ', 'n', 'D']
-        
-        # Округляем числа
-        df['Отн.частота'] = df['Отн.частота'].round(2)
-        df['μ'] = df['μ'].round(2)
-        df['σ'] = df['σ'].round(2)
-        df['D'] = df['D'].round(2)
-        
-        excel_path = TABLES_DIR / f"juyan_{self.language}.xlsx"
-        
-        with pd.ExcelWriter(excel_path, engine='openpyxl') as writer:
-            df.to_excel(writer, sheet_name='Коэффициент Жуйана', index=False)
-            
-            # Добавляем информацию о корпусе
-            info_df = pd.DataFrame({
-                'Параметр': [
-                    'Язык',
-                    'Всего слов в корпусе',
-                    'Количество сегментов',
-                    'Размер сегмента',
-                    'Проанализировано слов'
-                ],
-                'Значение': [
-                    LANGUAGES[self.language],
-                    f"{total_words:,}",
-                    num_segments,
-                    f"~{total_words // num_segments:,}",
-                    len(results)
-                ]
-            })
-            info_df.to_excel(writer, sheet_name='Информация', index=False)
-        
-        print(f"Таблица сохранена: {excel_path}")
-        return excel_path
+        return self.save_table(results, total_words, num_segments)
     
     def generate_report(self, results, total_words, num_segments):
         """Генерация текстового отчета"""
@@ -219,39 +182,198 @@ class JuyanAnalyzer:
         report.append(f"Размер сегмента: ~{total_words // num_segments:,} слов")
         report.append(f"Проанализировано топ слов: {len(results)}\n")
         
-        report.append("Формула: D = 100 × (1 - σ / (μ × √(n-1)))\n")
+        if self.segmentation == 'files':
+            report.append("Сегменты: по одному на файл (частоты приведены к среднему размеру сегмента)")
         
-        report.append(f"{'Ранг':>5} {'Слово':>15} {'Частота':>10} {'Отн.частота':>12} {'μ':>8} {'σ':>8} {'n':>3} {'D':>8}")
-        report.append("-" * 75)
+        report.append("Формула: D = 100 × (1 - σ / (μ × √(n-1)))")
+        report.append("DP (Грис) = 0.5 × Σ|vᵢ/f - sᵢ|, D2 (Кэрролл) = H / log k, "
+                      "S (Розенгрен) = (Σ√(sᵢvᵢ))² / f, AF = S × f\n")
+        
+        report.append(f"{'Ранг':>5} {'Слово':>15} {'Частота':>10} {'Отн.частота':>12} {'μ':>8} {'σ':>8} {'n':>3} "
+                      f"{'D':>8} {'DP':>7} {'D2':>7} {'S':>7} {'AF':>10}")
+        report.append("-" * 109)
         
         for item in results[:20]:  # Показываем первые 20
             report.append(
                 f"{item['rank']:>5} {item['word']:>15} {item['total_count']:>10} "
                 f"{item['relative_freq']:>12.2f} {item['mu']:>8.2f} {item['sigma']:>8.2f} "
-                f"{item['n_segments']:>3} {item['D']:>8.2f}"
+                f"{item['n_segments']:>3} {item['D']:>8.2f} {item['DP']:>7.4f} {item['D2']:>7.4f} "
+                f"{item['S']:>7.4f} {item['AF']:>10.1f}"
             )
         
         return "\n".join(report)
     
-    def analyze(self):
-        """Полный анализ"""
-        print(f"\n--- Коэффициент Жуйана для {LANGUAGES[self.language]} ---")
+    def corpus_files(self):
+        """Текстовые файлы корпуса языка"""
+        return self.reader.corpus_files()
+    
+    def segment_size_sweep(self, sizes=JUYAN_SWEEP_SIZES, top_n=TOP_WORDS_JUYAN, chunk_size=JUYAN_SWEEP_CHUNK):
+        """Коэффициент D для топ-слов при разных размерах сегмента
+
+        Корпус один раз считается по блокам chunk_size слов; частоты сегментов
+        любого размера (кратного блоку) берутся из накопленных сумм по блокам.
+        """
+        codes, vocabulary, _ = self.encode_corpus()
+        total_words = len(codes)
+        
+        # Топ-слова словаря, встречающиеся в корпусе
+        index = {word: i for i, word in enumerate(vocabulary.tolist())}
+        words = [word for word in self.context.top_words(2 * top_n) if word in index][:top_n]
+        columns = np.full(len(vocabulary), -1, dtype=np.int64)
+        columns[[index[word] for word in words]] = np.arange(len(words))
+        
+        print(f"Подсчет частот по блокам из {chunk_size:,} слов...")
+        cumulative = chunk_counts(codes, columns, chunk_size)
+        
+        sizes = [size for size in sizes if size >= chunk_size]
+        sweep = sweep_dispersion(cumulative, total_words, chunk_size, sizes)
+        
+        return {
+            'words': words,
+            'total_words': total_words,
+            'chunk_size': chunk_size,
+            'segment_sizes': np.array(sizes),
+            'num_segments': np.array([item['num_segments'] for item in sweep]),
+            # D: слова × размеры сегмента
+            'D': np.column_stack([item['measures']['D'] for item in sweep]),
+            'DP': np.column_stack([item['measures']['DP'] for item in sweep])
+        }
+    
+    def save_sweep_table(self, sweep, path, fmt='xlsx'):
+        """Таблица D (слова × размеры сегмента)"""
+        header = ['Слово'] + [f"D ({size:,})" for size in sweep['segment_sizes']]
         
-        results, total_words, num_segments = self.analyze_top_words()
+        with TableWriter(path, header, 'Размер сегмента', fmt) as writer:
+            for word, values in zip(sweep['words'], sweep['D']):
+                writer.write_row([word] + [None if np.isnan(d) else round(d, 2) for d in values])
+            
+            writer.add_sheet('Сегменты', ['Размер сегмента', 'Количество сегментов'],
+                             zip(sweep['segment_sizes'].tolist(), sweep['num_segments'].tolist()))
         
-        # Сохраняем в Excel
-        self.save_to_excel(results, total_words, num_segments)
+        print(f"Таблица сохранена: {writer.path}")
+        return writer.path
+    
+    def plot_sweep(self, sweep, save_path=None, dpi=PLOT_DPI):
+        """График D от размера сегмента для топ-слов"""
+        plt.style.use(PLOT_STYLE)
+        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
+        
+        sizes = sweep['segment_sizes']
+        
+        # График 1: отдельные слова
+        for word, values in zip(sweep['words'][:JUYAN_SWEEP_PLOT_WORDS], sweep['D']):
+            ax1.semilogx(sizes, values, 'o-', markersize=4, linewidth=1, label=word)
+        ax1.axvline(x=SEGMENT_SIZE, color='gray', linestyle=':', linewidth=1)
+        ax1.set_xlabel('Размер сегмента (слов)', fontsize=12)
+        ax1.set_ylabel('Коэффициент D', fontsize=12)
+        ax1.set_title(f'Коэффициент Жуйана и размер сегмента - {LANGUAGES[self.language]}', fontsize=14)
+        ax1.grid(True, alpha=0.3)
+        ax1.legend(fontsize=9, ncol=2)
+        
+        # График 2: распределение D по всем топ-словам
+        median = np.nanmedian(sweep['D'], axis=0)
+        low, high = np.nanpercentile(sweep['D'], [25, 75], axis=0)
+        ax2.semilogx(sizes, median, 'bo-', linewidth=2, label='Медиана')
+        ax2.fill_between(sizes, low, high, alpha=0.3, label='25-75%')
+        ax2.axvline(x=SEGMENT_SIZE, color='gray', linestyle=':', linewidth=1,
+                    label=f'SEGMENT_SIZE = {SEGMENT_SIZE:,}')
+        ax2.set_xlabel('Размер сегмента (слов)', fontsize=12)
+        ax2.set_ylabel('Коэффициент D', fontsize=12)
+        ax2.set_title(f'D для {len(sweep["words"])} самых частых слов', fontsize=14)
+        ax2.grid(True, alpha=0.3)
+        ax2.legend()
+        
+        plt.tight_layout()
+        
+        if save_path:
+            plt.savefig(save_path, dpi=dpi, bbox_inches='tight')
+            print(f"График сохранен: {save_path}")
+        
+        plt.close()
+    
+    def generate_sweep_report(self, sweep):
+        """Текстовый отчет по перебору размеров сегмента"""
+        report = []
+        report.append(f"=== КОЭФФИЦИЕНТ ЖУЙАНА: РАЗМЕР СЕГМЕНТА - {LANGUAGES[self.language].upper()} ===\n")
+        report.append(f"Всего слов в корпусе: {sweep['total_words']:,}")
+        report.append(f"Размер блока: {sweep['chunk_size']:,} слов")
+        report.append(f"Проанализировано топ слов: {len(sweep['words'])}\n")
+        
+        report.append(f"{'Размер':>10} {'Сегментов':>10} {'Медиана D':>10} {'Мин. D':>8} {'Макс. D':>8}")
+        report.append("-" * 50)
+        for i, size in enumerate(sweep['segment_sizes']):
+            values = sweep['D'][:, i]
+            report.append(f"{size:>10,} {sweep['num_segments'][i]:>10} {np.nanmedian(values):>10.2f} "
+                          f"{np.nanmin(values):>8.2f} {np.nanmax(values):>8.2f}")
+        
+        report.append("\nD по словам (первые 10):")
+        report.append(f"{'Слово':>15} " + " ".join(f"{size:>9,}" for size in sweep['segment_sizes']))
+        for word, values in zip(sweep['words'][:10], sweep['D']):
+            report.append(f"{word:>15} " + " ".join(f"{d:>9.2f}" for d in values))
+        
+        return "\n".join(report)
+    
+    def analyze_sweep(self, cache=None, renderer=None):
+        """Перебор размеров сегмента"""
+        table_path = TABLES_DIR / f"juyan_sweep_{self.language}.{self.table_format}"
+        plot_path = PLOTS_DIR / f"juyan_sweep_{self.language}.png"
+        if renderer:
+            plot_path = renderer.output_path(plot_path)
+        report_path = OUTPUT_DIR / f"juyan_sweep_report_{self.language}.txt"
+        
+        def compute():
+            sweep = self.segment_size_sweep()
+            self.save_sweep_table(sweep, table_path, self.table_format)
+            
+            # Сохраняем график
+            if renderer:
+                renderer.submit(self, 'plot_sweep', sweep, plot_path)
+            else:
+                self.plot_sweep(sweep, plot_path)
+            return sweep, self.generate_sweep_report(sweep)
+        
+        return run_cached(cache, 'juyan_sweep', self.language, [self.context.path] + self.corpus_files(),
+                          {'sizes': JUYAN_SWEEP_SIZES, 'chunk': JUYAN_SWEEP_CHUNK,
+                           'top_n': TOP_WORDS_JUYAN, 'table_format': self.table_format},
+                          [table_path, plot_path], report_path, compute)
+    
+    def analyze(self, cache=None, renderer=None):
+        """Полный анализ"""
+        print(f"\n--- Коэффициент Жуйана для {LANGUAGES[self.language]} ---")
         
-        # Сохраняем текстовый отчет
-        report = self.generate_report(results, total_words, num_segments)
-        report_path = OUTPUT_DIR / f"juyan_report_{self.language}.txt"
-        with open(report_path, 'w', encoding='utf-8') as f:
-            f.write(report)
+        if self.sweep:
+            return self.analyze_sweep(cache, renderer)
         
-        print(report)
-        print(f"\nОтчет сохранен: {report_path}")
+        segments_suffix = '_files' if self.segmentation == 'files' else ''
+        suffix = segments_suffix + ('_full' if self.export == 'full' else '')
+        table_path = TABLES_DIR / f"juyan_{self.language}{suffix}.{self.table_format}"
+        report_path = OUTPUT_DIR / f"juyan_report_{self.language}{segments_suffix}.txt"
         
-        return results
+        def compute():
+            if self.export == 'full':
+                # Вся таблица пишется по мере расчета; в памяти остаются только топ-N строк
+                total_words, num_segments = self.split_into_segments()
+                print(f"\nРасчет коэффициентов Жуйана...")
+                
+                results = []
+                
+                def rows():
+                    for item in self.iter_results(total_words):
+                        if len(results) < TOP_WORDS_JUYAN:
+                            results.append(item)
+                        yield item
+                
+                self.save_table(rows(), total_words, num_segments, table_path, self.table_format)
+            else:
+                results, total_words, num_segments = self.analyze_top_words()
+                self.save_table(results, total_words, num_segments, table_path, self.table_format)
+            return results, self.generate_report(results, total_words, num_segments)
+        
+        return run_cached(cache, 'juyan', self.language, [self.context.path] + self.corpus_files(),
+                          {'segment_size': SEGMENT_SIZE, 'top_n': TOP_WORDS_JUYAN,
+                           'export': self.export, 'table_format': self.table_format,
+                           'segmentation': self.segmentation, 'measures': DISPERSION_MEASURES},
+                          [table_path], report_path, compute)
 
 
 def analyze_all_languages():
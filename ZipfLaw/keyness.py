@@ -0,0 +1,302 @@
+"""Ключевые слова: сравнение двух частотных словарей или двух частей корпуса"""
+
+import fnmatch
+import json
+import re
+import numpy as np
+from pathlib import Path
+from scipy.special import xlogy
+from config import *
+from collocations import top_indices
+from corpus_context import get_context
+from corpus_stream import CorpusReader
+from result_cache import run_cached
+from table_writer import TableWriter
+
+# Меры ключевости: ключ → (заголовок, описание)
+KEYNESS_MEASURES = {
+    'LL': ('Log-likelihood', 'G² = 2 × Σ O·ln(O/E) по таблице 2×2 (слово / остальные слова × корпус A / B)'),
+    'chi2': ('Chi-squared', 'χ² = N·(ad - bc)² / ((a+b)(c+d)(a+c)(b+d)) по той же таблице'),
+    '%DIFF': ('%DIFF', '100 × (nf_A - nf_B) / nf_B, nf - частота на миллион слов'),
+    'log_ratio': ('Log Ratio', 'log₂(nf_A / nf_B), нулевая частота заменяется на 0.5')
+}
+
+
+def align_counts(counts_a, counts_b):
+    """Частоты двух словарей на объединении их слов: (слова, частоты A, частоты B)"""
+    words = list(counts_a)
+    words.extend(word for word in counts_b if word not in counts_a)
+    a = np.fromiter((counts_a.get(word, 0) for word in words), dtype=np.int64, count=len(words))
+    b = np.fromiter((counts_b.get(word, 0) for word in words), dtype=np.int64, count=len(words))
+    return np.array(words, dtype=object), a, b
+
+
+def keyness_scores(a, b, total_a=None, total_b=None):
+    """Меры ключевости для всех слов сразу
+
+    a и b - частоты слов в корпусах A и B на общем словаре, total_a и total_b -
+    размеры корпусов (по умолчанию суммы частот). LL и χ² положительны для слов,
+    чаще встречающихся в A, и отрицательны для слов, чаще встречающихся в B.
+    """
+    a = a.astype(np.float64)
+    b = b.astype(np.float64)
+    n_a = float(a.sum() if total_a is None else total_a)
+    n_b = float(b.sum() if total_b is None else total_b)
+    n = n_a + n_b
+    word_total = a + b
+    expected_a = n_a * word_total / n
+    expected_b = n_b * word_total / n
+
+    # Остальные слова корпусов: c = N_A - a, d = N_B - b
+    c, d = n_a - a, n_b - b
+    per_million_a = a / n_a * 1e6
+    per_million_b = b / n_b * 1e6
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_likelihood = 2 * (xlogy(a, a / expected_a) + xlogy(b, b / expected_b))
+        chi_squared = n * (a * d - b * c) ** 2 / (word_total * (c + d) * (a + c) * (b + d))
+        percent_diff = 100 * (per_million_a - per_million_b) / per_million_b
+        log_ratio = np.log2(np.where(a > 0, a, 0.5) / n_a) - np.log2(np.where(b > 0, b, 0.5) / n_b)
+
+    # Направление: слова, относительно более частые в B, отмечаются знаком
+    direction = np.where(a < expected_a, -1.0, 1.0)
+    return {
+        'expected_a': expected_a,
+        'expected_b': expected_b,
+        'LL': direction * log_likelihood,
+        'chi2': direction * np.nan_to_num(chi_squared),
+        '%DIFF': percent_diff,
+        'log_ratio': log_ratio
+    }
+
+
+def file_label(files):
+    """Короткое имя набора файлов для имен выходных файлов"""
+    label = Path(files[0]).stem
+    return label if len(files) == 1 else f"{label}+{len(files) - 1}"
+
+
+class KeynessAnalyzer:
+    """Анализ ключевых слов: какие слова характерны для корпуса A по сравнению с B
+
+    Источники сравнения:
+    - dictionaries: один или два JSON-словаря (один - сравнивается со словарем
+      языка, два - друг с другом);
+    - files: файлы из data/<язык> (имена или шаблоны) - корпус A;
+      reference_files - корпус B (по умолчанию - остальные файлы языка).
+    """
+
+    def __init__(self, language, context=None, dictionaries=None, files=None, reference_files=None,
+                 rank_by='LL', table_format='xlsx'):
+        self.language = language
+        self.context = context or get_context(language)
+        self.dictionaries = [Path(path) for path in dictionaries or []]
+        self.files = files or []
+        self.reference_files = reference_files or []
+        if rank_by not in KEYNESS_MEASURES:
+            raise ValueError(f"Неизвестная мера ключевости: {rank_by}")
+        self.rank_by = rank_by
+        self.table_format = table_format
+        self.reader = CorpusReader(language)
+
+    def select_files(self, patterns):
+        """Файлы корпуса языка по именам (с .txt или без) или шаблонам fnmatch"""
+        selected = []
+        for path in self.reader.corpus_files():
+            if any(fnmatch.fnmatch(path.name, pattern) or fnmatch.fnmatch(path.stem, pattern)
+                   for pattern in patterns):
+                selected.append(path)
+        return selected
+
+    def sources(self):
+        """Входные данные сравнения: (описание A, описание B, входные файлы, способ) или None"""
+        if self.dictionaries:
+            if len(self.dictionaries) > 2:
+                print(f"Нужно не больше двух словарей, указано: {len(self.dictionaries)}")
+                return None
+            paths = self.dictionaries if len(self.dictionaries) == 2 else [self.context.path] + self.dictionaries
+            paths = [path if path.exists() else FREQ_DICT_DIR / path for path in paths]
+            missing = [str(path) for path in paths if not path.exists()]
+            if missing:
+                print(f"Словари не найдены: {', '.join(missing)}")
+                return None
+            names = [path.stem for path in paths]
+            if names[0] == names[1]:
+                # Словари одного языка из разных каталогов различаются по каталогу
+                names = [f"{path.parent.name}_{path.stem}" for path in paths]
+            return names[0], names[1], paths, 'dictionaries'
+
+        if self.files:
+            files_a = self.select_files(self.files)
+            if self.reference_files:
+                files_b = self.select_files(self.reference_files)
+            else:
+                files_b = [path for path in self.reader.corpus_files() if path not in files_a]
+            if not files_a or not files_b:
+                print(f"Не найдены файлы корпуса для сравнения в {DATA_DIR / self.language}")
+                return None
+            overlap = set(files_a) & set(files_b)
+            if overlap:
+                print(f"Файлы входят в оба корпуса: {', '.join(path.name for path in sorted(overlap))}")
+                return None
+            name_b = file_label(files_b) if self.reference_files else 'rest'
+            return file_label(files_a), name_b, [files_a, files_b], 'files'
+
+        print("Не заданы корпуса для сравнения: --keyness-dictionaries или --keyness-files")
+        return None
+
+    def load_dictionary(self, path):
+        """Частоты слов JSON-словаря FrequencyDictionary"""
+        if Path(path) == self.context.path:
+            return self.context.word_counts
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)['word_counts']
+
+    def count_vectors(self, inputs, mode):
+        """Общий словарь и частоты A и B на нем
+
+        Для частей корпуса оба набора файлов кодируются за одно чтение общим
+        словарем кодов, частоты - bincount по кодам каждой части.
+        """
+        if mode == 'dictionaries':
+            return align_counts(self.load_dictionary(inputs[0]), self.load_dictionary(inputs[1]))
+
+        files_a, files_b = inputs
+        codes, vocabulary, file_lengths = self.reader.encode(files_a + files_b)
+        split = int(file_lengths[:len(files_a)].sum())
+        a = np.bincount(codes[:split], minlength=len(vocabulary))
+        b = np.bincount(codes[split:], minlength=len(vocabulary))
+        return vocabulary, a, b
+
+    def calculate_keyness(self, inputs, mode, top_n=KEYNESS_TOP, min_count=KEYNESS_MIN_COUNT,
+                          min_ll=KEYNESS_MIN_LL):
+        """Меры ключевости для всех слов и ранжированные списки ключевых слов A и B
+
+        В списки попадают слова с общей частотой не ниже min_count и |LL| не ниже
+        min_ll (значимые различия); внутри списка слова упорядочены по мере rank_by.
+        """
+        words, a, b = self.count_vectors(inputs, mode)
+        scores = keyness_scores(a, b)
+
+        eligible = ((a + b) >= min_count) & (np.abs(scores['LL']) >= min_ll)
+        sides = {'A': np.flatnonzero(eligible & (scores['LL'] > 0)),
+                 'B': np.flatnonzero(eligible & (scores['LL'] < 0))}
+
+        def ranked(indices, sign):
+            ranking = scores[self.rank_by][indices] * sign
+            # Бесконечный %DIFF (слова нет в B) - выше всех конечных значений
+            ranking = np.nan_to_num(ranking, nan=-np.inf, posinf=np.finfo(np.float64).max)
+            return indices[top_indices(ranking, top_n)]
+
+        def rows(indices):
+            return [{
+                'word': words[i],
+                'count_a': int(a[i]),
+                'count_b': int(b[i]),
+                'LL': float(scores['LL'][i]),
+                'chi2': float(scores['chi2'][i]),
+                '%DIFF': float(scores['%DIFF'][i]),
+                'log_ratio': float(scores['log_ratio'][i])
+            } for i in indices.tolist()]
+
+        return {
+            'rank_by': self.rank_by,
+            'min_count': min_count,
+            'min_ll': min_ll,
+            'total_a': int(a.sum()),
+            'total_b': int(b.sum()),
+            'unique_a': int(np.count_nonzero(a)),
+            'unique_b': int(np.count_nonzero(b)),
+            'union_words': len(words),
+            'key_a': len(sides['A']),
+            'key_b': len(sides['B']),
+            'top': {'A': rows(ranked(sides['A'], 1)), 'B': rows(ranked(sides['B'], -1))}
+        }
+
+    def save_table(self, results, path, names, fmt='xlsx'):
+        """Таблица ключевых слов: лист для корпуса A и лист для корпуса B"""
+        header = ['Ранг', 'Слово', 'Частота A', 'Частота B'] + \
+                 [title for title, _ in KEYNESS_MEASURES.values()]
+
+        def table_rows(items):
+            for rank, item in enumerate(items, 1):
+                yield [rank, item['word'], item['count_a'], item['count_b']] + \
+                      [round(item[measure], 3) if np.isfinite(item[measure]) else str(item[measure])
+                       for measure in KEYNESS_MEASURES]
+
+        with TableWriter(path, header, 'Ключевые A', fmt) as writer:
+            writer.write_rows(table_rows(results['top']['A']))
+            writer.add_sheet('Ключевые B', header, table_rows(results['top']['B']))
+            writer.add_sheet('Информация', ['Параметр', 'Значение'], [
+                ['Язык', LANGUAGES[self.language]],
+                ['Корпус A', names[0]],
+                ['Корпус B', names[1]],
+                ['Слов в A', f"{results['total_a']:,}"],
+                ['Слов в B', f"{results['total_b']:,}"],
+                ['Общий словарь', f"{results['union_words']:,}"],
+                ['Минимальная частота слова', results['min_count']],
+                ['Минимальный |LL|', results['min_ll']],
+                ['Порядок', KEYNESS_MEASURES[results['rank_by']][0]]
+            ])
+
+        print(f"Таблица сохранена: {writer.path}")
+        return writer.path
+
+    def generate_report(self, results, names, top_n=KEYNESS_REPORT_TOP):
+        """Генерация текстового отчета (top_n ключевых слов каждого корпуса)"""
+        report = []
+        report.append(f"=== КЛЮЧЕВЫЕ СЛОВА - {LANGUAGES[self.language].upper()} ===\n")
+        report.append(f"Корпус A: {names[0]} ({results['total_a']:,} слов, {results['unique_a']:,} уникальных)")
+        report.append(f"Корпус B: {names[1]} ({results['total_b']:,} слов, {results['unique_b']:,} уникальных)")
+        report.append(f"Общий словарь: {results['union_words']:,} слов")
+        report.append(f"Ключевых слов (частота >= {results['min_count']}, |LL| >= {results['min_ll']}): "
+                      f"A - {results['key_a']:,}, B - {results['key_b']:,}")
+
+        report.append("")
+        for title, formula in KEYNESS_MEASURES.values():
+            report.append(f"{title}: {formula}")
+
+        rank_title = KEYNESS_MEASURES[results['rank_by']][0]
+        for side in ('A', 'B'):
+            top = results['top'][side][:top_n]
+            report.append(f"\nТоп-{len(top)} ключевых слов корпуса {side} по {rank_title}:")
+            report.append(f"{'Ранг':>5} {'Слово':>20} {'A':>8} {'B':>8} {'LL':>10} {'χ²':>10} "
+                          f"{'%DIFF':>10} {'LogR':>7}")
+            report.append("-" * 84)
+            for rank, item in enumerate(top, 1):
+                report.append(f"{rank:>5} {item['word']:>20} {item['count_a']:>8} {item['count_b']:>8} "
+                              f"{item['LL']:>10.1f} {item['chi2']:>10.1f} {item['%DIFF']:>10.1f} "
+                              f"{item['log_ratio']:>7.2f}")
+
+        return "\n".join(report)
+
+    def analyze(self, cache=None, renderer=None):
+        """Полный анализ"""
+        print(f"\n--- Ключевые слова для {LANGUAGES[self.language]} ---")
+
+        sources = self.sources()
+        if sources is None:
+            return None
+        name_a, name_b, inputs, mode = sources
+
+        label = re.sub(r'[^\w+\-]', '_', f"{name_a}_vs_{name_b}")
+        suffix = f"_{self.rank_by}" if self.rank_by != 'LL' else ''
+        table_path = TABLES_DIR / f"keyness_{self.language}_{label}{suffix}.{self.table_format}"
+        report_path = OUTPUT_DIR / f"keyness_report_{self.language}_{label}{suffix}.txt"
+        names = [name_a, name_b]
+        if mode == 'files':
+            names = [', '.join(path.name for path in files) for files in inputs]
+
+        def compute():
+            results = self.calculate_keyness(inputs, mode)
+            self.save_table(results, table_path, names, self.table_format)
+            return results, self.generate_report(results, names)
+
+        # В ключе кэша отмечено, какие файлы относятся к корпусу A
+        files_a = inputs[:1] if mode == 'dictionaries' else inputs[0]
+        files = inputs if mode == 'dictionaries' else inputs[0] + inputs[1]
+        return run_cached(cache, 'keyness', self.language, files,
+                          {'mode': mode, 'a': [str(path) for path in files_a],
+                           'rank_by': self.rank_by, 'min_count': KEYNESS_MIN_COUNT,
+                           'min_ll': KEYNESS_MIN_LL, 'top_n': KEYNESS_TOP,
+                           'table_format': self.table_format, 'measures': list(KEYNESS_MEASURES)},
+                          [table_path], report_path, compute)
@@ -4,32 +4,84 @@ import argparse
 from zipf_law import ZipfAnalyzer
 from empirical_zipf import EmpiricalZipfAnalyzer
 from juyan_coefficient import JuyanAnalyzer
-from config import LANGUAGES
+from heaps_law import HeapsAnalyzer
+from collocations import CollocationAnalyzer
+from keyness import KeynessAnalyzer, KEYNESS_MEASURES
+from config import LANGUAGES, CACHE_MAX_AGE_DAYS, SEGMENT_SIZE, PLOT_FORMAT, PREVIEW_DPI, COLLOCATION_WINDOW
+from corpus_context import get_context
+from result_cache import ResultCache
+from scheduler import TaskScheduler
+from rendering import Renderer
+from table_writer import TABLE_FORMATS
 
 
-def analyze_language(language, tasks=None):
-    """Анализ для одного языка"""
-    if tasks is None:
-        tasks = [1, 2, 3]
-    
+# Задания: номер → (заголовок, класс анализатора)
+TASKS = {
+    1: ("ЗАДАНИЕ 1: ЗАКОН ЦИПФА", ZipfAnalyzer),
+    2: ("ЗАДАНИЕ 2: ЭМПИРИЧЕСКИЙ ЗАКОН ЦИПФА", EmpiricalZipfAnalyzer),
+    3: ("ЗАДАНИЕ 3: КОЭФФИЦИЕНТ ЖУЙАНА", JuyanAnalyzer),
+    4: ("ЗАДАНИЕ 4: ЗАКОН ХИПСА", HeapsAnalyzer),
+    5: ("ЗАДАНИЕ 5: СЛОВОСОЧЕТАНИЯ", CollocationAnalyzer),
+    6: ("ЗАДАНИЕ 6: КЛЮЧЕВЫЕ СЛОВА", KeynessAnalyzer)
+}
+
+
+def load_language(language):
+    """Загрузка словаря языка (один раз для всех заданий)"""
     print(f"\n{'='*60}")
     print(f"{LANGUAGES[language].upper()}")
     print(f"{'='*60}")
     
-    if 1 in tasks:
-        print("\nЗАДАНИЕ 1: ЗАКОН ЦИПФА")
-        zipf = ZipfAnalyzer(language)
-        zipf.analyze()
-    
-    if 2 in tasks:
-        print("\nЗАДАНИЕ 2: ЭМПИРИЧЕСКИЙ ЗАКОН ЦИПФА")
-        empirical = EmpiricalZipfAnalyzer(language)
-        empirical.analyze()
+    return get_context(language).load()
+
+
+def run_task(task, language, cache, options, renderer, context):
+    """Выполнение одного задания для языка; возвращает графики для отрисовки"""
+    title, analyzer_class = TASKS[task]
+    print(f"\n{title}")
+    analyzer = analyzer_class(language, context, **options.get(task, {}))
+    analyzer.analyze(cache, renderer)
+    return renderer.take_pending()
+
+
+def render_plots(renderer, jobs):
+    """Отрисовка графиков задания"""
+    renderer.render(jobs)
+
+
+def build_schedule(languages, tasks, cache=None, workers=None, options=None, renderer=None):
+    """Граф заданий: загрузка словаря → задания для языка → отрисовка графиков
+
+    options: номер задания → дополнительные параметры анализатора
+    """
+    options = options or {}
+    renderer = renderer or Renderer()
+    scheduler = TaskScheduler(workers)
+    for language in languages:
+        load = scheduler.add(f"{language}: словарь", load_language, language, local=True)
+        for task in sorted(tasks):
+            analysis = scheduler.add(f"{language}: задание {task}", run_task, task, language, cache,
+                                     options, renderer, deps=[load])
+            scheduler.add(f"{language}: графики {task}", render_plots, renderer, deps=[analysis])
+    return scheduler
+
+
+def analyze_language(language, tasks=None, cache=None, options=None, renderer=None):
+    """Анализ для одного языка"""
+    if tasks is None:
+        tasks = [1, 2, 3]
     
-    if 3 in tasks:
-        print("\nЗАДАНИЕ 3: КОЭФФИЦИЕНТ ЖУЙАНА")
-        juyan = JuyanAnalyzer(language)
-        juyan.analyze()
+    scheduler = build_schedule([language], tasks, cache, workers=1, options=options, renderer=renderer)
+    scheduler.run()
+    return not scheduler.failed()
+
+
+def positive_int(value):
+    """Целое число не меньше 1 (тип аргумента командной строки)"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"должно быть не меньше 1: {value}")
+    return number
 
 
 def main():
@@ -49,23 +101,164 @@ def main():
         '--tasks',
         nargs='+',
         type=int,
-        choices=[1, 2, 3],
+        choices=list(TASKS.keys()),
         default=[1, 2, 3],
         help='Номера заданий для выполнения'
     )
     
+    parser.add_argument(
+        '--empirical-mode',
+        choices=['function', 'full'],
+        default='function',
+        help='Задание 2: служебные слова (function) или весь словарь (full)'
+    )
+    
+    parser.add_argument(
+        '--token-weighted',
+        action='store_true',
+        help='Задание 2 (full): корреляция по словоупотреблениям, а не по словам'
+    )
+    
+    parser.add_argument(
+        '--juyan-export',
+        choices=['top', 'full'],
+        default='top',
+        help='Задание 3: таблица для топ-слов (top) или для всего словаря (full)'
+    )
+    
+    parser.add_argument(
+        '--juyan-segments',
+        choices=['fixed', 'files'],
+        default='fixed',
+        help=f'Задание 3: сегменты по {SEGMENT_SIZE:,} слов (fixed) или по одному на файл (files)'
+    )
+    
+    parser.add_argument(
+        '--juyan-sweep',
+        action='store_true',
+        help='Задание 3: коэффициент D для разных размеров сегмента (одно чтение корпуса)'
+    )
+    
+    parser.add_argument(
+        '--heaps-approximate',
+        action='store_true',
+        help='Задание 4: оценка размера словаря через HyperLogLog (ограниченная память)'
+    )
+    
+    parser.add_argument(
+        '--collocation-window',
+        type=positive_int,
+        default=COLLOCATION_WINDOW,
+        help=f'Задание 5: максимальное расстояние между словами пары (по умолчанию: {COLLOCATION_WINDOW})'
+    )
+    
+    parser.add_argument(
+        '--keyness-dictionaries',
+        nargs='+',
+        metavar='PATH',
+        help='Задание 6: словарь B (сравнивается со словарем языка) или словари A и B'
+    )
+    
+    parser.add_argument(
+        '--keyness-files',
+        nargs='+',
+        metavar='FILE',
+        help='Задание 6: файлы корпуса A из data/<язык> (имена или шаблоны, например "Die_*")'
+    )
+    
+    parser.add_argument(
+        '--keyness-reference-files',
+        nargs='+',
+        metavar='FILE',
+        help='Задание 6: файлы корпуса B (по умолчанию: остальные файлы языка)'
+    )
+    
+    parser.add_argument(
+        '--keyness-rank',
+        choices=list(KEYNESS_MEASURES),
+        default='LL',
+        help='Задание 6: мера для упорядочения ключевых слов (по умолчанию: LL)'
+    )
+    
+    parser.add_argument(
+        '--table-format',
+        choices=list(TABLE_FORMATS),
+        default='xlsx',
+        help='Формат таблиц (по умолчанию: xlsx)'
+    )
+    
+    parser.add_argument(
+        '--plot-format',
+        choices=['png', 'svg'],
+        default=PLOT_FORMAT,
+        help=f'Формат графиков (по умолчанию: {PLOT_FORMAT})'
+    )
+    
+    parser.add_argument(
+        '--preview',
+        action='store_true',
+        help=f'Быстрый предпросмотр графиков ({PREVIEW_DPI} dpi, файлы *_preview)'
+    )
+    
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Пересчитать результаты, не используя кэш'
+    )
+    
+    parser.add_argument(
+        '--prune-cache',
+        nargs='?',
+        type=int,
+        const=CACHE_MAX_AGE_DAYS,
+        metavar='DAYS',
+        help=f'Удалить записи кэша старше DAYS дней (по умолчанию: {CACHE_MAX_AGE_DAYS}, 0 - очистить весь кэш)'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Количество процессов (по умолчанию: число ядер, 1 - последовательно)'
+    )
+    
     args = parser.parse_args()
+    if args.keyness_dictionaries and len(args.keyness_dictionaries) > 2:
+        parser.error("--keyness-dictionaries: нужно не больше двух словарей (B или A и B)")
+    
+    cache = ResultCache(enabled=not args.no_cache)
+    if args.prune_cache is not None:
+        removed = cache.prune(args.prune_cache)
+        print(f"Удалено записей кэша: {removed}")
     
     print("="*60)
     print("СТАТИСТИЧЕСКИЙ АНАЛИЗ ЧАСТОТНЫХ СЛОВАРЕЙ")
     print("="*60)
     
     try:
-        if args.language == 'all':
-            for lang in LANGUAGES.keys():
-                analyze_language(lang, args.tasks)
-        else:
-            analyze_language(args.language, args.tasks)
+        languages = list(LANGUAGES.keys()) if args.language == 'all' else [args.language]
+        options = {
+            2: {'full_vocabulary': args.empirical_mode == 'full', 'token_weighted': args.token_weighted},
+            3: {'export': args.juyan_export, 'table_format': args.table_format,
+                'segmentation': args.juyan_segments, 'sweep': args.juyan_sweep},
+            4: {'approximate': args.heaps_approximate},
+            5: {'window': args.collocation_window, 'table_format': args.table_format},
+            6: {'dictionaries': args.keyness_dictionaries, 'files': args.keyness_files,
+                'reference_files': args.keyness_reference_files, 'rank_by': args.keyness_rank,
+                'table_format': args.table_format}
+        }
+        renderer = Renderer(args.plot_format, args.preview)
+        scheduler = build_schedule(languages, args.tasks, cache, args.workers, options, renderer)
+        scheduler.run()
+        
+        print("\n" + "="*60)
+        print("ВРЕМЯ ВЫПОЛНЕНИЯ")
+        print("="*60)
+        print(scheduler.timings_report())
+        
+        failed = scheduler.failed()
+        if failed:
+            print(f"\nЗадачи с ошибками: {', '.join(failed)}")
         
         print("\n" + "="*60)
         print("ЗАВЕРШЕНО")
@@ -0,0 +1,88 @@
+"""Отрисовка графиков: фиксированный бэкенд, рабочие процессы, пропуск неизменных"""
+
+import hashlib
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import matplotlib
+from config import *
+
+# Неинтерактивный бэкенд фиксируется до импорта pyplot во всех модулях
+matplotlib.use(PLOT_BACKEND)
+import matplotlib.pyplot as plt  # noqa: E402
+
+
+def _render_job(job):
+    """Отрисовка одного графика (выполняется в рабочем процессе)"""
+    analyzer_class, language, method, results, path, dpi = job
+    analyzer = analyzer_class(language)
+    getattr(analyzer, method)(results, path, dpi=dpi)
+    return path
+
+
+class Renderer:
+    """Этап отрисовки графиков
+
+    Графики, входные данные которых не изменились с прошлого запуска
+    (по хэшу результатов и параметров отрисовки), не перерисовываются.
+    """
+
+    def __init__(self, fmt=PLOT_FORMAT, preview=False, workers=1):
+        self.fmt = fmt
+        self.preview = preview
+        self.dpi = PREVIEW_DPI if preview else PLOT_DPI
+        self.workers = workers
+        self.pending = []
+
+    def output_path(self, path):
+        """Путь к файлу графика с учетом формата и режима предпросмотра"""
+        path = Path(path)
+        stem = f"{path.stem}_preview" if self.preview else path.stem
+        return path.with_name(f"{stem}.{self.fmt}")
+
+    def _hash_path(self, path):
+        return path.parent / ".hashes" / f"{path.name}.sha256"
+
+    def _digest(self, job):
+        analyzer_class, language, method, results, path, dpi = job
+        digest = hashlib.sha256()
+        digest.update(f"{analyzer_class.__name__}.{method}:{language}:{dpi}".encode('utf-8'))
+        digest.update(pickle.dumps(results, protocol=pickle.HIGHEST_PROTOCOL))
+        return digest.hexdigest()
+
+    def submit(self, analyzer, method, results, path):
+        """Постановка графика в очередь; пропуск, если данные не изменились"""
+        path = Path(path)
+        job = (type(analyzer), analyzer.language, method, results, path, self.dpi)
+        digest = self._digest(job)
+
+        hash_path = self._hash_path(path)
+        if path.exists() and hash_path.exists() and hash_path.read_text() == digest:
+            print(f"График не изменился: {path}")
+            return path
+
+        self.pending.append((job, digest))
+        return path
+
+    def take_pending(self):
+        """Извлечение очереди графиков (для передачи отдельному этапу отрисовки)"""
+        jobs, self.pending = self.pending, []
+        return jobs
+
+    def render(self, jobs=None):
+        """Отрисовка графиков из очереди (или переданного списка)"""
+        if jobs is None:
+            jobs = self.take_pending()
+
+        if self.workers > 1 and len(jobs) > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                paths = list(executor.map(_render_job, [job for job, _ in jobs]))
+        else:
+            paths = [_render_job(job) for job, _ in jobs]
+
+        for path, (_, digest) in zip(paths, jobs):
+            hash_path = self._hash_path(path)
+            hash_path.parent.mkdir(exist_ok=True)
+            hash_path.write_text(digest)
+        return paths
@@ -0,0 +1,152 @@
+"""Кэш результатов анализа, адресуемый по содержимому входных данных"""
+
+import hashlib
+import json
+import os
+import pickle
+import time
+from pathlib import Path
+from config import *
+
+
+class ResultCache:
+    """Кэш вычисленных результатов заданий
+
+    Ключ записи - хэш содержимого входных файлов (словаря и корпуса)
+    и параметров задания. При совпадении ключа и наличии выходных файлов
+    повторные вычисления и отрисовка пропускаются.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, enabled=True):
+        self.cache_dir = Path(cache_dir)
+        self.enabled = enabled
+        self.manifest_path = self.cache_dir / "file_hashes.json"
+        self.file_hashes = self._load_manifest()
+
+    def _load_manifest(self):
+        """Загрузка сохраненных хэшей файлов"""
+        if not self.manifest_path.exists():
+            return {}
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self):
+        """Сохранение хэшей файлов (атомарно, кэш используют несколько процессов)"""
+        tmp_path = self.manifest_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.file_hashes, f, ensure_ascii=False, indent=2)
+        tmp_path.replace(self.manifest_path)
+
+    def file_hash(self, path):
+        """Хэш содержимого файла (пересчитывается только при изменении файла)"""
+        path = Path(path)
+        stat = path.stat()
+        signature = [stat.st_size, stat.st_mtime_ns]
+        known = self.file_hashes.get(str(path))
+        if known and known['signature'] == signature:
+            return known['sha256']
+
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+
+        self.file_hashes[str(path)] = {'signature': signature, 'sha256': digest.hexdigest()}
+        self._save_manifest()
+        return digest.hexdigest()
+
+    def make_key(self, task, language, inputs, params):
+        """Ключ записи по входным файлам и параметрам задания"""
+        digest = hashlib.sha256()
+        digest.update(f"{task}:{language}".encode('utf-8'))
+        for path in sorted(Path(p) for p in inputs):
+            digest.update(path.name.encode('utf-8'))
+            digest.update(self.file_hash(path).encode('ascii'))
+        digest.update(json.dumps(params, sort_keys=True, ensure_ascii=False).encode('utf-8'))
+        return digest.hexdigest()
+
+    def _entry_path(self, key):
+        return self.cache_dir / f"{key}.pkl"
+
+    def get(self, key, outputs=()):
+        """Получение записи; None, если записи нет или выходные файлы удалены"""
+        if not self.enabled:
+            return None
+
+        entry_path = self._entry_path(key)
+        if not entry_path.exists():
+            return None
+        if not all(Path(p).exists() for p in outputs):
+            return None
+
+        try:
+            with open(entry_path, 'rb') as f:
+                entry = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+        # Отмечаем использование записи для очистки по возрасту
+        entry_path.touch()
+        return entry
+
+    def put(self, key, results, report):
+        """Сохранение результатов и текста отчета"""
+        if not self.enabled:
+            return
+
+        entry = {'results': results, 'report': report, 'created': time.time()}
+        tmp_path = self._entry_path(key).with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_path.replace(self._entry_path(key))
+
+    def prune(self, max_age_days=CACHE_MAX_AGE_DAYS):
+        """Удаление записей, не использовавшихся max_age_days дней
+
+        При max_age_days=0 кэш очищается полностью.
+        """
+        threshold = time.time() - max_age_days * 24 * 3600
+        removed = 0
+        for entry_path in self.cache_dir.glob("*.pkl"):
+            if max_age_days == 0 or entry_path.stat().st_mtime < threshold:
+                entry_path.unlink()
+                removed += 1
+
+        # Хэши удаленных файлов больше не нужны
+        self.file_hashes = {path: info for path, info in self.file_hashes.items()
+                            if Path(path).exists()}
+        self._save_manifest()
+        return removed
+
+
+def run_cached(cache, task, language, inputs, params, outputs, report_path, compute):
+    """Результаты задания из кэша или вычисленные заново
+
+    Ключ записи строится по inputs и params (cache=None или выключенный
+    кэш - входные файлы не хэшируются). Запись используется, только если
+    существуют outputs и report_path. compute() считает результаты,
+    сохраняет выходные файлы (графики, таблицы) и возвращает
+    (results, report); отчет записывается в report_path и печатается.
+    """
+    key = None
+    if cache is not None and cache.enabled:
+        key = cache.make_key(task, language, inputs, params)
+        cached = cache.get(key, list(outputs) + [report_path])
+        if cached:
+            print(cached['report'])
+            print(f"\nРезультаты взяты из кэша: {report_path}")
+            return cached['results']
+
+    results, report = compute()
+    with open(report_path, 'w', encoding='utf-8') as f:
+        f.write(report)
+
+    if key is not None:
+        cache.put(key, results, report)
+
+    print(report)
+    print(f"\nОтчет сохранен: {report_path}")
+    return results
@@ -0,0 +1,156 @@
+"""Планировщик независимых заданий анализа (граф зависимостей + пул процессов)"""
+
+import contextlib
+import io
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+
+def _init_worker():
+    """Инициализация рабочего процесса"""
+    # Прогресс-бары (stderr) из нескольких процессов перемешиваются, отключаем их;
+    # ошибки задач перехватываются и выводятся главным процессом
+    sys.stderr = open(os.devnull, 'w')
+
+
+def _execute(func, args):
+    """Выполнение задачи с перехватом вывода и ошибок"""
+    buffer = io.StringIO()
+    start = time.perf_counter()
+    error = None
+    result = None
+
+    with contextlib.redirect_stdout(buffer):
+        try:
+            result = func(*args)
+        except Exception:
+            error = traceback.format_exc()
+
+    return {
+        'result': result,
+        'output': buffer.getvalue(),
+        'error': error,
+        'elapsed': time.perf_counter() - start
+    }
+
+
+class Task:
+    """Узел графа заданий"""
+
+    def __init__(self, name, func, args=(), deps=(), local=False):
+        self.name = name
+        self.func = func
+        self.args = tuple(args)
+        self.deps = tuple(deps)
+        # Локальные задачи выполняются в главном процессе
+        self.local = local
+        self.outcome = None
+
+
+class TaskScheduler:
+    """Выполнение графа заданий на пуле процессов
+
+    Результаты зависимостей передаются задаче последними аргументами.
+    Вывод задач печатается в порядке их добавления, ошибка одной задачи
+    не прерывает остальные (зависимые от нее задачи пропускаются).
+    """
+
+    def __init__(self, workers=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.tasks = {}
+
+    def add(self, name, func, *args, deps=(), local=False):
+        """Добавление задачи в граф"""
+        for dep in deps:
+            if dep not in self.tasks:
+                raise ValueError(f"Неизвестная зависимость {dep!r} для задачи {name!r}")
+        self.tasks[name] = Task(name, func, args, deps, local)
+        return name
+
+    def _task_args(self, task):
+        return task.args + tuple(self.tasks[dep].outcome['result'] for dep in task.deps)
+
+    def _skip(self, task):
+        """Пропуск задачи из-за ошибки в зависимости"""
+        failed = [dep for dep in task.deps if self.tasks[dep].outcome['error']]
+        task.outcome = {
+            'result': None,
+            'output': '',
+            'error': f"Пропущено: ошибка в зависимости {', '.join(map(str, failed))}\n",
+            'elapsed': 0.0,
+            'skipped': True
+        }
+
+    def run(self, echo=True):
+        """Выполнение всех задач; возвращает словарь имя → результат"""
+        pending = list(self.tasks.values())
+        order = list(self.tasks)
+        printed = 0
+        running = {}
+        executor = None
+        if self.workers > 1:
+            executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+
+        def flush():
+            # Печатаем готовый вывод, сохраняя порядок добавления задач
+            nonlocal printed
+            while printed < len(order) and self.tasks[order[printed]].outcome:
+                outcome = self.tasks[order[printed]].outcome
+                if echo:
+                    print(outcome['output'], end='')
+                    if outcome['error']:
+                        print(f"\nОШИБКА в задаче {order[printed]}:\n{outcome['error']}")
+                printed += 1
+
+        try:
+            while pending or running:
+                for task in list(pending):
+                    deps = [self.tasks[dep] for dep in task.deps]
+                    if any(dep.outcome is None for dep in deps):
+                        continue
+                    pending.remove(task)
+                    if any(dep.outcome['error'] for dep in deps):
+                        self._skip(task)
+                    elif task.local or executor is None:
+                        task.outcome = _execute(task.func, self._task_args(task))
+                    else:
+                        future = executor.submit(_execute, task.func, self._task_args(task))
+                        running[future] = task
+
+                flush()
+                if not running:
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = running.pop(future)
+                    try:
+                        task.outcome = future.result()
+                    except Exception:
+                        # Аварийное завершение рабочего процесса
+                        task.outcome = {'result': None, 'output': '',
+                                        'error': traceback.format_exc(), 'elapsed': 0.0}
+                flush()
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        return {name: task.outcome['result'] for name, task in self.tasks.items()}
+
+    def failed(self):
+        """Имена задач, завершившихся с ошибкой"""
+        return [name for name, task in self.tasks.items() if task.outcome and task.outcome['error']]
+
+    def timings_report(self):
+        """Таблица времени выполнения задач"""
+        lines = [f"{'Задача':<30} {'Статус':>8} {'Время, с':>10}", "-" * 50]
+        for name, task in self.tasks.items():
+            if task.outcome.get('skipped'):
+                status = 'пропуск'
+            else:
+                status = 'ошибка' if task.outcome['error'] else 'ok'
+            lines.append(f"{str(name):<30} {status:>8} {task.outcome['elapsed']:>10.2f}")
+        return "\n".join(lines)
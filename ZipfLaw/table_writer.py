@@ -0,0 +1,80 @@
+"""Потоковая запись таблиц: xlsx (write-only), CSV, TSV"""
+
+import csv
+from pathlib import Path
+from openpyxl import Workbook
+
+TABLE_FORMATS = ('xlsx', 'csv', 'tsv')
+
+
+class TableWriter:
+    """Запись таблицы построчно с постоянным расходом памяти
+
+    xlsx пишется в режиме write-only openpyxl: строки сразу уходят
+    во временный файл книги и не хранятся в памяти. Для CSV/TSV
+    дополнительные листы сохраняются отдельными файлами <имя>_<лист>.
+    """
+
+    def __init__(self, path, header, sheet_name='Таблица', fmt='xlsx'):
+        if fmt not in TABLE_FORMATS:
+            raise ValueError(f"Неподдерживаемый формат таблицы: {fmt}")
+        self.fmt = fmt
+        self.path = Path(path).with_suffix(f".{fmt}")
+        self.header = list(header)
+        self.sheet_name = sheet_name
+        self.rows_written = 0
+        self._workbook = None
+        self._sheet = None
+        self._file = None
+        self._csv = None
+
+    def __enter__(self):
+        if self.fmt == 'xlsx':
+            self._workbook = Workbook(write_only=True)
+            self._sheet = self._workbook.create_sheet(self.sheet_name)
+            self._sheet.append(self.header)
+        else:
+            self._file = open(self.path, 'w', encoding='utf-8', newline='')
+            self._csv = csv.writer(self._file, delimiter='\t' if self.fmt == 'tsv' else ',')
+            self._csv.writerow(self.header)
+        return self
+
+    def write_row(self, row):
+        """Запись одной строки"""
+        if self._sheet is not None:
+            self._sheet.append(list(row))
+        else:
+            self._csv.writerow(row)
+        self.rows_written += 1
+
+    def write_rows(self, rows):
+        """Запись строк из итератора"""
+        for row in rows:
+            self.write_row(row)
+
+    def add_sheet(self, name, header, rows):
+        """Дополнительный лист (для CSV/TSV - отдельный файл)"""
+        if self._workbook is not None:
+            sheet = self._workbook.create_sheet(name)
+            sheet.append(list(header))
+            for row in rows:
+                sheet.append(list(row))
+            return
+
+        sheet_path = self.path.with_name(f"{self.path.stem}_{name}{self.path.suffix}")
+        with open(sheet_path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f, delimiter='\t' if self.fmt == 'tsv' else ',')
+            writer.writerow(header)
+            writer.writerows(rows)
+
+    def close(self):
+        if self._workbook is not None:
+            self._workbook.save(self.path)
+            self._workbook = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
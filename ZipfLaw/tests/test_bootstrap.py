@@ -0,0 +1,22 @@
+"""Доверительные интервалы бутстрепа"""
+
+import math
+import warnings
+
+import numpy as np
+
+from bootstrap import confidence_interval
+
+
+def test_interval_ignores_non_finite_values():
+    values = np.array([1.0, 2.0, np.nan, 3.0, np.inf, 4.0, 5.0])
+    interval = confidence_interval(values, level=0.5)
+    assert interval['low'] == 2.0 and interval['high'] == 4.0
+    assert math.isclose(interval['std'], np.std([1, 2, 3, 4, 5], ddof=1))
+
+
+def test_all_nan_replicates_give_nan_interval():
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        interval = confidence_interval(np.full(100, np.nan))
+    assert math.isnan(interval['low']) and math.isnan(interval['high']) and math.isnan(interval['std'])
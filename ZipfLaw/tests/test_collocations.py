@@ -0,0 +1,34 @@
+"""Частоты пар в окне совпадают с прямым перебором"""
+
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from collocations import cooccurrence_counts
+
+
+def naive_counts(codes, file_lengths, window):
+    pairs = Counter()
+    start = 0
+    for length in file_lengths:
+        for i in range(start, start + length):
+            for j in range(i + 1, min(i + window, start + length - 1) + 1):
+                pairs[(codes[i], codes[j])] += 1
+        start += length
+    return pairs
+
+
+@pytest.mark.parametrize('window, chunk_size', [(1, 1000), (3, 7), (5, 2)])
+def test_counts_match_naive_window_loop(window, chunk_size):
+    rng = np.random.default_rng(window)
+    n_words = 6
+    file_lengths = [13, 1, 0, 25, 4]
+    codes = rng.integers(0, n_words, sum(file_lengths))
+
+    keys, counts, total_pairs = cooccurrence_counts(codes, file_lengths, n_words, window, chunk_size)
+    expected = naive_counts(codes.tolist(), file_lengths, window)
+
+    assert dict(zip(zip((keys // n_words).tolist(), (keys % n_words).tolist()), counts.tolist())) == expected
+    assert total_pairs == sum(expected.values())
+    assert list(keys) == sorted(keys)
@@ -0,0 +1,48 @@
+"""Меры распределенности на матрицах, посчитанных вручную"""
+
+import math
+
+import numpy as np
+import pytest
+
+from dispersion import DispersionEngine
+
+
+def test_equal_segments_match_hand_computed_values():
+    # Столбцы: равномерное слово, слово в одном сегменте, слово 1/3 в двух сегментах
+    matrix = np.array([[2, 4, 1],
+                       [2, 0, 3],
+                       [2, 0, 0],
+                       [2, 0, 0]])
+    measures = DispersionEngine(matrix).measures
+
+    assert list(measures['frequency']) == [8, 4, 4]
+    assert list(measures['n']) == [4, 1, 2]
+
+    # Равномерное слово
+    assert measures['D'][0] == pytest.approx(100)
+    assert measures['DP'][0] == pytest.approx(0)
+    assert measures['D2'][0] == pytest.approx(1)
+    assert measures['S'][0] == pytest.approx(1)
+
+    # Все вхождения в одном сегменте: D не определена
+    assert math.isnan(measures['D'][1])
+    assert measures['DP'][1] == pytest.approx(0.75)
+    assert measures['D2'][1] == pytest.approx(0)
+    assert measures['S'][1] == pytest.approx(0.25)
+    assert measures['AF'][1] == pytest.approx(1)
+
+    # μ = 1, σ = √1.5, n = 2
+    assert measures['D'][2] == pytest.approx(100 * (1 - math.sqrt(1.5)))
+    assert measures['DP'][2] == pytest.approx(0.5)
+    assert measures['D2'][2] == pytest.approx(-(0.25 * math.log(0.25) + 0.75 * math.log(0.75)) / math.log(4))
+    assert measures['S'][2] == pytest.approx((0.5 + math.sqrt(0.75)) ** 2 / 4)
+
+
+def test_frequencies_proportional_to_segment_lengths_are_even():
+    measures = DispersionEngine(np.array([[1], [3]]), segment_lengths=[10, 30]).measures
+    assert measures['D'][0] == pytest.approx(100)
+    assert measures['DP'][0] == pytest.approx(0)
+    assert measures['D2'][0] == pytest.approx(1)
+    assert measures['S'][0] == pytest.approx(1)
+    assert measures['AF'][0] == pytest.approx(4)
@@ -0,0 +1,34 @@
+"""Меры ключевости на таблицах 2×2, посчитанных вручную"""
+
+import math
+
+import numpy as np
+import pytest
+
+from keyness import align_counts, keyness_scores
+
+
+def test_scores_on_known_tables():
+    # Корпус A - 10 000 слов, B - 20 000; слово 1: 100 и 50, слово 2: 0 и 40
+    scores = keyness_scores(np.array([100, 0]), np.array([50, 40]), total_a=10000, total_b=20000)
+
+    # Ожидаемые частоты: 50 и 100; LL = 2 × (100·ln 2 + 50·ln 0.5)
+    assert scores['expected_a'][0] == pytest.approx(50)
+    assert scores['expected_b'][0] == pytest.approx(100)
+    assert scores['LL'][0] == pytest.approx(100 * math.log(2))
+    assert scores['log_ratio'][0] == pytest.approx(2)
+    assert scores['%DIFF'][0] == pytest.approx(300)
+    a, b, c, d = 100, 50, 9900, 19950
+    assert scores['chi2'][0] == pytest.approx(30000 * (a * d - b * c) ** 2 / ((a + b) * (c + d) * (a + c) * (b + d)))
+
+    # Слово только в B: знак минус, нулевая частота заменяется на 0.5 в Log Ratio
+    assert scores['LL'][1] == pytest.approx(-80 * math.log(1.5))
+    assert scores['log_ratio'][1] == pytest.approx(math.log2(1 / 40))
+    assert scores['%DIFF'][1] == pytest.approx(-100)
+    assert scores['chi2'][1] < 0
+
+
+def test_align_counts_uses_union_of_words():
+    words, a, b = align_counts({'hund': 3, 'katze': 1}, {'katze': 2, 'maus': 5})
+    assert list(words) == ['hund', 'katze', 'maus']
+    assert list(a) == [3, 1, 0] and list(b) == [0, 2, 5]
@@ -0,0 +1,39 @@
+"""Оценки закона Ципфа по полному ранговому распределению"""
+
+import numpy as np
+
+from zipf_fit import fit_distribution, mle_fit, model_frequencies
+
+
+def expected_frequencies(s, q, n_types, n_tokens):
+    weights = (np.arange(1, n_types + 1) + q) ** -s
+    return n_tokens * weights / weights.sum()
+
+
+def test_mle_recovers_zipf_exponent():
+    # Словарь длиннее EXACT_HEAD: хвост нормирующей суммы считается приближенно
+    frequencies = expected_frequencies(1.2, 0.0, 30000, 1e7)
+    fit = mle_fit(frequencies)
+    assert abs(fit['exponent'] - 1.2) < 1e-3
+    assert fit['shift'] == 0.0
+
+
+def test_mle_recovers_mandelbrot_parameters():
+    frequencies = expected_frequencies(1.1, 2.7, 5000, 1e7)
+    fit = mle_fit(frequencies, mandelbrot=True)
+    assert abs(fit['exponent'] - 1.1) < 1e-2
+    assert abs(fit['shift'] - 2.7) < 0.1
+    assert fit['aic'] < mle_fit(frequencies)['aic']
+
+
+def test_fit_on_sampled_counts():
+    generator = np.random.default_rng(11)
+    probabilities = expected_frequencies(1.0, 0.0, 2000, 1.0)
+    counts = generator.multinomial(2_000_000, probabilities)
+    fit = fit_distribution(counts)
+
+    assert fit['n_tokens'] == 2_000_000
+    assert abs(fit['zipf']['exponent'] - 1.0) < 0.03
+    expected = model_frequencies(fit, [1, 10, 100])
+    observed = np.sort(counts)[::-1][[0, 9, 99]]
+    assert np.allclose(expected, observed, rtol=0.1)
@@ -0,0 +1,157 @@
+"""Подгонка закона Ципфа по всему ранговому распределению"""
+
+import numpy as np
+from scipy.optimize import minimize, minimize_scalar
+from scipy.special import gammaln
+from config import *
+
+# Число первых рангов, по которым нормирующая сумма считается точно;
+# остаток суммы оценивается по формуле Эйлера-Маклорена
+EXACT_HEAD = 10000
+
+
+def rank_frequency(counts):
+    """Частоты по убыванию и соответствующие ранги"""
+    frequencies = np.sort(np.asarray(counts, dtype=np.int64))[::-1]
+    frequencies = frequencies[frequencies > 0]
+    ranks = np.arange(1, len(frequencies) + 1)
+    return ranks, frequencies
+
+
+def log_binned(ranks, frequencies, bins_per_decade=ZIPF_BINS_PER_DECADE):
+    """Логарифмический биннинг рангов
+
+    Возвращает геометрический центр каждого бина и среднюю частоту в нем.
+    """
+    n = len(ranks)
+    num_bins = max(2, int(np.ceil(np.log10(n + 1) * bins_per_decade)) + 1)
+    edges = np.unique(np.floor(np.logspace(0, np.log10(n + 1), num_bins)).astype(np.int64))
+    starts = edges[edges <= n] - 1
+
+    widths = np.diff(np.append(starts, n))
+    freq_sums = np.add.reduceat(frequencies.astype(np.float64), starts)
+    log_rank_sums = np.add.reduceat(np.log(ranks), starts)
+
+    return np.exp(log_rank_sums / widths), freq_sums / widths
+
+
+def least_squares_fit(x, y):
+    """МНК в двойных логарифмических координатах: log y = log C - s·log x"""
+    log_x = np.log(x)
+    log_y = np.log(y)
+    slope, intercept = np.polyfit(log_x, log_y, 1)
+
+    predicted = intercept + slope * log_x
+    ss_res = np.sum((log_y - predicted) ** 2)
+    ss_tot = np.sum((log_y - log_y.mean()) ** 2)
+    r_squared = 1 - ss_res / ss_tot if ss_tot > 0 else 1.0
+
+    return {
+        'exponent': -slope,
+        'constant': np.exp(intercept),
+        'r_squared': r_squared
+    }
+
+
+def _frequency_runs(frequencies):
+    """Серии одинаковых частот: (первый ранг, последний ранг, частота)"""
+    starts = np.flatnonzero(np.r_[True, frequencies[1:] != frequencies[:-1]])
+    ends = np.append(starts[1:], len(frequencies))
+    return starts + 1, ends, frequencies[starts].astype(np.float64)
+
+
+def _normalizer(s, q, n):
+    """Сумма (r + q)^(-s) по r = 1..n"""
+    head = min(n, EXACT_HEAD)
+    total = np.sum((np.arange(1, head + 1) + q) ** -s)
+    if n <= head:
+        return total
+
+    # Хвост: интеграл + поправки Эйлера-Маклорена
+    a, b = head + 1 + q, n + q
+    if abs(s - 1) < 1e-12:
+        integral = np.log(b / a)
+    else:
+        integral = (b ** (1 - s) - a ** (1 - s)) / (1 - s)
+    endpoints = (a ** -s + b ** -s) / 2
+    derivatives = -s * (b ** (-s - 1) - a ** (-s - 1)) / 12
+    return total + integral + endpoints + derivatives
+
+
+def _weighted_log_ranks(q, runs):
+    """Сумма f_r·log(r + q) через серии одинаковых частот"""
+    first, last, freq = runs
+    return np.sum(freq * (gammaln(last + q + 1) - gammaln(first + q)))
+
+
+def _log_likelihood(s, q, runs, n_types, n_tokens):
+    return -s * _weighted_log_ranks(q, runs) - n_tokens * np.log(_normalizer(s, q, n_types))
+
+
+def mle_fit(frequencies, mandelbrot=False):
+    """Оценка показателя методом максимального правдоподобия
+
+    Модель: P(r) ∝ 1 / (r + q)^s, r = 1..V; для закона Ципфа q = 0,
+    для закона Ципфа-Мандельброта q оценивается вместе с s.
+    """
+    runs = _frequency_runs(frequencies)
+    n_types = len(frequencies)
+    n_tokens = float(frequencies.sum())
+
+    if not mandelbrot:
+        opt = minimize_scalar(lambda s: -_log_likelihood(s, 0.0, runs, n_types, n_tokens),
+                              bounds=(0.05, 5.0), method='bounded')
+        s, q = opt.x, 0.0
+        log_likelihood = -opt.fun
+    else:
+        opt = minimize(lambda p: -_log_likelihood(p[0], p[1], runs, n_types, n_tokens),
+                       x0=[1.0, 1.0], method='L-BFGS-B',
+                       bounds=[(0.05, 5.0), (-0.99, 1000.0)])
+        s, q = opt.x
+        log_likelihood = -opt.fun
+
+    num_params = 2 if mandelbrot else 1
+    return {
+        'exponent': s,
+        'shift': q,
+        'log_likelihood': log_likelihood,
+        'aic': 2 * num_params - 2 * log_likelihood
+    }
+
+
+def ks_statistic(frequencies, s, q=0.0):
+    """Статистика Колмогорова-Смирнова между эмпирическим и модельным распределением рангов"""
+    weights = (np.arange(1, len(frequencies) + 1) + q) ** -s
+    model_cdf = np.cumsum(weights) / weights.sum()
+    empirical_cdf = np.cumsum(frequencies) / frequencies.sum()
+    return np.max(np.abs(empirical_cdf - model_cdf))
+
+
+def fit_distribution(counts, bins_per_decade=ZIPF_BINS_PER_DECADE):
+    """Полная подгонка: МНК по лог-бинам, МП-оценки Ципфа и Ципфа-Мандельброта"""
+    ranks, frequencies = rank_frequency(counts)
+    binned_ranks, binned_freqs = log_binned(ranks, frequencies, bins_per_decade)
+
+    ls = least_squares_fit(binned_ranks, binned_freqs)
+    zipf = mle_fit(frequencies)
+    mandelbrot = mle_fit(frequencies, mandelbrot=True)
+
+    zipf['ks'] = ks_statistic(frequencies, zipf['exponent'])
+    mandelbrot['ks'] = ks_statistic(frequencies, mandelbrot['exponent'], mandelbrot['shift'])
+
+    return {
+        'n_types': len(frequencies),
+        'n_tokens': int(frequencies.sum()),
+        'binned_ranks': binned_ranks,
+        'binned_frequencies': binned_freqs,
+        'least_squares': ls,
+        'zipf': zipf,
+        'mandelbrot': mandelbrot
+    }
+
+
+def model_frequencies(fit, ranks, model='zipf'):
+    """Ожидаемые частоты модели для заданных рангов"""
+    params = fit[model]
+    norm = _normalizer(params['exponent'], params['shift'], fit['n_types'])
+    return fit['n_tokens'] * (np.asarray(ranks) + params['shift']) ** -params['exponent'] / norm
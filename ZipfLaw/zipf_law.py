@@ -1,40 +1,34 @@
 """Анализ закона Ципфа"""
 
-import json
 import numpy as np
-import matplotlib.pyplot as plt
-from pathlib import Path
 from config import *
+from rendering import plt
+from corpus_context import get_context
+from zipf_fit import fit_distribution, model_frequencies
+from bootstrap import zipf_coefficient_ci
+from result_cache import run_cached
 
 
 class ZipfAnalyzer:
     """Анализ закона Ципфа"""
     
-    def __init__(self, language):
+    def __init__(self, language, context=None):
         self.language = language
+        self.context = context or get_context(language)
         self.word_counts = None
-        self.sorted_words = None
         
     def load_dictionary(self):
         """Загрузка частотного словаря"""
-        dict_path = FREQ_DICT_DIR / f"{self.language}_dictionary.json"
-        with open(dict_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        self.word_counts = data['word_counts']
-        # Сортируем по частоте (от большей к меньшей)
-        self.sorted_words = sorted(self.word_counts.items(), key=lambda x: x[1], reverse=True)
+        self.word_counts = self.context.word_counts
         
     def calculate_zipf(self, top_n=TOP_WORDS_ZIPF):
         """Расчет показателей закона Ципфа"""
-        if not self.sorted_words:
+        if not self.word_counts:
             self.load_dictionary()
         
-        # Берем top_n самых частых слов
-        words = self.sorted_words[:top_n]
-        
-        ranks = np.arange(1, len(words) + 1)
-        frequencies = np.array([count for _, count in words])
+        # Берем top_n самых частых слов (частоты уже отсортированы в контексте)
+        frequencies = self.context.sorted_counts[:top_n]
+        ranks = self.context.ranks[:len(frequencies)]
         
         # Вычисляем произведение f*r
         products = frequencies * ranks
@@ -51,13 +45,16 @@ class ZipfAnalyzer:
             'products': products,
             'coefficient': zipf_coefficient,
             'std': std_deviation,
-            'words': [word for word, _ in words]
+            'coefficient_ci': zipf_coefficient_ci(self.context.sorted_counts, top_n),
+            'words': self.context.top_words(top_n),
+            # Подгонка по всему словарю, а не только по top_n словам
+            'fit': fit_distribution(self.context.sorted_counts)
         }
     
-    def plot_zipf(self, results, save_path=None):
+    def plot_zipf(self, results, save_path=None, dpi=PLOT_DPI):
         """Построение графика закона Ципфа"""
         plt.style.use(PLOT_STYLE)
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
+        fig, (ax1, ax2, ax3) = plt.subplots(1, 3, figsize=(24, 6))
         
         # График 1: Частота от ранга (логарифмический масштаб)
         ax1.loglog(results['ranks'], results['frequencies'], 'bo-', markersize=4, linewidth=1)
@@ -81,10 +78,26 @@ class ZipfAnalyzer:
         ax2.grid(True, alpha=0.3)
         ax2.legend()
         
+        # График 3: Полное ранговое распределение и подгонка моделей
+        fit = results['fit']
+        zipf, mandelbrot = fit['zipf'], fit['mandelbrot']
+        ax3.loglog(fit['binned_ranks'], fit['binned_frequencies'], 'bo', markersize=4,
+                   label=f'Лог-бины ({fit["n_types"]:,} слов)')
+        ax3.loglog(fit['binned_ranks'], model_frequencies(fit, fit['binned_ranks'], 'zipf'),
+                   'r--', linewidth=2, label=f'Ципф, МП (s={zipf["exponent"]:.3f})')
+        ax3.loglog(fit['binned_ranks'], model_frequencies(fit, fit['binned_ranks'], 'mandelbrot'),
+                   'g-', linewidth=2,
+                   label=f'Ципф-Мандельброт (s={mandelbrot["exponent"]:.3f}, q={mandelbrot["shift"]:.2f})')
+        ax3.set_xlabel('Ранг (r)', fontsize=12)
+        ax3.set_ylabel('Частота (f)', fontsize=12)
+        ax3.set_title('Подгонка по всему словарю', fontsize=14)
+        ax3.grid(True, alpha=0.3)
+        ax3.legend()
+        
         plt.tight_layout()
         
         if save_path:
-            plt.savefig(save_path, dpi=PLOT_DPI, bbox_inches='tight')
+            plt.savefig(save_path, dpi=dpi, bbox_inches='tight')
             print(f"График сохранен: {save_path}")
         
         plt.close()
@@ -95,6 +108,9 @@ class ZipfAnalyzer:
         report.append(f"=== ЗАКОН ЦИПФА - {LANGUAGES[self.language].upper()} ===\n")
         report.append(f"Проанализировано слов: {len(results['ranks'])}\n")
         report.append(f"Коэффициент Ципфа (c): {results['coefficient']:.2f}")
+        ci = results['coefficient_ci']
+        report.append(f"{ci['level']:.0%} доверительный интервал (бутстреп, {BOOTSTRAP_REPLICATES} выборок): "
+                      f"[{ci['low']:.2f}; {ci['high']:.2f}]")
         report.append(f"Стандартное отклонение: {results['std']:.2f}")
         report.append(f"Коэффициент вариации: {(results['std'] / results['coefficient'] * 100):.2f}%\n")
         
@@ -110,29 +126,41 @@ class ZipfAnalyzer:
             prod = results['products'][i]
             report.append(f"{rank:>5} {word:>15} {freq:>10} {prod:>10.0f}")
         
+        # Подгонка по всему словарю
+        fit = results['fit']
+        ls, zipf, mandelbrot = fit['least_squares'], fit['zipf'], fit['mandelbrot']
+        report.append(f"\nПодгонка по всему словарю ({fit['n_types']:,} слов, {fit['n_tokens']:,} словоупотреблений):")
+        report.append(f"МНК по лог-бинам: s = {ls['exponent']:.4f}, C = {ls['constant']:.0f}, R² = {ls['r_squared']:.4f}")
+        report.append(f"МП, Ципф: s = {zipf['exponent']:.4f}, KS = {zipf['ks']:.4f}, AIC = {zipf['aic']:.0f}")
+        report.append(f"МП, Ципф-Мандельброт: s = {mandelbrot['exponent']:.4f}, q = {mandelbrot['shift']:.3f}, "
+                      f"KS = {mandelbrot['ks']:.4f}, AIC = {mandelbrot['aic']:.0f}")
+        
         return "\n".join(report)
     
-    def analyze(self):
+    def analyze(self, cache=None, renderer=None):
         """Полный анализ"""
         print(f"\n--- Анализ закона Ципфа для {LANGUAGES[self.language]} ---")
         
-        self.load_dictionary()
-        results = self.calculate_zipf()
-        
-        # Сохраняем график
         plot_path = PLOTS_DIR / f"zipf_{self.language}.png"
-        self.plot_zipf(results, plot_path)
-        
-        # Сохраняем отчет
-        report = self.generate_report(results)
+        if renderer:
+            plot_path = renderer.output_path(plot_path)
         report_path = OUTPUT_DIR / f"zipf_report_{self.language}.txt"
-        with open(report_path, 'w', encoding='utf-8') as f:
-            f.write(report)
         
-        print(report)
-        print(f"\nОтчет сохранен: {report_path}")
-        
-        return results
+        def compute():
+            self.load_dictionary()
+            results = self.calculate_zipf()
+            
+            # Сохраняем график
+            if renderer:
+                renderer.submit(self, 'plot_zipf', results, plot_path)
+            else:
+                self.plot_zipf(results, plot_path)
+            return results, self.generate_report(results)
+        
+        return run_cached(cache, 'zipf', self.language, [self.context.path],
+                          {'top_n': TOP_WORDS_ZIPF, 'bins_per_decade': ZIPF_BINS_PER_DECADE,
+                           'bootstrap': [BOOTSTRAP_REPLICATES, BOOTSTRAP_CONFIDENCE, BOOTSTRAP_SEED]},
+                          [plot_path], report_path, compute)
 
 
 def analyze_all_languages():
@@ -0,0 +1,16 @@
+"""Проекты FrequencyDictionary и ZipfLaw тестируются по отдельности
+
+У каждого проекта свой модуль config, поэтому тесты обоих проектов
+нельзя собрать в одном процессе pytest.
+"""
+
+import pytest
+
+PROJECTS = ('FrequencyDictionary', 'ZipfLaw')
+
+
+def pytest_configure(config):
+    raise pytest.UsageError(
+        "Тесты запускаются для каждого проекта отдельно: "
+        + "; ".join(f"cd {project} && python -m pytest" for project in PROJECTS)
+        + " (или python -m pytest <проект>)")